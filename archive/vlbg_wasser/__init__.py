@@ -5,23 +5,53 @@ Vorarlberg Wasser Daten
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+import asyncio
 import logging
+import time
 from datetime import timedelta
+from functools import partial
+from typing import Any, Awaitable, Callable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from const import DOMAIN
-from vowis_api import VowisApi 
+from const import (
+    CACHE_SAVE_DELAY,
+    CACHE_STORAGE_VERSION,
+    API_TIMEOUT,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+    RIVER_DEVICE_ID,
+    RIVER_MEASUREMENTS,
+    RIVER_UNIQUE_ID,
+    SIGNAL_STATIONS_ADDED,
+    TIER_BODENSEE_ARCHIVE,
+    TIER_BODENSEE_LIVE,
+    TIER_INTERVALS,
+)
+from snapshot import (
+    SensorSnapshot,
+    build_bodensee_archive_snapshots,
+    build_bodensee_snapshots,
+    build_river_snapshot,
+    latest_archive_entry,
+    river_key,
+)
+from vowis_api import VowisApi
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
-
-SCAN_INTERVAL = timedelta(minutes=5)
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -29,19 +59,61 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     
     session = async_get_clientsession(hass)
-    api = VowisApi(session)
+    api = VowisApi(session, timeout=entry.options.get(CONF_REQUEST_TIMEOUT, API_TIMEOUT))
     
-    coordinator = VowisDataUpdateCoordinator(hass, api, entry)
+    tiers = VowisTiers(hass, api, entry)
     
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the data cached by the previous run and refresh in the
+    # background; only wait for the API when there is no cache
+    if await tiers.async_restore():
+        entry.async_create_background_task(
+            hass, tiers.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        await tiers.async_first_refresh()
     
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = tiers
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    # Pick up option changes: station changes live, the rest by reloading
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
+    
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a deleted config entry."""
+    await _cache_store(hass, entry).async_remove()
+
+
+def _cache_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store of an entry's cached data."""
+    return Store(hass, CACHE_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.cache")
+
+
+def _reload_options(entry: ConfigEntry) -> tuple:
+    """Return the options that only take effect by reloading the entry."""
+    return (
+        entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+        entry.options.get(CONF_REQUEST_TIMEOUT, API_TIMEOUT),
+    )
+
+
+async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply a changed station selection live, reload for other changes."""
+    tiers = hass.data[DOMAIN].get(entry.entry_id)
+    if tiers is not None and tiers.reload_options == _reload_options(entry):
+        await tiers.async_update_stations(entry.data.get("enabled_stations", []))
+        return
+    await async_reload_entry(hass, entry)
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -50,65 +122,501 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
-class VowisDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the VOWIS API."""
+class VowisTiers:
+    """The refresh tiers of a config entry.
+    
+    Every data source is refreshed by its own coordinator at its own
+    interval (TIER_INTERVALS): the bodensee live values, the bodensee
+    archive and one tier per river measurement type. Entities listen to
+    the tier they read, so slow-moving river data is neither requested nor
+    parsed at the rate of the fastest one. The bodensee tiers are the
+    exception for transfers: VOWIS only serves the live values together
+    with the archive (see/), so both tiers download the full payload and
+    the split saves parsing the archive, not traffic. The tiers share the
+    API client, the concurrency limit and the on-disk cache.
+    
+    Stations enabled or disabled in the options are applied to the running
+    tiers (async_update_stations) instead of reloading the entry.
+    """
 
     def __init__(self, hass: HomeAssistant, api: VowisApi, entry: ConfigEntry) -> None:
-        """Initialize."""
+        """Initialize the tiers of the enabled stations."""
+        self.hass = hass
         self.api = api
         self.entry = entry
+        self.reload_options = _reload_options(entry)
+        
+        # Bound the fan-out so a large station list cannot flood the API;
+        # the limit holds across all tiers
+        self.max_concurrent_requests = max(
+            1,
+            int(entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)),
+        )
+        self.semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        self._cache = _cache_store(hass, entry)
+        
+        self.stations_by_id = {s["id"]: s for s in entry.data.get("river_stations", [])}
+        self.enabled_stations = [
+            station_id
+            for station_id in entry.data.get("enabled_stations", [])
+            if station_id in self.stations_by_id
+        ]
+        
+        self.bodensee_live = VowisBodenseeCoordinator(hass, self, TIER_BODENSEE_LIVE)
+        self.bodensee_archive = VowisBodenseeCoordinator(hass, self, TIER_BODENSEE_ARCHIVE)
+        self.coordinators: list[VowisDataUpdateCoordinator] = [
+            self.bodensee_live,
+            self.bodensee_archive,
+        ]
+        
+        # One river tier per measurement type some enabled station supports,
+        # keyed by the type's data key
+        self.rivers: dict[str, VowisRiverCoordinator] = {}
+        for measurement_type, data_key, station_ids in self._river_plan(self.enabled_stations):
+            self._river_tier(measurement_type, data_key).station_ids.extend(station_ids)
+
+    def _river_plan(self, station_ids: list[str]) -> list[tuple[str, str, list[str]]]:
+        """Return (API type, data key, station ids) of the types some of the stations support."""
+        plan = []
+        for support_flag, measurement_type, data_key in RIVER_MEASUREMENTS:
+            supporting = [
+                station_id
+                for station_id in station_ids
+                if self.stations_by_id.get(station_id, {}).get(support_flag, False)
+            ]
+            if supporting:
+                plan.append((measurement_type, data_key, supporting))
+        return plan
+
+    def _river_tier(self, measurement_type: str, data_key: str) -> VowisRiverCoordinator:
+        """Return the river tier of a measurement type, creating it on first use."""
+        if (coordinator := self.rivers.get(data_key)) is None:
+            coordinator = self.rivers[data_key] = VowisRiverCoordinator(
+                self.hass, self, measurement_type, data_key, []
+            )
+            self.coordinators.append(coordinator)
+        return coordinator
+
+    async def async_update_stations(self, enabled_stations: list[str]) -> None:
+        """Apply a changed station selection to the running tiers.
+        
+        Removed stations lose their data, entities and devices. Added
+        stations are fetched right away, one request per measurement type
+        they support, and then get their entities. Other stations and the
+        bodensee tiers are neither refetched nor rebuilt.
+        """
+        previous = set(self.enabled_stations)
+        enabled = [station_id for station_id in enabled_stations if station_id in self.stations_by_id]
+        added = [station_id for station_id in enabled if station_id not in previous]
+        removed = previous.difference(enabled)
+        if not added and not removed:
+            return
+        self.enabled_stations = enabled
+        
+        if removed:
+            for coordinator in self.rivers.values():
+                coordinator.remove_stations(removed)
+            self._async_remove_entities(removed)
+        
+        if added:
+            await asyncio.gather(
+                *(
+                    self._river_tier(measurement_type, data_key).async_add_stations(station_ids)
+                    for measurement_type, data_key, station_ids in self._river_plan(added)
+                )
+            )
+            async_dispatcher_send(
+                self.hass, SIGNAL_STATIONS_ADDED.format(self.entry.entry_id), added
+            )
+        
+        _LOGGER.debug("Stations changed: %d added, %d removed", len(added), len(removed))
+        self.async_schedule_save()
+
+    def _async_remove_entities(self, station_ids: set[str]) -> None:
+        """Remove the entities and devices of stations."""
+        entity_registry = er.async_get(self.hass)
+        device_registry = dr.async_get(self.hass)
+        for station_id in station_ids:
+            for _, _, data_key in RIVER_MEASUREMENTS:
+                if entity_id := entity_registry.async_get_entity_id(
+                    Platform.SENSOR, DOMAIN, RIVER_UNIQUE_ID.format(station_id, data_key)
+                ):
+                    entity_registry.async_remove(entity_id)
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, RIVER_DEVICE_ID.format(station_id))}
+            ):
+                device_registry.async_remove_device(device.id)
+
+    async def async_restore(self) -> bool:
+        """Restore the data of the previous run from the on-disk cache.
+        
+        Returns True if cached data was found for any tier.
+        """
+        try:
+            stored = await self._cache.async_load()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Could not read cached data, starting without it")
+            return False
+        
+        if not stored:
+            return False
+        
+        restored = [coordinator.restore(stored) for coordinator in self.coordinators]
+        return any(restored)
+
+    async def async_refresh(self) -> None:
+        """Refresh all tiers."""
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in self.coordinators)
+        )
+
+    async def async_first_refresh(self) -> None:
+        """Refresh all tiers, failing the setup only if all of them failed."""
+        await self.async_refresh()
+        if not any(coordinator.last_update_success for coordinator in self.coordinators):
+            raise ConfigEntryNotReady("Error communicating with VOWIS API: all requests failed")
+
+    def async_schedule_save(self) -> None:
+        """Persist the data of all tiers, merging saves within the save delay."""
+        self._cache.async_delay_save(self._cache_data, CACHE_SAVE_DELAY)
+
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the current data of all tiers in its compact stored form."""
+        stored: dict[str, Any] = {"rivers": {}}
+        for coordinator in self.coordinators:
+            coordinator.store(stored)
+        return stored
+
+
+class VowisDataUpdateCoordinator(DataUpdateCoordinator, ABC):
+    """Coordinator of one refresh tier.
+    
+    Subclasses fetch the tier's data and build its per-sensor snapshots;
+    a tier missing one of the abstract hooks cannot be constructed.
+    """
+
+    def __init__(self, hass: HomeAssistant, tiers: VowisTiers, tier: str) -> None:
+        """Initialize."""
+        self.tiers = tiers
+        self.api = tiers.api
+        self.entry = tiers.entry
+        self.tier = tier
+        
+        # Payload objects the current snapshots were built from, by key
+        self._snapshot_sources: dict[Any, tuple[Any, Any]] = {}
+        
+        # Statistics of the most recent refresh
+        self.last_refresh_duration: float | None = None
+        self.last_refresh_requests = 0
+        self.last_refresh_failures = 0
+        
+        # State writes of the entities after the most recent refresh
+        self.write_stats = {"written": 0, "skipped": 0}
         
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            name=f"{DOMAIN} {tier}",
+            update_interval=timedelta(seconds=TIER_INTERVALS[tier]),
+            # Unchanged payloads come back as the same objects from the API
+            # cache, so an unchanged refresh does not notify entities
+            always_update=False,
         )
 
+    async def _limited(self, coro: Awaitable[Any]) -> Any:
+        """Await a request while holding a concurrency slot."""
+        async with self.tiers.semaphore:
+            return await coro
+
+    def snapshot(self, key: tuple) -> SensorSnapshot | None:
+        """Return the current snapshot of a sensor."""
+        if not self.data:
+            return None
+        return self.data["snapshots"].get(key)
+
+    def restore(self, stored: dict[str, Any]) -> bool:
+        """Restore the tier's part of the stored data.
+        
+        Returns True if the stored data held any of it.
+        """
+        data = self._restore_data(stored)
+        if data is None:
+            return False
+        data["snapshots"] = self._build_snapshots(data)
+        _LOGGER.debug("Restored %d %s snapshots from cache", len(data["snapshots"]), self.tier)
+        self.async_set_updated_data(data)
+        return True
+
     async def _async_update_data(self):
-        """Update data via library."""
+        """Update data via library.
+        
+        A failing request only drops its own result; the refresh fails when
+        nothing at all came back.
+        """
+        started = time.monotonic()
+        self.write_stats = {"written": 0, "skipped": 0}
+        
+        data, requests, failures = await self._async_fetch()
+        data["snapshots"] = self._build_snapshots(data)
+        
+        # Persist the new data, merging refreshes within the save delay
+        self.tiers.async_schedule_save()
+        
+        self.last_refresh_duration = time.monotonic() - started
+        self.last_refresh_requests = requests
+        self.last_refresh_failures = failures
+        
+        _LOGGER.debug(
+            "Refreshed %s: %d requests in %.2fs (%d failed, breakers %s)",
+            self.tier, requests, self.last_refresh_duration, failures,
+            self.api.breaker_states(),
+        )
+        
+        if requests and failures == requests:
+            raise UpdateFailed(f"Error communicating with VOWIS API: all {self.tier} requests failed")
+        
+        return data
+
+    def _reuse_or_build(
+        self,
+        sources: dict[Any, tuple[Any, Any]],
+        key: Any,
+        payload: Any,
+        build: Callable[[Any], Any],
+    ) -> Any:
+        """Return the snapshots of a payload, reusing those of the last refresh.
+        
+        Payloads the API client served from its cache are the same objects
+        as in the previous refresh; their snapshots are reused as they are.
+        """
+        cached = self._snapshot_sources.get(key)
+        built = cached[1] if cached is not None and cached[0] is payload else build(payload)
+        sources[key] = (payload, built)
+        return built
+
+    @abstractmethod
+    async def _async_fetch(self) -> tuple[dict[str, Any], int, int]:
+        """Fetch the tier's data; return it with the request and failure counts."""
+
+    @abstractmethod
+    def _build_snapshots(self, data: dict[str, Any]) -> dict[tuple, SensorSnapshot]:
+        """Build the per-sensor snapshots of the tier's data."""
+
+    @abstractmethod
+    def _restore_data(self, stored: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the tier's data from the stored data, or None."""
+
+    @abstractmethod
+    def store(self, stored: dict[str, Any]) -> None:
+        """Add the tier's current data to the stored data, in compact form."""
+
+
+class VowisBodenseeCoordinator(VowisDataUpdateCoordinator):
+    """Bodensee tier, either the live values or the archive.
+    
+    Both read the see/ payload. The live tier builds the current readings
+    and flood levels; the archive tier only parses seeArchiv, at a much
+    lower rate. VOWIS has no endpoint for the current values alone, so the
+    live tier still downloads the whole payload, archive included, every
+    interval; the request is conditional, which only saves the transfer
+    when the server answers 304.
+    """
+
+    def __init__(self, hass: HomeAssistant, tiers: VowisTiers, tier: str) -> None:
+        """Initialize."""
+        super().__init__(hass, tiers, tier)
+        self._live = tier == TIER_BODENSEE_LIVE
+
+    async def _async_fetch(self) -> tuple[dict[str, Any], int, int]:
+        """Fetch the see/ payload."""
         try:
-            data = {}
-            
-            # Always fetch bodensee data
-            bodensee_data = await self.api.get_bodensee_data()
-            if bodensee_data:
-                data["bodensee"] = bodensee_data[0]  # API returns array with single element
-            
-            # Fetch river data for enabled stations
-            enabled_stations = self.entry.data.get("enabled_stations", [])
-            data["rivers"] = {}
+            bodensee_data = await self._limited(self.api.get_bodensee_data())
+        except Exception as exception:  # pylint: disable=broad-except
+            _LOGGER.warning("Error fetching bodensee data: %s", exception)
+            bodensee_data = None
+        
+        if isinstance(bodensee_data, list) and bodensee_data:
+            # API returns array with single element
+            return {"bodensee": bodensee_data[0]}, 1, 0
+        return {}, 1, 1
+
+    def _build_snapshots(self, data: dict[str, Any]) -> dict[tuple, SensorSnapshot]:
+        """Build the live or archive snapshots of the payload."""
+        sources: dict[Any, tuple[Any, Any]] = {}
+        snapshots: dict[tuple, SensorSnapshot] = {}
+        if (bodensee_data := data.get("bodensee")) is not None:
+            build = build_bodensee_snapshots if self._live else build_bodensee_archive_snapshots
+            snapshots.update(self._reuse_or_build(sources, "bodensee", bodensee_data, build))
+        self._snapshot_sources = sources
+        return snapshots
+
+    def _restore_data(self, stored: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the stored live values or archive entry."""
+        bodensee_data = stored.get("bodensee" if self._live else self.tier)
+        if not bodensee_data:
+            return None
+        return {"bodensee": bodensee_data}
+
+    def store(self, stored: dict[str, Any]) -> None:
+        """Store the live values without the archive, or only the newest archive entry."""
+        if (bodensee_data := (self.data or {}).get("bodensee")) is None:
+            return
+        if self._live:
+            stored["bodensee"] = {
+                key: value for key, value in bodensee_data.items() if key != "seeArchiv"
+            }
+        elif (latest := latest_archive_entry(bodensee_data)) is not None:
+            stored[self.tier] = {"seeArchiv": [latest]}
+
+
+class VowisRiverCoordinator(VowisDataUpdateCoordinator):
+    """River tier of one measurement type across the enabled stations.
+    
+    All requests of a refresh run concurrently (bounded by the concurrency
+    limit), so the refresh takes about as long as the slowest request.
+    
+    Stations can be added and removed while the tier runs; added stations
+    are fetched on their own and merged into the current data.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        tiers: VowisTiers,
+        measurement_type: str,
+        data_key: str,
+        station_ids: list[str],
+    ) -> None:
+        """Initialize."""
+        super().__init__(hass, tiers, f"river_{measurement_type}")
+        self.measurement_type = measurement_type
+        self.data_key = data_key
+        self.station_ids = station_ids
+
+    async def _async_fetch(self) -> tuple[dict[str, Any], int, int]:
+        """Fetch the measurement type of every station."""
+        station_ids = list(self.station_ids)
+        data, requests, failures = await self._async_fetch_stations(station_ids)
+        
+        # Stations added while the refresh ran were fetched on their own
+        current = (self.data or {}).get("rivers", {})
+        for station_id in self.station_ids:
+            if station_id not in station_ids and station_id in current:
+                data["rivers"][station_id] = current[station_id]
+        return data, requests, failures
+
+    async def _async_fetch_stations(
+        self, station_ids: list[str]
+    ) -> tuple[dict[str, Any], int, int]:
+        """Fetch the measurement type of some stations."""
+        results = await asyncio.gather(
+            *(
+                self._limited(self.api.get_river_data(station_id, self.measurement_type))
+                for station_id in station_ids
+            ),
+            return_exceptions=True,
+        )
+        
+        data = {"rivers": {}}
+        failures = 0
+        
+        for station_id, river_data in zip(station_ids, results):
+            if station_id not in self.station_ids:
+                # Removed while the request ran
+                continue
             
-            for station_id in enabled_stations:
-                station_data = {}
-                station_config = next(
-                    (s for s in self.entry.data.get("river_stations", []) if s["id"] == station_id),
-                    None
+            if isinstance(river_data, Exception):
+                _LOGGER.warning(
+                    "Error fetching river data for station %s, measurement %s: %s",
+                    station_id, self.measurement_type, river_data
                 )
-                
-                if not station_config:
-                    continue
-                
-                # Fetch each supported measurement type
-                if station_config.get("supports_depth", False):
-                    depth_data = await self.api.get_river_data(station_id, "w")
-                    if depth_data and station_id in depth_data.get("Stationen", {}):
-                        station_data["depth"] = depth_data["Stationen"][station_id]
-                
-                if station_config.get("supports_flow", False):
-                    flow_data = await self.api.get_river_data(station_id, "q")
-                    if flow_data and station_id in flow_data.get("Stationen", {}):
-                        station_data["flow"] = flow_data["Stationen"][station_id]
-                
-                if station_config.get("supports_temperature", False):
-                    temp_data = await self.api.get_river_data(station_id, "wt")
-                    if temp_data and station_id in temp_data.get("Stationen", {}):
-                        station_data["temperature"] = temp_data["Stationen"][station_id]
-                
-                if station_data:
-                    data["rivers"][station_id] = station_data
+                failures += 1
+                continue
             
-            return data
-            
-        except Exception as exception:
-            raise UpdateFailed(f"Error communicating with VOWIS API: {exception}") from exception
\ No newline at end of file
+            if river_data and station_id in river_data.get("Stationen", {}):
+                data["rivers"][station_id] = {self.data_key: river_data["Stationen"][station_id]}
+            else:
+                failures += 1
+        
+        return data, len(results), failures
+
+    async def async_add_stations(self, station_ids: list[str]) -> None:
+        """Start fetching stations, with one request each right away.
+        
+        The new data is merged into the current data without rescheduling
+        the tier's next refresh; snapshots of the other stations are reused.
+        """
+        station_ids = [station_id for station_id in station_ids if station_id not in self.station_ids]
+        self.station_ids.extend(station_ids)
+        fetched, _, _ = await self._async_fetch_stations(station_ids)
+        self._set_rivers({**(self.data or {}).get("rivers", {}), **fetched["rivers"]})
+
+    def remove_stations(self, station_ids: set[str]) -> None:
+        """Stop fetching stations and drop their data."""
+        self.station_ids[:] = [
+            station_id for station_id in self.station_ids if station_id not in station_ids
+        ]
+        rivers = (self.data or {}).get("rivers", {})
+        if not station_ids.intersection(rivers):
+            return
+        self._set_rivers(
+            {
+                station_id: station_data
+                for station_id, station_data in rivers.items()
+                if station_id not in station_ids
+            }
+        )
+
+    def _set_rivers(self, rivers: dict[str, Any]) -> None:
+        """Replace the stations' data and notify the listeners."""
+        data = {"rivers": rivers}
+        data["snapshots"] = self._build_snapshots(data)
+        self.data = data
+        self.async_update_listeners()
+
+    def _build_snapshots(self, data: dict[str, Any]) -> dict[tuple, SensorSnapshot]:
+        """Build the snapshot of every station's measurements."""
+        sources: dict[Any, tuple[Any, Any]] = {}
+        snapshots: dict[tuple, SensorSnapshot] = {}
+        
+        for station_id, station_data in data["rivers"].items():
+            if (measurement_data := station_data.get(self.data_key)) is None:
+                continue
+            key = river_key(station_id, self.data_key)
+            build = partial(build_river_snapshot, station_id, self.tiers.stations_by_id[station_id])
+            snapshot = self._reuse_or_build(sources, key, measurement_data, build)
+            if snapshot is not None:
+                snapshots[key] = snapshot
+        
+        self._snapshot_sources = sources
+        return snapshots
+
+    def _restore_data(self, stored: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the stored measurements of the stations that are still enabled."""
+        rivers = {
+            station_id: {self.data_key: station_data[self.data_key]}
+            for station_id, station_data in stored.get("rivers", {}).items()
+            if station_id in self.station_ids and self.data_key in station_data
+        }
+        if not rivers:
+            return None
+        return {"rivers": rivers}
+
+    def store(self, stored: dict[str, Any]) -> None:
+        """Store the latest measurement of every station.
+        
+        Sensors only use the latest values, so all but the latest
+        measurement are left out.
+        """
+        for station_id, station_data in (self.data or {}).get("rivers", {}).items():
+            measurement_data = station_data[self.data_key]
+            messwerte = measurement_data.get("Messwerte") or {}
+            latest = {}
+            if messwerte:
+                latest_timestamp = max(messwerte)
+                latest = {latest_timestamp: messwerte[latest_timestamp]}
+            stored["rivers"].setdefault(station_id, {})[self.data_key] = {
+                **measurement_data,
+                "Messwerte": latest,
+            }
@@ -0,0 +1,79 @@
+"""
+Quellennachweis/Data Source Disclaimer
+Datenquelle/Fetches data from „Amt der Vorarlberger Landesregierung, Abt. VIId Wasserwirtschaft
+https://www.vorarlberg.at/abfluss
+Es wird keinerlei Gewährleistung für die zur Verfügung gestellten Messwerte übernommen. Alle Daten sind ungeprüft und haben den Status von Rohdaten.
+Wir weisen ausdrücklich darauf hin, dass wir hinsichtlich Verfügbarkeit, Performance oder Kontinuität des Dienstes keine Garantie übernehmen können.
+"""
+
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, FLOOD_RETURN_PERIODS
+from .entity import VowisCoordinatorEntity, bodensee_device_info
+from .snapshot import flood_key, flood_level_name
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up VOWIS binary sensors based on a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id].bodensee_live
+
+    async_add_entities(
+        VowisFloodThresholdBinarySensor(coordinator, return_period)
+        for return_period in FLOOD_RETURN_PERIODS
+    )
+
+
+class VowisFloodThresholdBinarySensor(VowisCoordinatorEntity, BinarySensorEntity):
+    """Whether the Bodensee water level exceeds a flood threshold.
+
+    One entity per threshold of the see/ payload (HW2 to HW100, named by
+    return period in years). The coordinator evaluates all thresholds once
+    per payload, and the state is only written when the level band changes.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.SAFETY
+
+    def __init__(self, coordinator, return_period: int) -> None:
+        """Initialize the flood threshold sensor."""
+        super().__init__(coordinator)
+        name = flood_level_name(return_period)
+        self._attr_name = f"Bodensee Flood {name.upper()}"
+        self._attr_unique_id = f"vowis_bodensee_flood_{name}"
+        self._snapshot_key = flood_key(name)
+
+    @property
+    def device_info(self) -> Dict[str, Any]:
+        """Return device information for grouping sensors."""
+        return bodensee_device_info()
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the water level is at or above the threshold."""
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return snapshot.value if snapshot else None
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the threshold, relative to the gauge zero and above sea."""
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return (snapshot.attributes or None) if snapshot else None
+
+    @property
+    def available(self) -> bool:
+        """Return True if the last payload held this threshold."""
+        return self.coordinator.snapshot(self._snapshot_key) is not None
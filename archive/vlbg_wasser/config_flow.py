@@ -11,14 +11,45 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, RIVER_STATIONS
+from .const import (
+    API_TIMEOUT,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+    RIVER_STATIONS,
+)
 from .vowis_api import VowisApi, VowisApiError
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _station_options() -> dict[str, str]:
+    """Return the selectable river stations with their measurements."""
+    station_options = {}
+    for station in RIVER_STATIONS:
+        features = []
+        if station["supports_depth"]:
+            features.append("Depth")
+        if station["supports_flow"]:
+            features.append("Flow")
+        if station["supports_temperature"]:
+            features.append("Temperature")
+        
+        station_options[station["id"]] = f"{station['name']} ({', '.join(features)})"
+    return station_options
+
+
+# The station list is static, so the options are built once for all forms
+STATION_OPTIONS = _station_options()
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate the user input allows us to connect."""
+    """Validate the user input allows us to connect.
+    
+    Only checks that the API answers; the data is fetched once, by the
+    entry's first refresh.
+    """
     session = async_get_clientsession(hass)
     api = VowisApi(session)
     
@@ -83,24 +114,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 }
             )
 
-        # Create options for river stations
-        station_options = {}
-        for station in RIVER_STATIONS:
-            features = []
-            if station["supports_depth"]:
-                features.append("Depth")
-            if station["supports_flow"]:
-                features.append("Flow")
-            if station["supports_temperature"]:
-                features.append("Temperature")
-            
-            station_options[station["id"]] = f"{station['name']} ({', '.join(features)})"
-
         return self.async_show_form(
             step_id="river_stations",
             data_schema=vol.Schema({
                 vol.Optional("river_stations", default=[]): vol.All(
-                    vol.Ensure_list, [vol.In(station_options)]
+                    vol.Ensure_list, [vol.In(STATION_OPTIONS)]
                 ),
             }),
             description_placeholders={
@@ -135,29 +153,34 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 self.config_entry, data=data
             )
             
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(
+                title="",
+                data={
+                    CONF_MAX_CONCURRENT_REQUESTS: user_input.get(
+                        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                    ),
+                    CONF_REQUEST_TIMEOUT: user_input.get(CONF_REQUEST_TIMEOUT, API_TIMEOUT),
+                },
+            )
 
         # Get current enabled stations
         current_stations = self.config_entry.data.get("enabled_stations", [])
+        current_concurrency = self.config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+        current_timeout = self.config_entry.options.get(CONF_REQUEST_TIMEOUT, API_TIMEOUT)
         
-        # Create options for river stations
-        station_options = {}
-        for station in RIVER_STATIONS:
-            features = []
-            if station["supports_depth"]:
-                features.append("Depth")
-            if station["supports_flow"]:
-                features.append("Flow")
-            if station["supports_temperature"]:
-                features.append("Temperature")
-            
-            station_options[station["id"]] = f"{station['name']} ({', '.join(features)})"
-
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema({
                 vol.Optional("river_stations", default=current_stations): vol.All(
-                    vol.Ensure_list, [vol.In(station_options)]
+                    vol.Ensure_list, [vol.In(STATION_OPTIONS)]
                 ),
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS, default=current_concurrency
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                vol.Optional(
+                    CONF_REQUEST_TIMEOUT, default=current_timeout
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
             }),
         )
\ No newline at end of file
@@ -4,7 +4,16 @@ DOMAIN = "vlbg_wasser"
 
 # API Configuration
 API_BASE_URL = "https://vowis.vorarlberg.at/api/"
-API_TIMEOUT = 30
+# Seconds per attempt; failed attempts are retried with jittered backoff
+API_TIMEOUT = 10
+API_RETRIES = 2
+API_RETRY_BASE_DELAY = 1.0
+API_RETRY_MAX_DELAY = 8.0
+
+# Consecutive failures after which requests to an endpoint are paused, and
+# seconds until a trial request is sent again
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 120
 
 # River Stations Configuration
 RIVER_STATIONS = [
@@ -43,6 +52,42 @@ RIVER_STATIONS = [
     # TODO: Populate
 ]
 
+# River measurement fetch plan: (station capability flag, API type, data key)
+RIVER_MEASUREMENTS = (
+    ("supports_depth", "w", "depth"),
+    ("supports_flow", "q", "flow"),
+    ("supports_temperature", "wt", "temperature"),
+)
+
+# Bodensee sensor types mapped to the (German) field names of the see/ API
+BODENSEE_FIELDS = {
+    "air_humidity": "luftfeuchte",           # Air humidity
+    "air_temperature": "lufttemperatur",     # Air temperature
+    "water_level": "wasserstand",            # Water level
+    "water_temperature": "wTemperatur",      # Water temperature (surface)
+    "water_temperature_05m": "wtMilli05",    # Water temp at 0.5m depth
+    "water_temperature_25m": "wtMilli25",    # Water temp at 2.5m depth
+    "wind_speed": "windgeschwindigkeit",     # Wind speed
+    "wind_direction": "windrichtung",        # Wind direction
+    "wind_gust": "windboe",                  # Wind gust
+}
+
+# Flood thresholds of the see/ API by return period (years). "hW{n}" is the
+# level relative to the gauge zero (cm), "hW{n}abs" the level above sea (m)
+FLOOD_RETURN_PERIODS = (2, 10, 20, 30, 50, 100)
+
+# Flood level of the lake while it is below every threshold
+FLOOD_LEVEL_NORMAL = "normal"
+
+# Bodensee sensor types mapped to the fields of the newest seeArchiv entry:
+# the day's level and its minimum/mean/maximum over the record period
+BODENSEE_ARCHIVE_FIELDS = {
+    "daily_water_level": "w",
+    "long_term_minimum": "Min",
+    "long_term_mean": "Mit",
+    "long_term_maximum": "Max",
+}
+
 # Measurement type mappings
 MEASUREMENT_TYPES = {
     "w": "depth",         # Water Depth
@@ -51,4 +96,37 @@ MEASUREMENT_TYPES = {
 }
 
 # Default entity configuration
-DEFAULT_SCAN_INTERVAL = 300  # 5 minutes in seconds
\ No newline at end of file
+DEFAULT_SCAN_INTERVAL = 300  # 5 minutes in seconds
+
+# Refresh tiers, each with its own coordinator and interval (seconds). The
+# bodensee values advance hourly and its archive daily, but both tiers fetch
+# the same see/ payload; river tiers are named "river_{API type}"
+TIER_BODENSEE_LIVE = "bodensee_live"
+TIER_BODENSEE_ARCHIVE = "bodensee_archive"
+TIER_INTERVALS = {
+    TIER_BODENSEE_LIVE: 900,
+    TIER_BODENSEE_ARCHIVE: 21600,
+    "river_w": DEFAULT_SCAN_INTERVAL,
+    "river_q": DEFAULT_SCAN_INTERVAL,
+    "river_wt": 900,
+}
+
+# On-disk cache of the latest data, written at most once per delay (seconds)
+CACHE_STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 60
+
+# Upper bound on simultaneous requests to the VOWIS API per refresh
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Per-attempt timeout of requests to the VOWIS API (seconds)
+CONF_REQUEST_TIMEOUT = "request_timeout"
+
+# Unique ids of the river sensors (station id, data key) and identifiers of
+# the river station devices (station id)
+RIVER_UNIQUE_ID = "vowis_river_{}_{}"
+RIVER_DEVICE_ID = "river_station_{}"
+
+# Dispatcher signal announcing stations added to a running entry, formatted
+# with the entry id
+SIGNAL_STATIONS_ADDED = f"{DOMAIN}_stations_added_{{}}"
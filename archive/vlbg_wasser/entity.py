@@ -0,0 +1,56 @@
+"""Base entity for VOWIS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+_UNSET = object()
+
+
+def bodensee_device_info() -> dict[str, Any]:
+    """Return the device all bodensee entities are grouped under."""
+    return {
+        "identifiers": {(DOMAIN, "bodensee")},
+        "name": "Bodensee Station",
+        "manufacturer": "VOWIS",
+        "model": "Bodensee Station",
+    }
+
+
+class VowisCoordinatorEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when it changed.
+
+    Every refresh notifies all listeners of the coordinator. The entity
+    compares its availability and snapshot with what it wrote last and
+    skips the state write (and with it the recorder and event bus) when
+    nothing changed. Written and skipped writes are counted per refresh in
+    the coordinator's ``write_stats``.
+    """
+
+    _snapshot_key: tuple
+    _last_written: Any = _UNSET
+
+    def _state_signature(self) -> Any:
+        """Return what the written state depends on."""
+        return (self.available, self.coordinator.snapshot(self._snapshot_key))
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_written = self._state_signature()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed since the last write."""
+        signature = self._state_signature()
+        if signature == self._last_written:
+            self.coordinator.write_stats["skipped"] += 1
+            return
+        self._last_written = signature
+        self.coordinator.write_stats["written"] += 1
+        self.async_write_ha_state()
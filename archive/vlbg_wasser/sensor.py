@@ -9,9 +9,8 @@ Wir weisen ausdrücklich darauf hin, dass wir hinsichtlich Verfügbarkeit, Perfo
 
 from __future__ import annotations
 
-from datetime import datetime
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -26,12 +25,20 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfVolumeFlowRate,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    FLOOD_LEVEL_NORMAL,
+    FLOOD_RETURN_PERIODS,
+    RIVER_DEVICE_ID,
+    RIVER_UNIQUE_ID,
+    SIGNAL_STATIONS_ADDED,
+)
+from .entity import VowisCoordinatorEntity, bodensee_device_info
+from .snapshot import bodensee_key, flood_key, flood_level_name, river_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,7 +49,8 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up VOWIS sensors based on a config entry."""
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    tiers = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = tiers.bodensee_live
     
     entities = []
     
@@ -60,18 +68,42 @@ async def async_setup_entry(
         VowisBodenseeSensor(coordinator, "wind_gust", "Wind Gust", UnitOfSpeed.KILOMETERS_PER_HOUR, SensorDeviceClass.WIND_SPEED),
     ]
     entities.extend(bodensee_sensors)
+    entities.append(VowisBodenseeFloodLevelSensor(coordinator))
+    
+    # Long-term statistics of the day, refreshed by the slow archive tier
+    archive = tiers.bodensee_archive
+    entities.extend([
+        VowisBodenseeSensor(archive, "daily_water_level", "Daily Water Level", "cm", None),
+        VowisBodenseeSensor(archive, "long_term_minimum", "Long-term Minimum Level", "cm", None),
+        VowisBodenseeSensor(archive, "long_term_mean", "Long-term Mean Level", "cm", None),
+        VowisBodenseeSensor(archive, "long_term_maximum", "Long-term Maximum Level", "cm", None),
+    ])
     
     # Add river sensors only for stations enabled by the user
     # This helps reduce API calls and only monitors relevant stations
-    enabled_stations = config_entry.data.get("enabled_stations", [])
-    river_stations = config_entry.data.get("river_stations", [])
+    entities.extend(_river_sensors(tiers, config_entry.data.get("enabled_stations", [])))
     
-    for station_id in enabled_stations:
-        # Find the station configuration
-        station_config = next(
-            (s for s in river_stations if s["id"] == station_id),
-            None
+    # Add all entities to Home Assistant
+    async_add_entities(entities)
+    
+    # Stations enabled later in the options join the running entry
+    @callback
+    def async_add_stations(station_ids: list[str]) -> None:
+        async_add_entities(_river_sensors(tiers, station_ids))
+    
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_STATIONS_ADDED.format(config_entry.entry_id), async_add_stations
         )
+    )
+
+
+def _river_sensors(tiers, station_ids: list[str]) -> list[VowisRiverSensor]:
+    """Return the sensors of some river stations."""
+    entities = []
+    for station_id in station_ids:
+        # Find the station configuration
+        station_config = tiers.stations_by_id.get(station_id)
         
         if not station_config:
             _LOGGER.warning("Station configuration not found for ID: %s", station_id)
@@ -82,7 +114,7 @@ async def async_setup_entry(
         if station_config.get("supports_depth", False):
             entities.append(
                 VowisRiverSensor(
-                    coordinator, station_id, "depth", 
+                    tiers.rivers["depth"], station_id, "depth", 
                     f"{station_config['name']} Water Depth",
                     "m", None, station_config
                 )
@@ -91,7 +123,7 @@ async def async_setup_entry(
         if station_config.get("supports_flow", False):
             entities.append(
                 VowisRiverSensor(
-                    coordinator, station_id, "flow",
+                    tiers.rivers["flow"], station_id, "flow",
                     f"{station_config['name']} Water Flow",
                     "m³/s", SensorDeviceClass.VOLUME_FLOW_RATE, station_config
                 )
@@ -100,17 +132,15 @@ async def async_setup_entry(
         if station_config.get("supports_temperature", False):
             entities.append(
                 VowisRiverSensor(
-                    coordinator, station_id, "temperature",
+                    tiers.rivers["temperature"], station_id, "temperature",
                     f"{station_config['name']} Water Temperature", 
                     UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE, station_config
                 )
             )
-    
-    # Add all entities to Home Assistant
-    async_add_entities(entities)
+    return entities
 
 
-class VowisBodenseeSensor(CoordinatorEntity, SensorEntity):
+class VowisBodenseeSensor(VowisCoordinatorEntity, SensorEntity):
     """Representation of a VOWIS bodensee sensor.
     
     Bodensee sensors monitor comprehensive weather and water conditions
@@ -135,92 +165,73 @@ class VowisBodenseeSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_class = device_class
         self._attr_state_class = SensorStateClass.MEASUREMENT
         
-        # Map our sensor types to the actual API field names
-        # The API uses German field names, so we map them here
-        self._field_map = {
-            "air_humidity": "luftfeuchte",           # Air humidity
-            "air_temperature": "lufttemperatur",     # Air temperature
-            "water_level": "wasserstand",            # Water level
-            "water_temperature": "wTemperatur",      # Water temperature (surface)
-            "water_temperature_05m": "wtMilli05",    # Water temp at 0.5m depth
-            "water_temperature_25m": "wtMilli25",    # Water temp at 2.5m depth
-            "wind_speed": "windgeschwindigkeit",     # Wind speed
-            "wind_direction": "windrichtung",        # Wind direction
-            "wind_gust": "windboe",                  # Wind gust
-        }
+        self._snapshot_key = bodensee_key(sensor_type)
 
     @property
     def device_info(self) -> Dict[str, Any]:
         """Return device information for grouping sensors."""
-        return {
-            "identifiers": {(DOMAIN, "bodensee")},
-            "name": "Bodensee Station",
-            "manufacturer": "VOWIS",
-            "model": "Bodensee Station",
-        }
+        return bodensee_device_info()
 
     @property
     def native_value(self) -> float | None:
         """Return the current sensor value.
         
-        Extracts the 'wert' (value) field from the API response.
-        Returns None if data is unavailable or malformed.
+        The 'wert' (value) field of the measurement, taken from the snapshot
+        the coordinator built. Returns None if data is unavailable.
         """
-        if not self.coordinator.data or "bodensee" not in self.coordinator.data:
-            return None
-            
-        bodensee_data = self.coordinator.data["bodensee"]
-        field_name = self._field_map.get(self._sensor_type)
-        
-        if not field_name or field_name not in bodensee_data:
-            return None
-            
-        field_data = bodensee_data[field_name]
-        
-        # API returns data in format: {"datum": "timestamp", "wert": value}
-        if isinstance(field_data, dict) and "wert" in field_data:
-            return field_data["wert"]
-            
-        return None
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return snapshot.value if snapshot else None
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any] | None:
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return additional sensor attributes.
         
         Includes timestamp of last measurement and special attributes
         like reference levels for certain measurements.
         """
-        if not self.coordinator.data or "bodensee" not in self.coordinator.data:
-            return None
-            
-        bodensee_data = self.coordinator.data["bodensee"]
-        field_name = self._field_map.get(self._sensor_type)
-        
-        if not field_name or field_name not in bodensee_data:
-            return None
-            
-        field_data = bodensee_data[field_name]
-        attributes = {}
-        
-        # Extract timestamp from the measurement data
-        if isinstance(field_data, dict) and "datum" in field_data:
-            try:
-                # Convert ISO timestamp to proper datetime
-                timestamp = datetime.fromisoformat(field_data["datum"].replace("Z", "+00:00"))
-                attributes["last_updated"] = timestamp.isoformat()
-            except (ValueError, TypeError) as e:
-                _LOGGER.debug("Failed to parse timestamp for %s: %s", self._sensor_type, e)
-        
-        # Add special attributes for water level sensor
-        # The reference level helps interpret absolute water level measurements
-        if self._sensor_type == "water_level" and "pegelnullpunkt" in bodensee_data:
-            attributes["reference_level"] = bodensee_data["pegelnullpunkt"]
-            attributes["reference_level_unit"] = "m"
-        
-        return attributes if attributes else None
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return (snapshot.attributes or None) if snapshot else None
 
 
-class VowisRiverSensor(CoordinatorEntity, SensorEntity):
+class VowisBodenseeFloodLevelSensor(VowisCoordinatorEntity, SensorEntity):
+    """Highest flood threshold the Bodensee water level exceeds.
+
+    The level band is computed once per payload by the coordinator, and the
+    state is only written when the band changes.
+    """
+
+    _attr_name = "Bodensee Flood Level"
+    _attr_unique_id = "vowis_bodensee_flood_level"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [FLOOD_LEVEL_NORMAL] + [
+        flood_level_name(return_period) for return_period in FLOOD_RETURN_PERIODS
+    ]
+    _snapshot_key = flood_key("level")
+
+    @property
+    def device_info(self) -> Dict[str, Any]:
+        """Return device information for grouping sensors."""
+        return bodensee_device_info()
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the flood level band."""
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return snapshot.value if snapshot else None
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the thresholds and the record levels."""
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return (snapshot.attributes or None) if snapshot else None
+
+    @property
+    def available(self) -> bool:
+        """Return True if the last payload held a water level."""
+        return self.coordinator.snapshot(self._snapshot_key) is not None
+
+
+class VowisRiverSensor(VowisCoordinatorEntity, SensorEntity):
     """Representation of a VOWIS river sensor.
     
     River sensors monitor specific measurements (depth, flow, temperature)
@@ -244,7 +255,8 @@ class VowisRiverSensor(CoordinatorEntity, SensorEntity):
         self._measurement_type = measurement_type
         self._station_config = station_config
         self._attr_name = name
-        self._attr_unique_id = f"vowis_river_{station_id}_{measurement_type}"
+        self._attr_unique_id = RIVER_UNIQUE_ID.format(station_id, measurement_type)
+        self._snapshot_key = river_key(station_id, measurement_type)
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = device_class
         self._attr_state_class = SensorStateClass.MEASUREMENT
@@ -253,7 +265,7 @@ class VowisRiverSensor(CoordinatorEntity, SensorEntity):
     def device_info(self) -> Dict[str, Any]:
         """Return device information for grouping sensors by station."""
         return {
-            "identifiers": {(DOMAIN, f"river_station_{self._station_id}")},
+            "identifiers": {(DOMAIN, RIVER_DEVICE_ID.format(self._station_id))},
             "name": self._station_config["name"],
             "manufacturer": "VOWIS",
             "model": "River Station",
@@ -264,95 +276,28 @@ class VowisRiverSensor(CoordinatorEntity, SensorEntity):
     def native_value(self) -> float | None:
         """Return the current sensor value.
         
-        Extracts the most recent measurement value from the API response.
-        River data contains time-series measurements, so we take the latest.
+        River data contains time-series measurements; the coordinator puts
+        the latest one into this sensor's snapshot.
         """
-        # Check if we have data for this station
-        if (not self.coordinator.data or 
-            "rivers" not in self.coordinator.data or
-            self._station_id not in self.coordinator.data["rivers"]):
-            return None
-            
-        station_data = self.coordinator.data["rivers"][self._station_id]
-        
-        # Check if this measurement type is available for this station
-        if self._measurement_type not in station_data:
-            return None
-            
-        measurement_data = station_data[self._measurement_type]
-        
-        # Extract the most recent measurement value
-        # API format: {"Messwerte": {"2025-06-25T19:00:00": 5.534, ...}}
-        if "Messwerte" in measurement_data and measurement_data["Messwerte"]:
-            messwerte = measurement_data["Messwerte"]
-            if messwerte:
-                # Get the measurement with the latest timestamp
-                latest_timestamp = max(messwerte.keys())
-                return messwerte[latest_timestamp]
-                
-        return None
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return snapshot.value if snapshot else None
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any] | None:
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return additional sensor attributes.
         
         Includes metadata about the measurement (parameter type, unit, timezone)
         and timestamp of the latest measurement.
         """
-        # Check if we have data for this station
-        if (not self.coordinator.data or 
-            "rivers" not in self.coordinator.data or
-            self._station_id not in self.coordinator.data["rivers"]):
-            return None
-            
-        station_data = self.coordinator.data["rivers"][self._station_id]
-        
-        if self._measurement_type not in station_data:
-            return None
-            
-        measurement_data = station_data[self._measurement_type]
-        attributes = {}
-        
-        # Add metadata from the API response
-        if "Parameter" in measurement_data:
-            attributes["parameter"] = measurement_data["Parameter"]
-        if "Einheit" in measurement_data:
-            attributes["api_unit"] = measurement_data["Einheit"]  # Original unit from API
-        if "Zeit" in measurement_data:
-            attributes["timezone"] = measurement_data["Zeit"]
-            
-        # Add timestamp of the latest measurement
-        if "Messwerte" in measurement_data and measurement_data["Messwerte"]:
-            messwerte = measurement_data["Messwerte"]
-            if messwerte:
-                latest_timestamp = max(messwerte.keys())
-                try:
-                    # Parse and format the timestamp
-                    timestamp = datetime.fromisoformat(latest_timestamp)
-                    attributes["last_updated"] = timestamp.isoformat()
-                except (ValueError, TypeError):
-                    # If parsing fails, store the raw timestamp
-                    attributes["last_updated"] = latest_timestamp
-        
-        # Add station metadata for context
-        attributes["station_id"] = self._station_id
-        attributes["river"] = self._station_config["river"]
-        
-        return attributes if attributes else None
+        snapshot = self.coordinator.snapshot(self._snapshot_key)
+        return (snapshot.attributes or None) if snapshot else None
 
     @property
     def available(self) -> bool:
         """Return True if the sensor data is available.
         
-        A river sensor is considered available if:
-        1. The coordinator has data
-        2. This station has data
-        3. This measurement type has data for this station
+        A river sensor is considered available if the last refresh produced
+        a snapshot for this station and measurement type, which requires
+        measurements for it.
         """
-        return (
-            self.coordinator.data is not None and
-            "rivers" in self.coordinator.data and
-            self._station_id in self.coordinator.data["rivers"] and
-            self._measurement_type in self.coordinator.data["rivers"][self._station_id] and
-            bool(self.coordinator.data["rivers"][self._station_id][self._measurement_type].get("Messwerte"))
-        )
\ No newline at end of file
+        return self.coordinator.snapshot(self._snapshot_key) is not None
@@ -0,0 +1,247 @@
+"""
+Per-sensor snapshots of the VOWIS data
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from const import (
+    BODENSEE_ARCHIVE_FIELDS,
+    BODENSEE_FIELDS,
+    FLOOD_LEVEL_NORMAL,
+    FLOOD_RETURN_PERIODS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+EMPTY_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class SensorSnapshot:
+    """Immutable state of one sensor, built once per coordinator refresh.
+
+    Sensors only return fields of their snapshot, so a state write does not
+    depend on the size of the payload or the number of sensors reading it.
+    """
+
+    value: Any
+    timestamp: Optional[datetime]
+    attributes: Mapping[str, Any] = field(default_factory=lambda: EMPTY_ATTRIBUTES)
+
+
+def bodensee_key(sensor_type: str) -> tuple:
+    """Return the snapshot key of a bodensee sensor."""
+    return ("bodensee", sensor_type)
+
+
+def flood_key(name: str) -> tuple:
+    """Return the snapshot key of a bodensee flood entity."""
+    return ("bodensee_flood", name)
+
+
+def flood_level_name(return_period: int) -> str:
+    """Return the flood level name of a threshold, e.g. "hw10"."""
+    return f"hw{return_period}"
+
+
+def river_key(station_id: str, measurement_type: str) -> tuple:
+    """Return the snapshot key of a river sensor."""
+    return ("river", station_id, measurement_type)
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an API timestamp, accepting the 'Z' suffix of the see/ API."""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError, TypeError) as exception:
+        _LOGGER.debug("Failed to parse timestamp %s: %s", value, exception)
+        return None
+
+
+def build_bodensee_snapshots(bodensee_data: Dict[str, Any]) -> Dict[tuple, SensorSnapshot]:
+    """Build the snapshots of all bodensee sensors from a see/ payload."""
+    snapshots = {}
+
+    for sensor_type, field_name in BODENSEE_FIELDS.items():
+        field_data = bodensee_data.get(field_name)
+
+        # API returns data in format: {"datum": "timestamp", "wert": value}
+        if not isinstance(field_data, dict) or "wert" not in field_data:
+            continue
+
+        attributes = {}
+        timestamp = _parse_timestamp(field_data.get("datum"))
+        if timestamp is not None:
+            attributes["last_updated"] = timestamp.isoformat()
+
+        # The reference level helps interpret absolute water level measurements
+        if sensor_type == "water_level" and "pegelnullpunkt" in bodensee_data:
+            attributes["reference_level"] = bodensee_data["pegelnullpunkt"]
+            attributes["reference_level_unit"] = "m"
+
+        snapshots[bodensee_key(sensor_type)] = SensorSnapshot(
+            value=field_data["wert"],
+            timestamp=timestamp,
+            attributes=MappingProxyType(attributes),
+        )
+
+    water_level = snapshots.get(bodensee_key("water_level"))
+    if water_level is not None and isinstance(water_level.value, (int, float)):
+        snapshots.update(build_flood_snapshots(bodensee_data, water_level.value))
+
+    return snapshots
+
+
+def latest_archive_entry(bodensee_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the newest seeArchiv entry of a see/ payload."""
+    entries = [
+        entry for entry in bodensee_data.get("seeArchiv") or ()
+        if isinstance(entry, dict) and isinstance(entry.get("datum"), str)
+    ]
+    return max(entries, key=lambda entry: entry["datum"]) if entries else None
+
+
+def build_bodensee_archive_snapshots(bodensee_data: Dict[str, Any]) -> Dict[tuple, SensorSnapshot]:
+    """Build the snapshots of the bodensee archive sensors from a see/ payload.
+
+    Each seeArchiv entry holds the level of a day and the minimum, mean and
+    maximum of that calendar day over the record period; the newest entry
+    is used.
+    """
+    latest = latest_archive_entry(bodensee_data)
+    if latest is None:
+        return {}
+
+    timestamp = _parse_timestamp(latest["datum"])
+    attributes = MappingProxyType(
+        {
+            "day": latest.get("tagMonat"),
+            "period": latest.get("ZRBereich"),
+            "last_updated": timestamp.isoformat() if timestamp else latest["datum"],
+        }
+    )
+
+    snapshots = {}
+    for sensor_type, field_name in BODENSEE_ARCHIVE_FIELDS.items():
+        if (value := latest.get(field_name)) is not None:
+            snapshots[bodensee_key(sensor_type)] = SensorSnapshot(
+                value=value, timestamp=timestamp, attributes=attributes
+            )
+    return snapshots
+
+
+def _flood_thresholds(bodensee_data: Dict[str, Any]) -> list[tuple[float, int, Any]]:
+    """Return (level, return period, absolute level) of the thresholds, by level."""
+    thresholds = []
+    for return_period in FLOOD_RETURN_PERIODS:
+        level = bodensee_data.get(f"hW{return_period}")
+        if isinstance(level, (int, float)):
+            thresholds.append((level, return_period, bodensee_data.get(f"hW{return_period}abs")))
+    thresholds.sort()
+    return thresholds
+
+
+def _record(bodensee_data: Dict[str, Any], field_name: str) -> tuple[Any, Any]:
+    """Return value and date of a record (nnw/hhw) of the see/ payload."""
+    record = bodensee_data.get(field_name)
+    if not isinstance(record, dict):
+        return None, None
+    return record.get("wert"), record.get("datum")
+
+
+def build_flood_snapshots(
+    bodensee_data: Dict[str, Any], water_level: float
+) -> Dict[tuple, SensorSnapshot]:
+    """Build the snapshots of the flood level and threshold entities.
+
+    The thresholds are parsed once per payload and the level band is found
+    by bisection. The snapshots carry no timestamp and nothing derived from
+    the water level but the band, so they only compare unequal, and the
+    entities only write their state, when the band changes.
+    """
+    thresholds = _flood_thresholds(bodensee_data)
+    levels = [level for level, _, _ in thresholds]
+    exceeded = bisect_right(levels, water_level)
+
+    snapshots = {}
+    for index, (level, return_period, absolute_level) in enumerate(thresholds):
+        snapshots[flood_key(flood_level_name(return_period))] = SensorSnapshot(
+            value=index < exceeded,
+            timestamp=None,
+            attributes=MappingProxyType(
+                {
+                    "threshold": level,
+                    "threshold_unit": "cm",
+                    "threshold_absolute": absolute_level,
+                    "threshold_absolute_unit": "m",
+                }
+            ),
+        )
+
+    lowest, lowest_date = _record(bodensee_data, "nnw")
+    highest, highest_date = _record(bodensee_data, "hhw")
+    snapshots[flood_key("level")] = SensorSnapshot(
+        value=flood_level_name(thresholds[exceeded - 1][1]) if exceeded else FLOOD_LEVEL_NORMAL,
+        timestamp=None,
+        attributes=MappingProxyType(
+            {
+                "thresholds": {
+                    flood_level_name(return_period): level
+                    for level, return_period, _ in thresholds
+                },
+                "reference_level": bodensee_data.get("pegelnullpunkt"),
+                "lowest_level": lowest,
+                "lowest_level_date": lowest_date,
+                "highest_level": highest,
+                "highest_level_date": highest_date,
+            }
+        ),
+    )
+    return snapshots
+
+
+def build_river_snapshot(
+    station_id: str,
+    station_config: Dict[str, Any],
+    measurement_data: Dict[str, Any],
+) -> Optional[SensorSnapshot]:
+    """Build the snapshot of a river sensor from a messwerte station block.
+
+    Returns None when the block holds no measurements.
+    """
+    messwerte = measurement_data.get("Messwerte")
+    if not messwerte:
+        return None
+
+    # API format: {"Messwerte": {"2025-06-25T19:00:00": 5.534, ...}}
+    latest_timestamp = max(messwerte.keys())
+    attributes = {}
+
+    # Add metadata from the API response
+    if "Parameter" in measurement_data:
+        attributes["parameter"] = measurement_data["Parameter"]
+    if "Einheit" in measurement_data:
+        attributes["api_unit"] = measurement_data["Einheit"]  # Original unit from API
+    if "Zeit" in measurement_data:
+        attributes["timezone"] = measurement_data["Zeit"]
+
+    # If parsing fails, store the raw timestamp
+    timestamp = _parse_timestamp(latest_timestamp)
+    attributes["last_updated"] = timestamp.isoformat() if timestamp else latest_timestamp
+
+    # Add station metadata for context
+    attributes["station_id"] = station_id
+    attributes["river"] = station_config["river"]
+
+    return SensorSnapshot(
+        value=messwerte[latest_timestamp],
+        timestamp=timestamp,
+        attributes=MappingProxyType(attributes),
+    )
@@ -5,13 +5,25 @@ API client to scrape Vorarlberg Abfluss Data
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
+import random
+import time
 from typing import Any, Dict, Optional
 
 import aiohttp
 import async_timeout
 
-from const import API_BASE_URL, API_TIMEOUT
+from const import (
+  API_BASE_URL,
+  API_RETRIES,
+  API_RETRY_BASE_DELAY,
+  API_RETRY_MAX_DELAY,
+  API_TIMEOUT,
+  BREAKER_FAILURE_THRESHOLD,
+  BREAKER_RESET_TIMEOUT,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,33 +32,258 @@ class VowisApiError(Exception):
   """Exception to indicate a general API error."""
 
 
+class VowisApiConnectionError(VowisApiError):
+  """Exception to indicate a failure worth retrying."""
+
+
+class CircuitBreaker:
+  """Fail fast while an endpoint keeps failing.
+
+  After ``threshold`` consecutive failed calls the breaker opens and calls
+  are refused for ``reset_timeout`` seconds. Then a single trial call is
+  let through (half open); its outcome closes or re-opens the breaker.
+  Calls that say nothing about the endpoint's health, like cancelled or
+  rejected (4xx) ones, are released and leave the state as it is.
+  """
+
+  def __init__(self, name: str, threshold: int = BREAKER_FAILURE_THRESHOLD,
+               reset_timeout: float = BREAKER_RESET_TIMEOUT) -> None:
+    """Initialize a closed breaker."""
+    self.name = name
+    self.threshold = threshold
+    self.reset_timeout = reset_timeout
+    self.state = "closed"
+    self.failures = 0
+    self.trips = 0
+    self.opened_at: Optional[float] = None
+    self._trial = False
+
+  def allow(self) -> bool:
+    """Return whether a call may be sent now."""
+    if self.state == "closed":
+      return True
+    if self.state == "open":
+      if time.monotonic() - self.opened_at < self.reset_timeout:
+        return False
+      self.state = "half_open"
+      self._trial = False
+    if self._trial:
+      return False
+    self._trial = True
+    return True
+
+  def success(self) -> None:
+    """Record a call that reached the endpoint."""
+    if self.state != "closed":
+      _LOGGER.info("VOWIS endpoint %s is reachable again", self.name)
+    self.state = "closed"
+    self.failures = 0
+    self.opened_at = None
+    self._trial = False
+
+  def failure(self) -> None:
+    """Record a failed call, opening the breaker at the threshold."""
+    self.failures += 1
+    self._trial = False
+    if self.state == "half_open" or self.failures >= self.threshold:
+      if self.state == "closed":
+        _LOGGER.warning(
+          "VOWIS endpoint %s failed %d times, pausing requests for %ss",
+          self.name, self.failures, self.reset_timeout
+        )
+      elif self.state == "half_open":
+        _LOGGER.debug("Trial request to VOWIS endpoint %s failed", self.name)
+      if self.state != "open":
+        self.trips += 1
+      self.state = "open"
+      self.opened_at = time.monotonic()
+
+  def release(self) -> None:
+    """Forget a call that neither succeeded nor failed, e.g. a trial."""
+    self._trial = False
+
+  def as_dict(self) -> Dict[str, Any]:
+    """Return the breaker state for diagnostics."""
+    retry_in = None
+    if self.state == "open":
+      retry_in = max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+    return {
+      "state": self.state,
+      "failures": self.failures,
+      "trips": self.trips,
+      "retry_in": retry_in,
+    }
+
+
 class VowisApi:
-  """VOWIS API client."""
+  """VOWIS API client.
+
+  Responses are cached per request. The cache is revalidated with
+  ETag/Last-Modified when the server supports it; otherwise a hash of the
+  raw body detects identical payloads. Either way an unchanged response
+  returns the previously decoded object without decoding it again.
 
-  def __init__(self, session: aiohttp.ClientSession) -> None:
+  Each attempt is limited to ``timeout`` seconds and failed attempts are
+  retried up to ``retries`` times. A circuit breaker per endpoint pauses
+  requests after repeated failures; while it is open the last good data
+  of a request is returned instead.
+  """
+
+  def __init__(self, session: aiohttp.ClientSession, timeout: float = API_TIMEOUT,
+               retries: int = API_RETRIES) -> None:
     """Initialize the API client."""
     self._session = session
     self._base_url = API_BASE_URL
+    self._timeout = timeout
+    self._retries = retries
+    self._cache: Dict[str, Dict[str, Any]] = {}
+    self._breakers: Dict[str, CircuitBreaker] = {}
+    self._inflight: Dict[str, asyncio.Future] = {}
+
+    # How often a request was answered from the cache
+    self.stats = {
+      "requests": 0,
+      "not_modified": 0,
+      "unchanged_payload": 0,
+      "retries": 0,
+      "rejected": 0,
+      "served_stale": 0,
+      "coalesced": 0,
+    }
+
+  def breaker_states(self) -> Dict[str, Dict[str, Any]]:
+    """Return the circuit breaker state of every endpoint used so far."""
+    return {name: breaker.as_dict() for name, breaker in self._breakers.items()}
 
   async def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Make an API request."""
+    """Make an API request, joining an identical one that is in flight.
+
+    The bodensee tiers both read see/, so on the first refresh after setup
+    they share one download.
+    """
+    cache_key = f"{endpoint}?{sorted(params.items())}" if params else endpoint
+    inflight = self._inflight.get(cache_key)
+    if inflight is not None:
+      self.stats["coalesced"] += 1
+    else:
+      inflight = asyncio.ensure_future(
+        self._guarded_request(endpoint, params, cache_key))
+      self._inflight[cache_key] = inflight
+      inflight.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+    # A cancelled caller must not cancel the request others wait for
+    return await asyncio.shield(inflight)
+
+  async def _guarded_request(self, endpoint: str, params: Optional[Dict[str, Any]],
+                             cache_key: str) -> Dict[str, Any]:
+    """Make an API request, guarded by the endpoint's circuit breaker."""
+    breaker = self._breakers.get(endpoint)
+    if breaker is None:
+      breaker = self._breakers[endpoint] = CircuitBreaker(endpoint)
+
+    if not breaker.allow():
+      self.stats["rejected"] += 1
+      cached = self._cache.get(cache_key)
+      if cached is not None:
+        self.stats["served_stale"] += 1
+        return cached["data"]
+      raise VowisApiConnectionError(
+        f"Requests to {endpoint} are paused after repeated failures")
+
+    try:
+      data = await self._request_with_retries(endpoint, params, cache_key)
+    except VowisApiConnectionError:
+      breaker.failure()
+      raise
+    except (VowisApiError, asyncio.CancelledError):
+      # A rejected request does not show that the endpoint is healthy again,
+      # nor that it is down
+      breaker.release()
+      raise
+
+    breaker.success()
+    return data
+
+  async def _request_with_retries(self, endpoint: str, params: Optional[Dict[str, Any]],
+                                  cache_key: str) -> Dict[str, Any]:
+    """Make an API request, retrying connection errors with backoff."""
+    for attempt in range(self._retries + 1):
+      try:
+        return await self._request(endpoint, params, cache_key)
+      except VowisApiConnectionError as exception:
+        if attempt == self._retries:
+          raise
+        # Full jitter keeps retries of many stations from arriving together
+        delay = random.uniform(0, min(API_RETRY_MAX_DELAY, API_RETRY_BASE_DELAY * 2**attempt))
+        _LOGGER.debug("%s, retrying in %.1fs", exception, delay)
+        self.stats["retries"] += 1
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+  async def _request(self, endpoint: str, params: Optional[Dict[str, Any]],
+                     cache_key: str) -> Dict[str, Any]:
+    """Make a single API request."""
     url = f"{self._base_url}{endpoint}"
+    cached = self._cache.get(cache_key)
+
+    headers = {}
+    if cached is not None:
+      if cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+      if cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
 
     try:
-      async with async_timeout.timeout(API_TIMEOUT):
-        async with self._session.get(url, params=params) as response:
+      async with async_timeout.timeout(self._timeout):
+        async with self._session.get(url, params=params, headers=headers) as response:
+          self.stats["requests"] += 1
+
+          if response.status == 304 and cached is not None:
+            self.stats["not_modified"] += 1
+            return cached["data"]
+
+          if response.status >= 500 or response.status in (408, 429):
+            raise VowisApiConnectionError(
+              f"Request to {url} failed with status {response.status}")
           response.raise_for_status()
-          data = await response.json()
-          return data
+          body = await response.read()
+          etag = response.headers.get("ETag")
+          last_modified = response.headers.get("Last-Modified")
+    except VowisApiError:
+      raise
     except asyncio.TimeoutError as exception:
-      raise VowisApiError(f"Request to {url} timed out") from exception
-    except aiohttp.ClientError as exception:
+      raise VowisApiConnectionError(
+        f"Request to {url} timed out after {self._timeout}s") from exception
+    except aiohttp.ClientResponseError as exception:
       raise VowisApiError(
+        f"Request to {url} was rejected: {exception}") from exception
+    except aiohttp.ClientError as exception:
+      raise VowisApiConnectionError(
         f"Request to {url} failed: {exception}") from exception
     except Exception as exception:
       raise VowisApiError(
         f"Unexpected error for {url}: {exception}") from exception
 
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    if cached is not None and cached["digest"] == digest:
+      self.stats["unchanged_payload"] += 1
+      cached["etag"] = etag
+      cached["last_modified"] = last_modified
+      return cached["data"]
+
+    try:
+      data = json.loads(body)
+    except ValueError as exception:
+      raise VowisApiError(
+        f"Invalid JSON from {url}: {exception}") from exception
+
+    self._cache[cache_key] = {
+      "digest": digest,
+      "etag": etag,
+      "last_modified": last_modified,
+      "data": data,
+    }
+    return data
+
   async def get_bodensee_data(self) -> Optional[list]:
     """Get bodensee station data."""
     try:
@@ -92,11 +329,20 @@ class VowisApi:
       return None
 
   async def test_connection(self) -> bool:
-    """Test the connection to the API."""
+    """Test the connection to the API.
+
+    Sends a HEAD request for the bodensee endpoint, so no payload is
+    downloaded; any answer short of a server error counts as reachable.
+    """
+    url = f"{self._base_url}see/"
     try:
-      # Test against the bodensee's API
-      bodensee_data = await self.get_bodensee_data()
-      return bodensee_data is not None
-    except Exception as exception:
+      async with async_timeout.timeout(self._timeout):
+        async with self._session.head(url) as response:
+          self.stats["requests"] += 1
+          if response.status >= 500:
+            _LOGGER.error("Connection test failed with status %s", response.status)
+            return False
+          return True
+    except (asyncio.TimeoutError, aiohttp.ClientError) as exception:
       _LOGGER.error("Connection test failed: %s", exception)
       return False
@@ -0,0 +1 @@
+"""Offline benchmarks against a local VOWIS stand-in server."""
@@ -0,0 +1,454 @@
+"""Benchmark refreshes against the local VOWIS stand-in server.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run --stations 50 --parameters w,q,wt --refreshes 20
+
+Targets:
+
+- ``vowis_api``: the archive ``VowisApi`` client, fanned out like the
+  archive coordinator does (bodensee plus every station and parameter).
+- ``core``: the Home Assistant independent ``VowisClient`` of the new
+  integration, imported as the top-level ``core`` package.
+- ``api``: the ``VlbgWasserAPI`` client of the new integration, i.e. the
+  core client on Home Assistant's session.
+- ``archive_coordinator`` / ``coordinator``: a full ``_async_update_data``
+  of the respective coordinator (of every refresh tier, for the archive).
+
+All but ``vowis_api`` and ``core`` need Home Assistant installed and are skipped
+otherwise. Between refreshes the server clock advances by one 5 minute step
+(unless ``--static``), the shared client's response cache is cleared as if
+its TTL had elapsed, and the new coordinator's scheduler is reset so every
+series is due.
+
+Each target is run twice: once for timings, and once under tracemalloc for
+the peak memory and the blocks still allocated after each refresh. CPython
+has no allocation counter, so "blocks" is the net number of live blocks a
+refresh adds.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import importlib.util
+import inspect
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+from typing import Any
+
+import aiohttp
+
+from .server import PARAMETERS, ServerConfig, StandInServer, station_ids
+
+ROOT = Path(__file__).resolve().parent.parent
+ARCHIVE_DIR = ROOT / "archive" / "vlbg_wasser"
+CORE_PARENT = ROOT / "custom_components" / "vlgb_wasser"
+
+TARGETS = ("vowis_api", "core", "api", "archive_coordinator", "coordinator")
+
+Refresh = Callable[[], Awaitable[Any]]
+
+
+class TargetUnavailable(Exception):
+    """Raised when a target cannot run in this environment."""
+
+
+def _import_archive(name: str) -> Any:
+    """Import a module of the archive integration, which uses absolute imports."""
+    if str(ARCHIVE_DIR) not in sys.path:
+        sys.path.insert(0, str(ARCHIVE_DIR))
+    if name == "__init__":
+        spec = importlib.util.spec_from_file_location(
+            "vlbg_wasser_archive", ARCHIVE_DIR / "__init__.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return importlib.import_module(name)
+
+
+async def _async_hass(config_dir: str) -> Any:
+    """Return a Home Assistant instance, or raise TargetUnavailable."""
+    try:
+        from homeassistant.core import HomeAssistant  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise TargetUnavailable("Home Assistant is not installed") from error
+    return HomeAssistant(config_dir)
+
+
+def _config_entry(domain: str, data: dict[str, Any], options: dict[str, Any]) -> Any:
+    """Return a config entry, passing only the arguments this HA version takes."""
+    from homeassistant.config_entries import ConfigEntry  # pylint: disable=import-outside-toplevel
+
+    arguments = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": domain,
+        "title": "benchmark",
+        "data": data,
+        "options": options,
+        "source": "user",
+        "unique_id": None,
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": None,
+    }
+    accepted = inspect.signature(ConfigEntry).parameters
+    return ConfigEntry(**{key: value for key, value in arguments.items() if key in accepted})
+
+
+class Bench:
+    """Set up one target against the server and return its refresh function."""
+
+    def __init__(self, server: StandInServer, args: argparse.Namespace, config_dir: str) -> None:
+        """Initialize the setup."""
+        self.server = server
+        self.args = args
+        self.config_dir = config_dir
+        self.stations = station_ids(args.stations)
+        self.parameters = args.parameters
+        self.cleanups: list[Callable[[], Awaitable[Any]]] = []
+
+    async def close(self) -> None:
+        """Release everything the target set up."""
+        for cleanup in reversed(self.cleanups):
+            await cleanup()
+
+    async def vowis_api(self) -> Refresh:
+        """Return a refresh of the archive client."""
+        vowis_api = _import_archive("vowis_api")
+        session = aiohttp.ClientSession()
+        self.cleanups.append(session.close)
+        api = vowis_api.VowisApi(session)
+        api._base_url = self.server.base_url  # pylint: disable=protected-access
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+
+        async def limited(coro: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await coro
+
+        async def refresh() -> None:
+            await asyncio.gather(
+                limited(api.get_bodensee_data()),
+                *(
+                    limited(api.get_river_data(station_id, measurement_type))
+                    for station_id in self.stations
+                    for measurement_type in self.parameters
+                ),
+            )
+
+        return refresh
+
+    async def _hass(self) -> Any:
+        """Return a Home Assistant instance that is stopped on close."""
+        hass = await _async_hass(self.config_dir)
+        self.cleanups.append(hass.async_stop)
+        return hass
+
+    async def api(self) -> Refresh:
+        """Return a refresh of the new integration's client."""
+        hass = await self._hass()
+        if str(ROOT) not in sys.path:
+            sys.path.insert(0, str(ROOT))
+        from custom_components.vlgb_wasser import api as api_module  # pylint: disable=import-outside-toplevel
+
+        api = api_module.VlbgWasserAPI(hass)
+        api._base_url = self.server.base_url  # pylint: disable=protected-access
+        api.limiter.configure(self.args.rate, self.args.burst)
+        return self._client_refresh(api)
+
+    async def core(self) -> Refresh:
+        """Return a refresh of the Home Assistant independent core client."""
+        if str(CORE_PARENT) not in sys.path:
+            sys.path.insert(0, str(CORE_PARENT))
+        # pylint: disable=import-outside-toplevel
+        from core.client import VowisClient
+        from core.ratelimit import RateLimiter
+
+        session = aiohttp.ClientSession()
+        self.cleanups.append(session.close)
+        return self._client_refresh(
+            VowisClient(
+                session,
+                base_url=self.server.base_url,
+                limiter=RateLimiter(self.args.rate, self.args.burst),
+            )
+        )
+
+    def _client_refresh(self, api: Any) -> Refresh:
+        """Return a refresh of a VowisClient, passing the digests it returned."""
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+        digests: dict[tuple[str, str], bytes] = {}
+
+        async def fetch(station_id: str, measurement_type: str) -> None:
+            async with semaphore:
+                result = await api.get_measurement_data(
+                    station_id, measurement_type, digests.get((station_id, measurement_type))
+                )
+            if isinstance(result, dict) and result:
+                digests[(station_id, measurement_type)] = result["digest"]
+
+        async def refresh() -> None:
+            api._recent.clear()  # pylint: disable=protected-access
+            await asyncio.gather(
+                *(
+                    fetch(station_id, measurement_type)
+                    for station_id in self.stations
+                    for measurement_type in self.parameters
+                ),
+                return_exceptions=True,
+            )
+
+        return refresh
+
+    async def archive_coordinator(self) -> Refresh:
+        """Return a refresh of the archive coordinator."""
+        hass = await self._hass()
+        integration = _import_archive("__init__")
+        const = _import_archive("const")
+        vowis_api = _import_archive("vowis_api")
+
+        flags = {"w": "supports_depth", "q": "supports_flow", "wt": "supports_temperature"}
+        river_stations = [
+            {
+                "name": f"Station {station_id}",
+                "id": station_id,
+                "river": "Benchmark",
+                **{flag: measurement_type in self.parameters for measurement_type, flag in flags.items()},
+            }
+            for station_id in self.stations
+        ]
+        entry = _config_entry(
+            const.DOMAIN,
+            {"river_stations": river_stations, "enabled_stations": self.stations},
+            {const.CONF_MAX_CONCURRENT_REQUESTS: self.args.concurrency},
+        )
+
+        session = aiohttp.ClientSession()
+        self.cleanups.append(session.close)
+        api = vowis_api.VowisApi(session)
+        api._base_url = self.server.base_url  # pylint: disable=protected-access
+        tiers = integration.VowisTiers(hass, api, entry)
+
+        async def refresh() -> None:
+            # All tiers at once, as on the first refresh after setup
+            results = await asyncio.gather(
+                *(coordinator._async_update_data() for coordinator in tiers.coordinators)  # pylint: disable=protected-access
+            )
+            for coordinator, data in zip(tiers.coordinators, results):
+                coordinator.data = data
+
+        return refresh
+
+    async def coordinator(self) -> Refresh:
+        """Return a refresh of the new integration's coordinator."""
+        hass = await self._hass()
+        if str(ROOT) not in sys.path:
+            sys.path.insert(0, str(ROOT))
+        # pylint: disable=import-outside-toplevel
+        from custom_components.vlgb_wasser import VlbgWasserDataUpdateCoordinator
+        from custom_components.vlgb_wasser import api as api_module
+        from custom_components.vlgb_wasser.catalog import StationCatalog
+        from custom_components.vlgb_wasser.const import (
+            CONF_MAX_CONCURRENT_REQUESTS,
+            CONF_SUBSCRIPTIONS,
+            DEFAULT_SCAN_INTERVAL,
+            DOMAIN,
+        )
+        from custom_components.vlgb_wasser.core.scheduler import PollScheduler
+
+        api = api_module.VlbgWasserAPI(hass)
+        api._base_url = self.server.base_url  # pylint: disable=protected-access
+        api.limiter.configure(self.args.rate, self.args.burst)
+        catalog = StationCatalog(
+            {
+                "name": f"Station {station_id}",
+                "id": station_id,
+                "river": "Benchmark",
+                "parameters": list(self.parameters),
+            }
+            for station_id in self.stations
+        )
+        entry = _config_entry(
+            DOMAIN,
+            {},
+            {
+                CONF_SUBSCRIPTIONS: [
+                    [station_id, measurement_type]
+                    for station_id in self.stations
+                    for measurement_type in self.parameters
+                ],
+                CONF_MAX_CONCURRENT_REQUESTS: self.args.concurrency,
+            },
+        )
+        if self.args.batch != "none":
+            for measurement_type in self.parameters:
+                catalog.planner.record(measurement_type, self.args.batch)
+        coordinator = VlbgWasserDataUpdateCoordinator(hass, api, entry, catalog)
+
+        async def refresh() -> None:
+            api._recent.clear()  # pylint: disable=protected-access
+            coordinator.scheduler = PollScheduler(interval=DEFAULT_SCAN_INTERVAL)
+            coordinator.data = await coordinator._async_update_data()  # pylint: disable=protected-access
+
+        return refresh
+
+
+def _quantile(values: list[float], quantile: float) -> float:
+    """Return a quantile of measured values (nearest rank)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def _run_target(target: str, args: argparse.Namespace) -> dict[str, Any] | None:
+    """Benchmark one target, returning its report or None if it cannot run."""
+    server = StandInServer(
+        ServerConfig(
+            stations=args.stations,
+            latency=args.latency / 1000,
+            jitter=args.jitter / 1000,
+            error_rate=args.error_rate,
+            etag=not args.no_etag,
+            seed=args.seed,
+            batch="" if args.batch == "none" else args.batch,
+        )
+    )
+    await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        bench = Bench(server, args, config_dir)
+        try:
+            refresh = await getattr(bench, target)()
+        except (TargetUnavailable, ImportError) as error:
+            await bench.close()
+            await server.stop()
+            print(f"{target}: skipped ({error})", file=sys.stderr)
+            return None
+
+        try:
+            # Warm up connections and caches, then time
+            await refresh()
+            durations = []
+            requests_before = server.requests
+            started = time.perf_counter()
+            for _ in range(args.refreshes):
+                if not args.static:
+                    server.advance()
+                refresh_started = time.perf_counter()
+                await refresh()
+                durations.append(time.perf_counter() - refresh_started)
+            elapsed = time.perf_counter() - started
+            requests = server.requests - requests_before
+
+            peaks = []
+            blocks = []
+            if not args.no_memory:
+                tracemalloc.start()
+                for _ in range(args.memory_refreshes):
+                    if not args.static:
+                        server.advance()
+                    before, _ = tracemalloc.get_traced_memory()
+                    blocks_before = sys.getallocatedblocks()
+                    tracemalloc.reset_peak()
+                    await refresh()
+                    _, peak = tracemalloc.get_traced_memory()
+                    peaks.append(peak - before)
+                    blocks.append(sys.getallocatedblocks() - blocks_before)
+                tracemalloc.stop()
+        finally:
+            await bench.close()
+            await server.stop()
+
+    series = args.stations * len(args.parameters)
+    return {
+        "target": target,
+        "series": series,
+        "refreshes": args.refreshes,
+        "requests_per_s": requests / elapsed if elapsed else 0.0,
+        "series_per_s": series * args.refreshes / elapsed if elapsed else 0.0,
+        "p50_ms": _quantile(durations, 0.5) * 1000,
+        "p99_ms": _quantile(durations, 0.99) * 1000,
+        "mean_ms": statistics.fmean(durations) * 1000,
+        "peak_kib": max(peaks) / 1024 if peaks else None,
+        "blocks": statistics.fmean(blocks) if blocks else None,
+    }
+
+
+def _print_report(reports: list[dict[str, Any]]) -> None:
+    """Print the reports as a table."""
+    columns = (
+        ("target", 20, ""),
+        ("series", 7, "d"),
+        ("requests_per_s", 15, ".1f"),
+        ("series_per_s", 13, ".1f"),
+        ("p50_ms", 9, ".1f"),
+        ("p99_ms", 9, ".1f"),
+        ("peak_kib", 10, ".1f"),
+        ("blocks", 9, ".0f"),
+    )
+    print(" ".join(f"{name:>{width}}" for name, width, _ in columns))
+    for report in reports:
+        print(
+            " ".join(
+                f"{'-' if report[name] is None else format(report[name], spec):>{width}}"
+                for name, width, spec in columns
+            )
+        )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=(*TARGETS, "all"), default="all")
+    parser.add_argument("--stations", type=int, default=50)
+    parser.add_argument(
+        "--parameters",
+        type=lambda value: [item for item in value.split(",") if item],
+        default=["w", "q"],
+        help=f"comma separated measurement types out of {', '.join(PARAMETERS)}",
+    )
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--memory-refreshes", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=50.0, help="server latency in ms")
+    parser.add_argument("--jitter", type=float, default=20.0, help="random extra latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 answers")
+    parser.add_argument("--no-etag", action="store_true", help="do not send ETags")
+    parser.add_argument("--static", action="store_true", help="keep payloads unchanged")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="request budget per second (0: no limit)"
+    )
+    parser.add_argument("--burst", type=int, default=10, help="requests allowed in a burst")
+    parser.add_argument(
+        "--batch",
+        choices=("none", "multi", "all"),
+        default="none",
+        help="multi-station requests the server answers and the coordinator sends",
+    )
+    return parser.parse_args(argv)
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    """Run the selected targets and print their reports."""
+    targets = TARGETS if args.target == "all" else (args.target,)
+    reports = [report for target in targets if (report := await _run_target(target, args))]
+    if not reports:
+        return 1
+    _print_report(reports)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    return asyncio.run(_async_main(_parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Local stand-in for the VOWIS API.
+
+Serves ``messwerte/{type}?hzbnr=`` and ``see/`` with the payload shapes
+documented in doc/VowisAPI.md, for a configurable number of stations and
+with configurable latency and error rate. Payloads only change when the
+clock is advanced, and responses carry an ETag, so revalidation and
+unchanged-payload paths can be benchmarked as well. Optionally the server
+answers multi-station requests (a comma-separated ``hzbnr`` list, or every
+station without ``hzbnr``), which the real API may or may not do.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import json
+import random
+import zlib
+
+from aiohttp import web
+
+# Measurement types the stand-in publishes; "n" answers 400 like the real API
+PARAMETERS = {"w": ("W", "cm"), "wt": ("WT", "°C"), "q": ("Q", "m³/s")}
+UNSUPPORTED = ("n",)
+
+# Points per series: 24 hours of 5 minute values
+WINDOW = 288
+STEP = timedelta(minutes=5)
+
+FIRST_STATION_ID = 200000
+
+
+def station_ids(count: int) -> list[str]:
+    """Return the ids of the stations a server with ``count`` stations knows."""
+    return [str(FIRST_STATION_ID + index) for index in range(count)]
+
+
+@dataclass
+class ServerConfig:
+    """Behaviour of the stand-in server."""
+
+    stations: int = 50
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    etag: bool = True
+    seed: int = 0
+    # Multi-station requests answered: "" (none), "multi" or "all"
+    batch: str = ""
+
+
+class StandInServer:
+    """aiohttp application mimicking the VOWIS API."""
+
+    def __init__(self, config: ServerConfig) -> None:
+        """Initialize the server with a clock at a fixed start time."""
+        self.config = config
+        self.stations = set(station_ids(config.stations))
+        self.now = datetime(2025, 6, 26, 21, 25)
+        self.requests = 0
+        self._random = random.Random(config.seed)
+        self._bodies: dict[tuple[str, str], bytes] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    def advance(self, steps: int = 1) -> None:
+        """Move the clock forward so every series gets new points."""
+        self.now += STEP * steps
+        self._bodies.clear()
+
+    def _station_block(self, station_id: str, measurement_type: str) -> dict:
+        """Return the series of a station at the current time."""
+        parameter, unit = PARAMETERS[measurement_type]
+        base = (int(station_id) % 97) * 5.0 + 100.0
+        start = self.now - STEP * (WINDOW - 1)
+        measurements = {}
+        for index in range(WINDOW):
+            timestamp = start + STEP * index
+            # Deterministic per timestamp, so windows overlap consistently
+            slot = int(timestamp.timestamp()) // 300
+            measurements[timestamp.strftime("%Y-%m-%dT%H:%M:%S")] = round(
+                base + (slot * 7919 % 200) / 10.0, 1
+            )
+        return {"Parameter": parameter, "Einheit": unit, "Zeit": "MEZ", "Messwerte": measurements}
+
+    def _series_body(self, station_ids: tuple[str, ...], measurement_type: str) -> bytes:
+        """Return the body of the series of some stations at the current time."""
+        key = (",".join(station_ids), measurement_type)
+        if (body := self._bodies.get(key)) is None:
+            body = json.dumps(
+                {
+                    "Stationen": {
+                        station_id: self._station_block(station_id, measurement_type)
+                        for station_id in station_ids
+                    }
+                }
+            ).encode()
+            self._bodies[key] = body
+        return body
+
+    def _see_body(self) -> bytes:
+        """Return the body of the see/ endpoint at the current time."""
+        key = ("see", "")
+        if (body := self._bodies.get(key)) is None:
+            stamp = self.now.strftime("%Y-%m-%dT%H:%M:%SZ")
+            reading = lambda value: {"datum": stamp, "wert": value}  # noqa: E731
+            archive = [
+                {
+                    "datum": (self.now - timedelta(days=day)).strftime("%Y-%m-%dT00:00:00"),
+                    "w": 356 + day % 7,
+                    "wtHafen": 24.9,
+                    "wtMilli05": 24.9,
+                    "wtMilli25": 24.2,
+                    "Min": 335,
+                    "Mit": 431.4,
+                    "Max": 563,
+                }
+                for day in range(30)
+            ]
+            body = json.dumps(
+                [
+                    {
+                        "pegelnullpunkt": 392.14,
+                        "hW2": 460,
+                        "hW10": 512,
+                        "hW30": 540,
+                        "hW100": 568,
+                        "luftfeuchte": reading(76.6),
+                        "lufttemperatur": reading(21.5),
+                        "wasserstand": reading(356.8),
+                        "wTemperatur": reading(24.4),
+                        "wtMilli05": reading(24.7),
+                        "wtMilli25": reading(24.7),
+                        "windgeschwindigkeit": reading(4.8),
+                        "windrichtung": reading(161.5),
+                        "windboe": reading(8.8),
+                        "seeArchiv": archive,
+                        "Hzbnr": "200337",
+                        "Name": "Bregenz (Seepegel), 200337",
+                    }
+                ]
+            ).encode()
+            self._bodies[key] = body
+        return body
+
+    async def _respond(self, request: web.Request, body: bytes) -> web.Response:
+        """Answer with a body after the configured latency, or fail."""
+        self.requests += 1
+        config = self.config
+        delay = config.latency + self._random.uniform(0, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._random.random() < config.error_rate:
+            return web.Response(status=503, text="Service Unavailable")
+
+        headers = {"Content-Type": "application/json"}
+        if config.etag:
+            etag = f'"{zlib.crc32(body):08x}"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers=headers)
+        return web.Response(body=body, headers=headers)
+
+    async def _handle_messwerte(self, request: web.Request) -> web.Response:
+        """Handle messwerte/{type}?hzbnr=."""
+        measurement_type = request.match_info["type"]
+        hzbnr = request.query.get("hzbnr", "")
+        if measurement_type in UNSUPPORTED:
+            return web.Response(status=400, text="Bad Request")
+        if not hzbnr and self.config.batch == "all":
+            station_ids = tuple(sorted(self.stations))
+        elif "," in hzbnr and self.config.batch == "multi":
+            station_ids = tuple(
+                station_id for station_id in hzbnr.split(",") if station_id in self.stations
+            )
+        else:
+            station_ids = (hzbnr,)
+        if measurement_type not in PARAMETERS or not set(station_ids) <= self.stations:
+            return web.Response(status=404, text="Not Found")
+        return await self._respond(request, self._series_body(station_ids, measurement_type))
+
+    async def _handle_see(self, request: web.Request) -> web.Response:
+        """Handle see/."""
+        return await self._respond(request, self._see_body())
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the API base URL."""
+        app = web.Application()
+        app.router.add_get("/api/messwerte/{type}", self._handle_messwerte)
+        app.router.add_get("/api/see/", self._handle_see)
+        app.router.add_get("/api/see", self._handle_see)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+        self.base_url = f"http://{host}:{port}/api/"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -1,40 +1,140 @@
 """The vlbg_wasser integration."""
 from __future__ import annotations
 
+import asyncio
+from collections import Counter
+from collections.abc import Callable
 import logging
+import time
 from datetime import timedelta
+from typing import Any, Awaitable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, API_BASE_URL, API_TIMEOUT, DEFAULT_SCAN_INTERVAL
-from .api import VlbgWasserAPI
+from .const import (
+    CAPABILITY_PROBE_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_RATE_WINDOW,
+    CONF_REQUEST_BURST,
+    CONF_REQUEST_RATE,
+    CONF_STATS_WINDOW,
+    CONF_SUBSCRIPTIONS,
+    CONF_WELLS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_RATE_WINDOW,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATS_WINDOW,
+    DEFAULT_SUBSCRIPTIONS,
+    DOMAIN,
+    GROUNDWATER,
+    GROUNDWATER_BATCH_SIZE,
+    GROUNDWATER_HISTORY_POINTS,
+    GROUNDWATER_INTERVAL,
+    MAX_POLL_DELAY,
+    MEASUREMENT_TYPES,
+    MIN_POLL_DELAY,
+    POLL_GROUPING_WINDOW,
+    SIGNAL_REFRESHED,
+    SIGNAL_SUBSCRIPTIONS_ADDED,
+    SIGNAL_SUBSCRIPTIONS_REMOVED,
+    SIGNAL_UNLOADED,
+    STEADY_SLOPES,
+)
+from .api import (
+    VlbgWasserAPI,
+    VlbgWasserAPIUnsupported,
+    async_get_api,
+    async_update_request_budget,
+)
+from .cache import RESULT_FIELDS, VlbgWasserCache, decode_series
+from .catalog import StationCatalog, async_get_catalog, async_get_well_catalog
+from .core.analytics import SeriesAnalytics
+from .core.client import NOT_MODIFIED
+from .core.ingest import DEFAULT_HISTORY_POINTS, Point, SeriesIngestor
+from .core.metrics import Metrics, MetricsRegistry, merged
+from .core.planner import BATCH_SINGLE, Request
+from .core.ratelimit import series_priority
+from .core.scheduler import PollScheduler
+from .core.series import format_timestamp
+from .core.wells import WellCatalog
+from .statistics import StatisticsImporter
+from .websocket_api import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# A subscription is one (station_id, measurement_type) pair
+Subscription = tuple[str, str]
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up vlbg_wasser from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    
-    # Create API client
-    api = VlbgWasserAPI(hass)
-    
+
+    # API client shared with other entries and config flows, with one
+    # request budget for all of them
+    api = async_get_api(hass)
+    async_update_request_budget(hass)
+
+    # Station metadata and capabilities, shared by all entries
+    catalog = await async_get_catalog(hass)
+    wells = await async_get_well_catalog(hass)
+
     # Create coordinator
-    coordinator = VlbgWasserDataUpdateCoordinator(hass, api)
-    
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
-    
+    coordinator = VlbgWasserDataUpdateCoordinator(hass, api, entry, catalog, wells)
+
+    # Entities start with the values cached by the previous run and are
+    # refreshed in the background. Without a cache, fetch initial data so we
+    # have data when entities subscribe.
+    if await coordinator.async_restore():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
     hass.data[DOMAIN][entry.entry_id] = coordinator
-    
+
     # Forward the setup to the sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
+
+    # Series for chart cards, served from the coordinators' stores
+    async_setup_websocket(hass)
+
+    # Pick up changes made in the options flow: subscription changes live,
+    # the rest by reloading
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
+
+    # Probe unknown or outdated station capabilities and multi-station
+    # request modes without delaying setup, and the capabilities again
+    # periodically (a station without data at setup stays unknown)
+    @callback
+    def async_probe_capabilities(_now: Any = None) -> None:
+        entry.async_create_background_task(
+            hass,
+            catalog.async_probe(api, max_concurrent_requests=coordinator.max_concurrent_requests),
+            f"{DOMAIN} capability probe",
+        )
+
+    async_probe_capabilities()
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, async_probe_capabilities, timedelta(seconds=CAPABILITY_PROBE_INTERVAL)
+        )
+    )
+    entry.async_create_background_task(
+        hass, catalog.async_probe_batching(api), f"{DOMAIN} batch request probe"
+    )
+
     return True
 
 
@@ -42,28 +142,525 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
-        
+        async_dispatcher_send(hass, SIGNAL_UNLOADED.format(entry.entry_id))
+
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a deleted config entry."""
+    await VlbgWasserCache(hass, entry.entry_id).async_remove()
+
+
+async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed subscriptions live, reload for other option changes."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and coordinator.reload_options == _reload_options(entry):
+        await coordinator.async_update_subscriptions(get_subscriptions(entry))
+        return
+    await async_reload_entry(hass, entry)
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _reload_options(entry: ConfigEntry) -> tuple:
+    """Return the options that only take effect by reloading the entry."""
+    options = entry.options
+    return (
+        int(options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)),
+        float(options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE)),
+        int(options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST)),
+        int(options.get(CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW)),
+        int(options.get(CONF_STATS_WINDOW, DEFAULT_STATS_WINDOW)),
+    )
+
+
+def get_subscriptions(entry: ConfigEntry) -> set[Subscription]:
+    """Return the station/measurement subscriptions of a config entry.
+
+    Options take precedence over the data stored when the entry was created.
+    Every subscribed groundwater well is a subscription of its level.
+    """
+    subscriptions = entry.options.get(
+        CONF_SUBSCRIPTIONS, entry.data.get(CONF_SUBSCRIPTIONS, DEFAULT_SUBSCRIPTIONS)
+    )
+    wells = entry.options.get(CONF_WELLS, entry.data.get(CONF_WELLS, []))
+    return {
+        (str(station_id), measurement_type) for station_id, measurement_type in subscriptions
+    } | {(str(well_id), GROUNDWATER) for well_id in wells}
+
+
+def _history_points(subscription: Subscription) -> int:
+    """Return the number of points kept of a series."""
+    if subscription[1] == GROUNDWATER:
+        return GROUNDWATER_HISTORY_POINTS
+    return DEFAULT_HISTORY_POINTS
+
+
 class VlbgWasserDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+    """Class to manage fetching data from the API.
+
+    One coordinator serves every subscribed station/measurement pair of a
+    config entry. Each refresh fetches all subscriptions as one concurrent
+    batch and stores the results keyed by (station_id, measurement_type).
+
+    Fetched windows are merged incrementally: only points newer than the
+    last known one are processed, and a series without new points keeps its
+    previous result object. The new points of the last refresh are available
+    in ``deltas``.
+
+    Instead of a fixed timer, each refresh only polls the series that are
+    due according to the publication-aware scheduler and then re-arms the
+    timer for the earliest planned poll. Subscriptions the station catalog
+    knows to be unsupported are not requested at all. The due series are
+    grouped per measurement type into multi-station requests where the
+    catalog's planner found the API to accept them.
 
-    def __init__(self, hass: HomeAssistant, api: VlbgWasserAPI) -> None:
+    Groundwater wells form a low-frequency tier: they are scheduled for
+    hourly values, polled at most GROUNDWATER_BATCH_SIZE per refresh and
+    keep a shorter history, so many subscribed wells spread over several
+    short refreshes instead of lengthening one.
+
+    When the shared request budget is exhausted, series shown by an enabled
+    entity are requested before wells and series whose entities are all
+    disabled.
+
+    Subscriptions changed in the options are applied to the running
+    coordinator: added series are fetched once right away, removed ones are
+    forgotten together with their entities.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: VlbgWasserAPI,
+        entry: ConfigEntry,
+        catalog: StationCatalog,
+        wells: WellCatalog | None = None,
+    ) -> None:
         """Initialize."""
         self.api = api
+        self.entry = entry
+        self.reload_options = _reload_options(entry)
+        self.catalog = catalog
+        self.wells = wells if wells is not None else WellCatalog()
+        self.subscriptions = get_subscriptions(entry)
+        self.ingestor = SeriesIngestor(capacity_of=_history_points)
+        self.scheduler = PollScheduler(interval=DEFAULT_SCAN_INTERVAL)
+        for subscription in self.subscriptions:
+            if subscription[1] == GROUNDWATER:
+                self.scheduler.set_interval(subscription, GROUNDWATER_INTERVAL)
+        self.cache = VlbgWasserCache(hass, entry.entry_id)
+        self.statistics = StatisticsImporter(hass)
+
+        # Digest of the payload last processed per series
+        self._digests: dict[Subscription, bytes] = {}
+
+        # New points per series from the most recent refresh
+        self.deltas: dict[Subscription, list[Point]] = {}
+
+        # Enabled entities per series, counted as they are added to hass
+        self._watched: Counter[Subscription] = Counter()
+
+        # Rolling derived values per series, updated with the new points
+        self.analytics: dict[Subscription, SeriesAnalytics] = {}
+        self._rate_span = int(entry.options.get(CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW)) * 60
+        self._stats_span = int(entry.options.get(CONF_STATS_WINDOW, DEFAULT_STATS_WINDOW)) * 3600
+
+        # Bound the fan-out so a large subscription set cannot flood the API
+        self.max_concurrent_requests = max(
+            1,
+            int(entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        # Statistics of the most recent refresh
+        self.last_refresh_duration: float | None = None
+        self.last_refresh_requests = 0
+        self.last_refresh_failures = 0
+
+        # State writes of the entities after the most recent refresh
+        self.write_stats = {"written": 0, "skipped": 0}
+
+        # Ingest time and entity writes per station; request metrics are
+        # kept by the shared API client
+        self.metrics = MetricsRegistry()
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Unchanged data (same result objects) does not notify entities
+            always_update=False,
+        )
+
+    @property
+    def active_subscriptions(self) -> set[Subscription]:
+        """Return the subscriptions that are not known to be unsupported."""
+        return {
+            subscription
+            for subscription in self.subscriptions
+            if self.catalog.supports(*subscription) is not False
+        }
+
+    @callback
+    def async_watch(self, subscription: Subscription) -> Callable[[], None]:
+        """Count an enabled entity showing a series; return its removal."""
+        self._watched[subscription] += 1
+
+        @callback
+        def unwatch() -> None:
+            self._watched[subscription] -= 1
+            if self._watched[subscription] <= 0:
+                del self._watched[subscription]
+
+        return unwatch
+
+    def priority(self, subscription: Subscription) -> int:
+        """Return the request priority of a series.
+
+        Until entities are added, every series counts as watched. Watched
+        rising water levels and flows go first.
+        """
+        result = (self.data or {}).get(subscription) or {}
+        return series_priority(
+            subscription[1],
+            not self._watched or subscription in self._watched,
+            (result.get("analytics") or {}).get("direction"),
+        )
+
+    async def async_update_subscriptions(self, subscriptions: set[Subscription]) -> None:
+        """Apply a changed subscription set without a full refresh.
+
+        Removed series lose their points, schedule, analytics, result and
+        entities. Added series are fetched right away in as few requests as
+        the planner allows and then get their entities. Other series are
+        neither refetched nor rescheduled.
+        """
+        added = subscriptions - self.subscriptions
+        removed = self.subscriptions - subscriptions
+        if not added and not removed:
+            return
+        self.subscriptions = set(subscriptions)
+
+        if removed:
+            for subscription in removed:
+                self.ingestor.discard(subscription)
+                self.scheduler.discard(subscription)
+                self.analytics.pop(subscription, None)
+                self._digests.pop(subscription, None)
+                self.deltas.pop(subscription, None)
+            self._async_remove_entities(removed)
+            if self.data and not removed.isdisjoint(self.data):
+                self.data = {
+                    subscription: result
+                    for subscription, result in self.data.items()
+                    if subscription not in removed
+                }
+                self.async_update_listeners()
+
+        if added:
+            for subscription in added:
+                if subscription[1] == GROUNDWATER:
+                    self.scheduler.set_interval(subscription, GROUNDWATER_INTERVAL)
+            fetched = sorted(
+                subscription
+                for subscription in added
+                if self.catalog.supports(*subscription) is not False
+            )
+            results = await self._async_fetch(fetched)
+            data = dict(self.data or {})
+            deltas, _ = self._process_results(fetched, results, data, time.time())
+            self._async_store_deltas(deltas)
+            # Set the data without rescheduling the next refresh
+            self.data = data
+            self.async_update_listeners()
+            async_dispatcher_send(
+                self.hass, SIGNAL_SUBSCRIPTIONS_ADDED.format(self.entry.entry_id), sorted(added)
+            )
+
+        self.cache.async_schedule_save(self._cache_data)
+        _LOGGER.debug(
+            "Subscriptions changed: %d added, %d removed", len(added), len(removed)
+        )
+
+    @callback
+    def _async_remove_entities(self, subscriptions: set[Subscription]) -> None:
+        """Remove the entities of series, and devices left without any."""
+        # The sensor platform knows the entities of a series
+        async_dispatcher_send(
+            self.hass, SIGNAL_SUBSCRIPTIONS_REMOVED.format(self.entry.entry_id), subscriptions
+        )
+
+        device_registry = dr.async_get(self.hass)
+        remaining = {station_id for station_id, _ in self.subscriptions}
+        for station_id in {station_id for station_id, _ in subscriptions} - remaining:
+            if device := device_registry.async_get_device(identifiers={(DOMAIN, station_id)}):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.entry.entry_id
+                )
+
+    def station_info(self, station_id: str) -> dict[str, Any] | None:
+        """Return the catalog entry of a river station or groundwater well."""
+        return self.catalog.get(station_id) or self.wells.station(station_id)
+
+    def performance_metrics(self) -> Metrics:
+        """Return the API and coordinator metrics of this entry's stations."""
+        station_ids = {station_id for station_id, _ in self.subscriptions}
+        return merged(
+            registry.stations[station_id]
+            for registry in (self.api.metrics, self.metrics)
+            for station_id in station_ids
+            if station_id in registry.stations
         )
 
-    async def _async_update_data(self):
+    def _update_analytics(self, subscription: Subscription, new_points: list[Point]) -> dict[str, Any]:
+        """Add new points to a series' analytics and return its derived values.
+
+        A series without analytics yet is backfilled from its stored points
+        in one pass.
+        """
+        analytics = self.analytics.get(subscription)
+        if analytics is None:
+            analytics = self.analytics[subscription] = SeriesAnalytics(
+                self._rate_span, self._stats_span, STEADY_SLOPES.get(subscription[1])
+            )
+            if (series := self.ingestor.series(subscription)) is not None:
+                analytics.backfill(*series.range())
+        else:
+            analytics.extend(new_points)
+        return analytics.snapshot()
+
+    async def async_restore(self) -> bool:
+        """Restore series and results from the on-disk cache.
+
+        Returns True if cached data for at least one subscription was found.
+        """
+        data: dict[Subscription, dict[str, Any]] = {}
+
+        for stored in await self.cache.async_load():
+            subscription = tuple(stored["key"])
+            if subscription not in self.subscriptions:
+                continue
+            if not (points := decode_series(stored["series"])):
+                continue
+
+            self.ingestor.restore(subscription, points)
+            latest_time, latest_value = points[-1]
+            data[subscription] = {
+                **stored["result"],
+                "latest_time": format_timestamp(latest_time),
+                "latest_value": latest_value,
+                "analytics": self._update_analytics(subscription, points),
+            }
+
+        if not data:
+            return False
+
+        _LOGGER.debug("Restored %d of %d subscriptions from cache", len(data), len(self.subscriptions))
+        self.async_set_updated_data(data)
+        return True
+
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the current series and results in their stored form."""
+        return {
+            "series": [
+                VlbgWasserCache.encode_entry(subscription, result, series.points())
+                for subscription, result in (self.data or {}).items()
+                if (series := self.ingestor.series(subscription)) is not None
+            ]
+        }
+
+    async def _async_import_statistics(self, subscriptions: list[Subscription]) -> None:
+        """Backfill long-term statistics of series that received new points."""
+        for station_id, measurement_type in subscriptions:
+            series = self.ingestor.series((station_id, measurement_type))
+            result = (self.data or {}).get((station_id, measurement_type))
+            if series is None or result is None:
+                continue
+
+            name = None
+            if station := self.station_info(station_id):
+                measurement_name = MEASUREMENT_TYPES.get(measurement_type, measurement_type)
+                name = f"{station['river']} {station['name']} {measurement_name.title()}"
+
+            try:
+                await self.statistics.async_import(
+                    station_id, measurement_type, series, result, name
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error importing statistics of %s/%s", station_id, measurement_type)
+
+    async def _limited(self, coro: Awaitable[Any]) -> Any:
+        """Await a request while holding a concurrency slot."""
+        async with self._semaphore:
+            return await coro
+
+    async def _async_fetch(self, subscriptions: list[Subscription]) -> list[Any]:
+        """Fetch the due series with as few requests as the planner allows.
+
+        Returns one result or exception per subscription. The stations of a
+        refused multi-station request are requested one by one in the same
+        refresh, and the type is no longer batched.
+        """
+        results, self.last_refresh_requests, refused = await self.catalog.planner.fetch(
+            subscriptions,
+            lambda request: self._limited(self._request(request)),
+            VlbgWasserAPIUnsupported,
+        )
+        for measurement_type in refused:
+            if self.catalog.planner.mode(measurement_type) != BATCH_SINGLE:
+                _LOGGER.info(
+                    "Multi-station requests of %s were refused, no longer sending them",
+                    measurement_type,
+                )
+                self.catalog.record_batch_mode(measurement_type, BATCH_SINGLE)
+        return results
+
+    async def _request(self, request: Request) -> Any:
+        """Send one planned request, with the priority of its most important series."""
+        mode, measurement_type, station_ids = request
+        priority = min(
+            self.priority((station_id, measurement_type)) for station_id in station_ids
+        )
+        if mode == BATCH_SINGLE:
+            subscription = (station_ids[0], measurement_type)
+            return await self.api.get_measurement_data(
+                *subscription, self._digests.get(subscription), priority
+            )
+        return await self.api.get_measurement_batch(
+            station_ids, measurement_type, mode, priority
+        )
+
+    async def _async_update_data(self) -> dict[Subscription, dict[str, Any]]:
         """Update data via library."""
-        try:
-            # For now, hardcode the station ID and measurement type
-            # This will be configurable in future versions
-            return await self.api.get_measurement_data("200014", "w")
-        except Exception as exception:
-            raise UpdateFailed() from exception
\ No newline at end of file
+        started = time.monotonic()
+        now = time.time()
+        self.write_stats = {"written": 0, "skipped": 0}
+        active = self.active_subscriptions
+        wells = {subscription for subscription in active if subscription[1] == GROUNDWATER}
+        subscriptions = sorted(
+            self.scheduler.due(active - wells, now, POLL_GROUPING_WINDOW)
+            + self.scheduler.due(wells, now, POLL_GROUPING_WINDOW, GROUNDWATER_BATCH_SIZE)
+        )
+
+        results = await self._async_fetch(subscriptions)
+
+        # Series that were not due keep their previous result; series found
+        # to be unsupported (e.g. by a probe) lose theirs
+        data: dict[Subscription, dict[str, Any]] = {
+            subscription: result
+            for subscription, result in (self.data or {}).items()
+            if self.catalog.supports(*subscription) is not False
+        }
+        deltas, failures = self._process_results(subscriptions, results, data, now)
+
+        self.deltas = deltas
+        self._async_store_deltas(deltas)
+
+        # Re-arm the timer for the next series that is due
+        next_poll = self.scheduler.next_poll(self.active_subscriptions)
+        if next_poll is not None:
+            delay = min(max(next_poll - time.time(), MIN_POLL_DELAY), MAX_POLL_DELAY)
+            self.update_interval = timedelta(seconds=delay)
+
+        self.last_refresh_duration = time.monotonic() - started
+        self.last_refresh_failures = failures
+
+        _LOGGER.debug(
+            "Refreshed %d of %d subscriptions with %d requests in %.2fs (%d failed, "
+            "%d with new points), next in %s, breakers %s",
+            len(subscriptions), len(self.subscriptions), self.last_refresh_requests,
+            self.last_refresh_duration, failures, len(deltas), self.update_interval, self.api.breaker_states()
+        )
+
+        # Refreshes without new points leave the data unchanged and do not
+        # notify the entities, but the refresh statistics did change
+        async_dispatcher_send(self.hass, SIGNAL_REFRESHED.format(self.entry.entry_id))
+
+        # Only fail the refresh when nothing at all came back
+        if subscriptions and failures == len(subscriptions):
+            raise UpdateFailed(f"All {failures} requests failed") from results[0]
+
+        return data
+
+    def _process_results(
+        self,
+        subscriptions: list[Subscription],
+        results: list[Any],
+        data: dict[Subscription, dict[str, Any]],
+        now: float,
+    ) -> tuple[dict[Subscription, list[Point]], int]:
+        """Merge fetched results into data; return the new points and the failures.
+
+        Results of series unsubscribed while they were fetched are dropped.
+        """
+        deltas: dict[Subscription, list[Point]] = {}
+        failures = 0
+
+        for subscription, result in zip(subscriptions, results):
+            if subscription not in self.subscriptions:
+                continue
+            if isinstance(result, VlbgWasserAPIUnsupported):
+                _LOGGER.info("Station %s does not provide %s, no longer requesting it", *subscription)
+                self.catalog.record(*subscription, False)
+                data.pop(subscription, None)
+            elif isinstance(result, Exception):
+                _LOGGER.debug("Error fetching %s/%s: %s", *subscription, result)
+                failures += 1
+                data.pop(subscription, None)
+                # Make sure the next successful request returns full data
+                self._digests.pop(subscription, None)
+            elif result and result is not NOT_MODIFIED:
+                processing = time.perf_counter()
+                # Data proves the capability, so the background probe can
+                # skip this series
+                if not self.catalog.supports(*subscription) or self.catalog.stale(
+                    (subscription[0],), (subscription[1],)
+                ):
+                    self.catalog.record(*subscription, True)
+                # Results of multi-station requests carry no digest
+                if (digest := result.get("digest")) is not None:
+                    self._digests[subscription] = digest
+                else:
+                    self._digests.pop(subscription, None)
+                new_points = self.ingestor.ingest(
+                    subscription, result["measurements"], result.get("timezone")
+                )
+                latest = self.ingestor.latest(subscription)
+                if latest is not None and (new_points or subscription not in data):
+                    deltas[subscription] = new_points
+                    latest_time, latest_value = latest
+                    data[subscription] = {
+                        **{field: result.get(field) for field in RESULT_FIELDS},
+                        "latest_time": format_timestamp(latest_time),
+                        "latest_value": latest_value,
+                        "analytics": self._update_analytics(subscription, new_points),
+                    }
+                self.metrics.station(subscription[0]).process_time += (
+                    time.perf_counter() - processing
+                )
+
+            series = self.ingestor.series(subscription)
+            self.scheduler.record(
+                subscription,
+                now,
+                series.latest_time if series is not None else None,
+                bool(deltas.get(subscription)),
+            )
+
+        return deltas, failures
+
+    @callback
+    def _async_store_deltas(self, deltas: dict[Subscription, list[Point]]) -> None:
+        """Save the cache and import statistics after series got new points."""
+        if not deltas:
+            return
+        self.cache.async_schedule_save(self._cache_data)
+        self.hass.async_create_background_task(
+            self._async_import_statistics(list(deltas)), f"{DOMAIN} statistics import"
+        )
@@ -1,82 +1,149 @@
 """API client for vlbg_wasser integration."""
 from __future__ import annotations
 
-import logging
-from typing import Any
+import asyncio
+from collections.abc import Awaitable, Coroutine
+from typing import Any, TypeVar
 
-import aiohttp
-import async_timeout
-
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import API_BASE_URL, API_TIMEOUT
-
-_LOGGER = logging.getLogger(__name__)
+from .const import (
+    API_RETRIES,
+    API_TIMEOUT,
+    CONF_REQUEST_BURST,
+    CONF_REQUEST_RATE,
+    DATA_API,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    DOMAIN,
+)
+from .core.client import NotModified, VowisClient
+from .core.errors import VowisCircuitOpen, VowisConnectionError, VowisError, VowisUnsupported
+from .core.planner import BATCH_MULTI
+from .core.ratelimit import PRIORITY_VISIBLE, RateLimiter
 
 
-class VlbgWasserAPIError(HomeAssistantError):
+class VlbgWasserAPIError(HomeAssistantError, VowisError):
     """Exception to indicate a general API error."""
 
 
-class VlbgWasserAPIConnectionError(VlbgWasserAPIError):
+class VlbgWasserAPIConnectionError(VlbgWasserAPIError, VowisConnectionError):
     """Exception to indicate a connection error."""
 
 
-class VlbgWasserAPI:
-    """API client for Vorarlberg Wasser data."""
+class VlbgWasserAPIUnsupported(VlbgWasserAPIError, VowisUnsupported):
+    """Exception to indicate a station does not provide a measurement type."""
+
+
+class VlbgWasserAPICircuitOpen(VlbgWasserAPIConnectionError, VowisCircuitOpen):
+    """Exception to indicate requests to an endpoint are paused after failures."""
+
+
+# Core errors and the integration errors they are raised as, most specific first
+_ERRORS: tuple[tuple[type[VowisError], type[VlbgWasserAPIError]], ...] = (
+    (VowisCircuitOpen, VlbgWasserAPICircuitOpen),
+    (VowisUnsupported, VlbgWasserAPIUnsupported),
+    (VowisConnectionError, VlbgWasserAPIConnectionError),
+    (VowisError, VlbgWasserAPIError),
+)
+
+_T = TypeVar("_T")
+
+
+@callback
+def async_get_api(hass: HomeAssistant) -> VlbgWasserAPI:
+    """Return the API client shared by all callers in this Home Assistant."""
+    if (api := hass.data.get(DATA_API)) is None:
+        api = hass.data[DATA_API] = VlbgWasserAPI(hass)
+    return api
+
+
+@callback
+def async_update_request_budget(hass: HomeAssistant) -> None:
+    """Apply the request budget of the config entries to the shared client.
+
+    The budget is one for the whole Home Assistant instance, so the lowest
+    rate and burst any entry configures apply.
+    """
+    entries = hass.config_entries.async_entries(DOMAIN)
+    rate = min(
+        (float(entry.options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE)) for entry in entries),
+        default=DEFAULT_REQUEST_RATE,
+    )
+    burst = min(
+        (int(entry.options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST)) for entry in entries),
+        default=DEFAULT_REQUEST_BURST,
+    )
+    async_get_api(hass).limiter.configure(rate, burst)
 
-    def __init__(self, hass: HomeAssistant) -> None:
+
+class VlbgWasserAPI(VowisClient):
+    """API client for Vorarlberg Wasser data.
+
+    The core VowisClient bound to Home Assistant's shared aiohttp session.
+    One client is shared by every config entry and config flow (see
+    async_get_api), and so is its request budget. Errors are raised as
+    HomeAssistantError subclasses.
+    """
+
+    limiter: RateLimiter
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        timeout: float = API_TIMEOUT,
+        retries: int = API_RETRIES,
+    ) -> None:
         """Initialize the API client."""
+        super().__init__(
+            async_get_clientsession(hass),
+            timeout=timeout,
+            retries=retries,
+            limiter=RateLimiter(DEFAULT_REQUEST_RATE, DEFAULT_REQUEST_BURST),
+        )
         self._hass = hass
-        self._session = hass.helpers.aiohttp_client.async_get_clientsession()
 
-    async def get_measurement_data(self, station_id: str, measurement_type: str) -> dict[str, Any]:
-        """Get measurement data for a specific station and type."""
-        url = f"{API_BASE_URL}messwerte/{measurement_type}"
-        params = {"hzbnr": station_id}
-        
-        try:
-            async with async_timeout.timeout(API_TIMEOUT):
-                async with self._session.get(url, params=params) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    _LOGGER.debug("API response for station %s, type %s: %s", station_id, measurement_type, data)
-                    
-                    return self._process_data(data, station_id)
-                    
-        except aiohttp.ClientError as error:
-            _LOGGER.error("Connection error fetching data from %s: %s", url, error)
-            raise VlbgWasserAPIConnectionError(f"Connection error: {error}") from error
-        except Exception as error:
-            _LOGGER.error("Unexpected error fetching data from %s: %s", url, error)
-            raise VlbgWasserAPIError(f"Unexpected error: {error}") from error
-
-    def _process_data(self, data: dict[str, Any], station_id: str) -> dict[str, Any]:
-        """Process the API response data."""
+    def _create_task(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task[Any]:
+        """Start a shared request as a Home Assistant task."""
+        return self._hass.async_create_task(coro)
+
+    @staticmethod
+    async def _translated(request: Awaitable[_T]) -> _T:
+        """Await a core request, raising its errors as integration errors."""
         try:
-            station_data = data["Stationen"][station_id]
-            measurements = station_data["Messwerte"]
-            
-            if not measurements:
-                _LOGGER.warning("No measurements found for station %s", station_id)
-                return {}
-            
-            # Get the latest measurement (last item in the dict)
-            latest_time = max(measurements.keys())
-            latest_value = measurements[latest_time]
-            
-            return {
-                "station_id": station_id,
-                "parameter": station_data.get("Parameter"),
-                "unit": station_data.get("Einheit"),
-                "timezone": station_data.get("Zeit"),
-                "latest_time": latest_time,
-                "latest_value": latest_value,
-                "all_measurements": measurements,
-            }
-            
-        except KeyError as error:
-            _LOGGER.error("Unexpected API response structure: %s", error)
-            raise VlbgWasserAPIError(f"Unexpected API response structure: {error}") from error
\ No newline at end of file
+            return await request
+        except VowisError as error:
+            for core_error, error_type in _ERRORS:
+                if isinstance(error, core_error):
+                    raise error_type(str(error)) from error
+            raise
+
+    async def check_connection(self) -> None:
+        """Check that the API answers, without downloading a payload."""
+        await self._translated(super().check_connection())
+
+    async def get_measurement_data(
+        self,
+        station_id: str,
+        measurement_type: str,
+        known_digest: bytes | None = None,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> dict[str, Any] | NotModified:
+        """Get measurement data for a specific station and type."""
+        return await self._translated(
+            super().get_measurement_data(station_id, measurement_type, known_digest, priority)
+        )
+
+    async def get_measurement_batch(
+        self,
+        station_ids: list[str],
+        measurement_type: str,
+        mode: str = BATCH_MULTI,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> dict[str, dict[str, Any]]:
+        """Get the series of several stations with one request."""
+        return await self._translated(
+            super().get_measurement_batch(station_ids, measurement_type, mode, priority)
+        )
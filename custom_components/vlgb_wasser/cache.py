@@ -0,0 +1,93 @@
+"""On-disk cache of the coordinator's series and results.
+
+The cache lets an entry come up with the values of the previous run instead
+of waiting for a full refresh of every subscription during startup. Series
+are stored compactly: the first timestamp, the differences to the following
+timestamps (mostly 300, stored once if they are all the same) and the
+values.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import CACHE_SAVE_DELAY, DOMAIN
+from .core.ingest import Point
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Result fields that are stored; latest_time/latest_value follow from the series
+RESULT_FIELDS = ("station_id", "parameter", "unit", "timezone")
+
+
+def encode_series(points: list[Point]) -> dict[str, Any]:
+    """Encode points as first timestamp, timestamp deltas and values."""
+    if not points:
+        return {"t0": None, "dt": [], "v": []}
+    times = [timestamp for timestamp, _ in points]
+    deltas = [later - earlier for earlier, later in zip(times, times[1:])]
+    return {
+        "t0": times[0],
+        "dt": deltas[0] if deltas and deltas.count(deltas[0]) == len(deltas) else deltas,
+        "v": [value for _, value in points],
+    }
+
+
+def decode_series(encoded: dict[str, Any]) -> list[Point]:
+    """Decode points stored by encode_series."""
+    if (timestamp := encoded.get("t0")) is None:
+        return []
+    values = encoded["v"]
+    deltas = encoded["dt"]
+    if isinstance(deltas, int):
+        return [(timestamp + index * deltas, value) for index, value in enumerate(values)]
+    times = [timestamp]
+    for delta in deltas:
+        timestamp += delta
+        times.append(timestamp)
+    return list(zip(times, values))
+
+
+class VlbgWasserCache:
+    """Persist the latest series and results of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.cache"
+        )
+
+    async def async_load(self) -> list[dict[str, Any]]:
+        """Return the cached series entries, empty if there is no cache."""
+        try:
+            stored = await self._store.async_load()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Could not read cached data, starting without it")
+            return []
+        return (stored or {}).get("series", [])
+
+    def async_schedule_save(self, data_func) -> None:
+        """Save the data returned by ``data_func`` after a delay.
+
+        Saves requested during the delay are merged into one write; pending
+        data is written when Home Assistant stops.
+        """
+        self._store.async_delay_save(data_func, CACHE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the cache file."""
+        await self._store.async_remove()
+
+    @staticmethod
+    def encode_entry(key: tuple[str, str], result: dict[str, Any], points: list[Point]) -> dict[str, Any]:
+        """Return the stored form of one series and its result."""
+        return {
+            "key": list(key),
+            "result": {field: result.get(field) for field in RESULT_FIELDS},
+            "series": encode_series(points),
+        }
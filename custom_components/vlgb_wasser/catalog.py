@@ -0,0 +1,302 @@
+"""Station catalog of the vlbg_wasser integration.
+
+The catalog indexes the known stations by id and by river and records which
+measurement types each station actually publishes. Capabilities are probed
+against the API once, persisted, and re-probed only when they are older than
+CAPABILITY_MAX_AGE, so requests that are known to be answered with a 400 or
+404 are not sent again. A probe that gets an empty window leaves the
+capability unknown but is recorded too, and probed again after
+CAPABILITY_EMPTY_RETRY, a delay that doubles with every further empty window,
+so parameters a station lists but never fills are not probed on every
+periodic probe. The catalog also keeps the request planner with the probed
+multi-station request modes of each measurement type.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Iterator
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import VlbgWasserAPI, VlbgWasserAPIError
+from .const import (
+    CAPABILITY_EMPTY_RETRY,
+    CAPABILITY_MAX_AGE,
+    CATALOG_SAVE_DELAY,
+    DATA_CATALOG,
+    DATA_WELLS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+    PROBE_PARAMETERS,
+    RIVER_STATIONS,
+)
+from .core.planner import RequestPlanner
+from .core.wells import WellCatalog
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class StationCatalog:
+    """Indexed station metadata with probed measurement capabilities."""
+
+    def __init__(self, stations: Iterable[dict[str, Any]]) -> None:
+        """Initialize the catalog from station definitions."""
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._by_river: dict[str, list[dict[str, Any]]] = {}
+        # station_id -> measurement_type -> (supported, probed at, empty
+        # windows in a row); supported is None after empty windows
+        self._capabilities: dict[str, dict[str, tuple[bool | None, float, int]]] = {}
+        self._store: Store[dict[str, Any]] | None = None
+        self.planner = RequestPlanner()
+
+        for station in stations:
+            self.add(station)
+
+    def add(self, station: dict[str, Any]) -> None:
+        """Add a station or replace the metadata of a known one."""
+        if (previous := self._by_id.get(station["id"])) is not None:
+            self._by_river[previous["river"]].remove(previous)
+        self._by_id[station["id"]] = station
+        self._by_river.setdefault(station["river"], []).append(station)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Iterate over all stations."""
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        """Return the number of stations."""
+        return len(self._by_id)
+
+    def get(self, station_id: str) -> dict[str, Any] | None:
+        """Return a station by its id."""
+        return self._by_id.get(station_id)
+
+    def on_river(self, river: str) -> list[dict[str, Any]]:
+        """Return the stations on a river."""
+        return list(self._by_river.get(river, ()))
+
+    @property
+    def rivers(self) -> list[str]:
+        """Return the names of all rivers with stations."""
+        return sorted(self._by_river)
+
+    def supports(self, station_id: str, measurement_type: str) -> bool | None:
+        """Return whether a station publishes a measurement type.
+
+        Returns None if that is not known yet, also if probes only got
+        empty windows so far.
+        """
+        if (probed := self._capabilities.get(station_id, {}).get(measurement_type)) is None:
+            return None
+        return probed[0]
+
+    def parameters(self, station_id: str) -> list[str]:
+        """Return the measurement types a station publishes.
+
+        Probed capabilities win over the parameters the station definition
+        declares; declared parameters that were never probed are included.
+        """
+        station = self._by_id.get(station_id)
+        if station is None:
+            return []
+        probed = self._capabilities.get(station_id, {})
+        declared = [
+            measurement_type
+            for measurement_type in station.get("parameters", ())
+            if probed.get(measurement_type, (True,))[0] is not False
+        ]
+        discovered = [
+            measurement_type
+            for measurement_type, (supported, *_) in probed.items()
+            if supported and measurement_type not in declared
+        ]
+        return declared + sorted(discovered)
+
+    def record(
+        self,
+        station_id: str,
+        measurement_type: str,
+        supported: bool | None,
+        now: float | None = None,
+    ) -> None:
+        """Record whether a station publishes a measurement type.
+
+        ``supported`` is None for a probe that got an empty window.
+        """
+        capabilities = self._capabilities.setdefault(station_id, {})
+        empty = 0
+        if supported is None:
+            previous = capabilities.get(measurement_type)
+            empty = previous[2] + 1 if previous is not None and previous[0] is None else 1
+        capabilities[measurement_type] = (
+            supported,
+            time.time() if now is None else now,
+            empty,
+        )
+        self._schedule_save()
+
+    def record_batch_mode(self, measurement_type: str, mode: str) -> None:
+        """Record how several stations of a measurement type can be requested."""
+        self.planner.record(measurement_type, mode)
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        """Save the catalog after a delay, if it is persisted."""
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, CATALOG_SAVE_DELAY)
+
+    def stale(self, station_ids: Iterable[str], measurement_types: Iterable[str]) -> list[tuple[str, str]]:
+        """Return the station/type pairs that were never or too long ago probed."""
+        now = time.time()
+        measurement_types = tuple(measurement_types)
+        return [
+            (station_id, measurement_type)
+            for station_id in station_ids
+            for measurement_type in measurement_types
+            if self._expired(self._capabilities.get(station_id, {}).get(measurement_type), now)
+        ]
+
+    @staticmethod
+    def _expired(probed: tuple[bool | None, float, int] | None, now: float) -> bool:
+        """Return whether a probed capability should be probed again."""
+        if probed is None:
+            return True
+        supported, probed_at, empty = probed
+        if supported is None:
+            max_age = min(CAPABILITY_EMPTY_RETRY * 2 ** (empty - 1), CAPABILITY_MAX_AGE)
+        else:
+            max_age = CAPABILITY_MAX_AGE
+        return probed_at < now - max_age
+
+    async def async_probe(
+        self,
+        api: VlbgWasserAPI,
+        station_ids: Iterable[str] | None = None,
+        measurement_types: Iterable[str] = PROBE_PARAMETERS,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> int:
+        """Probe the capabilities that are unknown or stale.
+
+        Returns the number of probes sent. Probes that fail stay unknown and
+        are repeated on the next periodic probe; empty windows are recorded.
+        """
+        pending = self.stale(
+            self._by_id if station_ids is None else station_ids, measurement_types
+        )
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def _probe(station_id: str, measurement_type: str) -> None:
+            async with semaphore:
+                try:
+                    supported = await api.probe_measurement(station_id, measurement_type)
+                except VlbgWasserAPIError as err:
+                    _LOGGER.debug("Probing %s/%s failed: %s", station_id, measurement_type, err)
+                    return
+            if supported is None:
+                _LOGGER.debug("Probing %s/%s returned no data", station_id, measurement_type)
+            self.record(station_id, measurement_type, supported)
+
+        await asyncio.gather(*(_probe(*pair) for pair in pending))
+        if pending:
+            _LOGGER.debug("Probed %d station capabilities", len(pending))
+        return len(pending)
+
+    async def async_probe_batching(
+        self, api: VlbgWasserAPI, measurement_types: Iterable[str] = PROBE_PARAMETERS
+    ) -> int:
+        """Probe the multi-station request modes that are unknown or stale.
+
+        Each measurement type is probed with two stations publishing it;
+        types fewer stations publish are not batched anyway. Returns the
+        number of types probed.
+        """
+        probed = 0
+        for measurement_type in self.planner.stale(measurement_types):
+            station_ids = [
+                station["id"]
+                for station in self
+                if measurement_type in self.parameters(station["id"])
+            ][:2]
+            if len(station_ids) < 2:
+                continue
+            try:
+                mode = await api.probe_batch_mode(measurement_type, station_ids)
+            except VlbgWasserAPIError as err:
+                _LOGGER.debug("Probing batch requests of %s failed: %s", measurement_type, err)
+                continue
+            _LOGGER.debug("Batch request mode of %s: %s", measurement_type, mode)
+            self.record_batch_mode(measurement_type, mode)
+            probed += 1
+        return probed
+
+    async def async_load(self, hass: HomeAssistant) -> None:
+        """Load persisted capabilities and save future changes."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.catalog")
+        stored = await self._store.async_load() or {}
+        for station_id, capabilities in stored.get("capabilities", {}).items():
+            # Capabilities saved before empty windows were recorded have no
+            # count of them
+            self._capabilities[station_id] = {
+                measurement_type: (stored[0], stored[1], stored[2] if len(stored) > 2 else 0)
+                for measurement_type, stored in capabilities.items()
+            }
+        self.planner.restore(stored.get("batch_modes", {}))
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the capabilities and batch modes in their stored form."""
+        return {
+            "batch_modes": self.planner.as_dict(),
+            "capabilities": {
+                station_id: {
+                    measurement_type: list(probed)
+                    for measurement_type, probed in capabilities.items()
+                }
+                for station_id, capabilities in self._capabilities.items()
+            }
+        }
+
+
+async def async_get_catalog(hass: HomeAssistant) -> StationCatalog:
+    """Return the station catalog shared by all config entries."""
+    if (catalog := hass.data.get(DATA_CATALOG)) is None:
+        catalog = StationCatalog(RIVER_STATIONS)
+        await catalog.async_load(hass)
+        hass.data[DATA_CATALOG] = catalog
+    return catalog
+
+
+class StoredWellCatalog(WellCatalog):
+    """Well catalog that persists the wells it ingests."""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty catalog."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.wells")
+        super().__init__()
+
+    async def async_load(self) -> None:
+        """Load the persisted wells."""
+        stored = await self._store.async_load() or {}
+        self.restore(stored.get("wells", []))
+
+    def ingest(self, well_ids: Iterable[str]) -> int:
+        """Add wells and save the catalog if any was new."""
+        if added := super().ingest(well_ids):
+            self._store.async_delay_save(lambda: {"wells": self.records()}, CATALOG_SAVE_DELAY)
+        return added
+
+
+async def async_get_well_catalog(hass: HomeAssistant) -> WellCatalog:
+    """Return the groundwater well catalog shared by all config entries."""
+    if (wells := hass.data.get(DATA_WELLS)) is None:
+        wells = StoredWellCatalog(hass)
+        await wells.async_load()
+        hass.data[DATA_WELLS] = wells
+    return wells
@@ -7,33 +7,85 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
 
-from .api import VlbgWasserAPI, VlbgWasserAPIError
-from .const import DOMAIN
+from .api import VlbgWasserAPIError, async_get_api
+from .catalog import StationCatalog, async_get_catalog, async_get_well_catalog
+from .const import (
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_RATE_WINDOW,
+    CONF_REQUEST_BURST,
+    CONF_REQUEST_RATE,
+    CONF_STATS_WINDOW,
+    CONF_SUBSCRIPTIONS,
+    CONF_WELLS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_RATE_WINDOW,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_STATS_WINDOW,
+    DEFAULT_SUBSCRIPTIONS,
+    DOMAIN,
+    MEASUREMENT_TYPES,
+)
+from .core.wells import parse_well_ids
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema({})
+
+def _subscription_options(catalog: StationCatalog) -> dict[str, str]:
+    """Return the selectable subscriptions, keyed by "station_id/type".
+
+    Only measurement types the catalog knows or expects a station to
+    publish are offered.
+    """
+    options = {}
+    for station in catalog:
+        for measurement_type in catalog.parameters(station["id"]):
+            measurement_name = MEASUREMENT_TYPES.get(measurement_type, measurement_type)
+            options[f"{station['id']}/{measurement_type}"] = (
+                f"{station['river']} {station['name']} {measurement_name.title()}"
+            )
+    return options
+
+
+def _subscriptions_schema(options: dict[str, str], current: list[list[str]]) -> vol.Schema:
+    """Return the schema for selecting subscriptions from the selectable ones."""
+    default = [
+        key
+        for station_id, measurement_type in current
+        if (key := f"{station_id}/{measurement_type}") in options
+    ]
+    return vol.Schema(
+        {
+            vol.Required(CONF_SUBSCRIPTIONS, default=default): cv.multi_select(options),
+        }
+    )
+
+
+def _parse_subscriptions(selected: list[str]) -> list[list[str]]:
+    """Convert selected "station_id/type" keys to stored subscription pairs."""
+    return [key.split("/", 1) for key in selected]
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
-    
-    Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
+
+    Data has the keys from the user step's schema with values provided by the user.
     """
-    api = VlbgWasserAPI(hass)
-    
+    if not data.get(CONF_SUBSCRIPTIONS):
+        raise NoSubscriptions
+
+    # A HEAD request is enough to know the API answers; the series are
+    # fetched once, by the entry's first refresh
     try:
-        # Test the API connection with the hardcoded values
-        result = await api.get_measurement_data("200014", "w")
-        if not result:
-            raise CannotConnect
+        await async_get_api(hass).check_connection()
     except VlbgWasserAPIError as err:
         raise CannotConnect from err
-    
+
     # Return info that you want to store in the config entry.
     return {"title": "Vorarlberg Wasser"}
 
@@ -43,6 +95,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._options: dict[str, str] | None = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -51,18 +107,125 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 info = await validate_input(self.hass, user_input)
+            except NoSubscriptions:
+                errors["base"] = "no_subscriptions"
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                return self.async_create_entry(title=info["title"], data=user_input)
+                return self.async_create_entry(
+                    title=info["title"],
+                    data={
+                        CONF_SUBSCRIPTIONS: _parse_subscriptions(user_input[CONF_SUBSCRIPTIONS]),
+                    },
+                )
+
+        # Built once per flow, not each time the form is shown again
+        if self._options is None:
+            self._options = _subscription_options(await async_get_catalog(self.hass))
+        return self.async_show_form(
+            step_id="user",
+            data_schema=_subscriptions_schema(self._options, DEFAULT_SUBSCRIPTIONS),
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options flow for vlbg_wasser."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+        self._options: dict[str, str] | None = None
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the subscribed stations, measurements and wells."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                wells = parse_well_ids(user_input.get(CONF_WELLS, ""))
+            except ValueError:
+                errors[CONF_WELLS] = "invalid_wells"
+            else:
+                if not user_input.get(CONF_SUBSCRIPTIONS) and not wells:
+                    errors["base"] = "no_subscriptions"
+            if not errors:
+                # Wells are opted into by id; unknown ones join the catalog
+                well_catalog = await async_get_well_catalog(self.hass)
+                well_catalog.ingest(wells)
+                return self.async_create_entry(
+                    title="",
+                    data={
+                        CONF_SUBSCRIPTIONS: _parse_subscriptions(user_input[CONF_SUBSCRIPTIONS]),
+                        CONF_WELLS: wells,
+                        CONF_MAX_CONCURRENT_REQUESTS: user_input[CONF_MAX_CONCURRENT_REQUESTS],
+                        CONF_REQUEST_RATE: user_input[CONF_REQUEST_RATE],
+                        CONF_REQUEST_BURST: user_input[CONF_REQUEST_BURST],
+                        CONF_RATE_WINDOW: user_input[CONF_RATE_WINDOW],
+                        CONF_STATS_WINDOW: user_input[CONF_STATS_WINDOW],
+                    },
+                )
+
+        current = self.config_entry.options.get(
+            CONF_SUBSCRIPTIONS,
+            self.config_entry.data.get(CONF_SUBSCRIPTIONS, DEFAULT_SUBSCRIPTIONS),
+        )
+        current_concurrency = self.config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+        current_rate = self.config_entry.options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE)
+        current_burst = self.config_entry.options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST)
+        current_wells = self.config_entry.options.get(CONF_WELLS, [])
+        current_rate_window = self.config_entry.options.get(
+            CONF_RATE_WINDOW, DEFAULT_RATE_WINDOW
+        )
+        current_stats_window = self.config_entry.options.get(
+            CONF_STATS_WINDOW, DEFAULT_STATS_WINDOW
+        )
 
+        if self._options is None:
+            self._options = _subscription_options(await async_get_catalog(self.hass))
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="init",
+            data_schema=_subscriptions_schema(self._options, current).extend(
+                {
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_REQUESTS, default=current_concurrency
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                    vol.Optional(
+                        CONF_REQUEST_RATE, default=current_rate
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+                    vol.Optional(
+                        CONF_REQUEST_BURST, default=current_burst
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Optional(CONF_WELLS, default=", ".join(current_wells)): cv.string,
+                    vol.Optional(
+                        CONF_RATE_WINDOW, default=current_rate_window
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=360)),
+                    vol.Optional(
+                        CONF_STATS_WINDOW, default=current_stats_window
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24)),
+                }
+            ),
+            errors=errors,
         )
 
 
 class CannotConnect(HomeAssistantError):
-    """Error to indicate we cannot connect."""
\ No newline at end of file
+    """Error to indicate we cannot connect."""
+
+
+class NoSubscriptions(HomeAssistantError):
+    """Error to indicate no station was selected."""
@@ -0,0 +1,113 @@
+"""Constants for the vlbg_wasser integration."""
+
+# API configuration, stations and measurement types are shared with the
+# Home Assistant independent core
+from .core.const import (  # noqa: F401
+    API_BASE_URL,
+    API_RETRIES,
+    API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_DELAY,
+    API_TIMEOUT,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    GROUNDWATER,
+    MEASUREMENT_TYPES,
+    REQUEST_CACHE_TTL,
+    RIVER_STATIONS,
+    STEADY_SLOPES,
+)
+
+DOMAIN = "vlbg_wasser"
+
+# Measurement types probed for every river station in the catalog;
+# groundwater levels are only published by wells
+PROBE_PARAMETERS = tuple(
+    measurement_type for measurement_type in MEASUREMENT_TYPES if measurement_type != GROUNDWATER
+)
+
+# Probed capabilities older than this (seconds) are probed again
+CAPABILITY_MAX_AGE = 7 * 24 * 3600
+# A probe that got an empty window is repeated after this (seconds), doubled
+# for every further empty window up to CAPABILITY_MAX_AGE
+CAPABILITY_EMPTY_RETRY = 24 * 3600
+# Unknown and outdated capabilities are probed this often (seconds)
+CAPABILITY_PROBE_INTERVAL = 6 * 3600
+CATALOG_SAVE_DELAY = 10
+
+# hass.data keys of objects shared by all config entries
+DATA_API = f"{DOMAIN}_api"
+DATA_CATALOG = f"{DOMAIN}_catalog"
+DATA_WELLS = f"{DOMAIN}_wells"
+DATA_WEBSOCKET = f"{DOMAIN}_websocket"
+
+# Dispatcher signals of subscriptions changed in a running entry, by entry id
+SIGNAL_SUBSCRIPTIONS_ADDED = f"{DOMAIN}_subscriptions_added_{{}}"
+SIGNAL_SUBSCRIPTIONS_REMOVED = f"{DOMAIN}_subscriptions_removed_{{}}"
+# Dispatcher signals sent after every refresh of an entry and when it is
+# unloaded, by entry id
+SIGNAL_REFRESHED = f"{DOMAIN}_refreshed_{{}}"
+SIGNAL_UNLOADED = f"{DOMAIN}_unloaded_{{}}"
+
+# Config entry keys
+# Subscriptions are stored as a list of [station_id, measurement_type] pairs
+CONF_SUBSCRIPTIONS = "subscriptions"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+# Request budget of the API client; shared by all entries, so the lowest
+# configured values apply
+CONF_REQUEST_RATE = "request_rate"
+CONF_REQUEST_BURST = "request_burst"
+CONF_RATE_WINDOW = "rate_window"
+CONF_STATS_WINDOW = "stats_window"
+# Subscribed groundwater wells, as a list of station ids
+CONF_WELLS = "wells"
+
+# Subscription used by entries created before stations were configurable
+DEFAULT_SUBSCRIPTIONS = [["200014", "w"]]
+
+# Default entity configuration
+# VOWIS publishes a value every 5 minutes; polls are planned around that by
+# the scheduler instead of a fixed timer
+DEFAULT_SCAN_INTERVAL = 300  # 5 minutes in seconds
+
+# Bounds of the delay between two refreshes, in seconds
+MIN_POLL_DELAY = 15
+MAX_POLL_DELAY = 1800
+
+# Series due within this many seconds of each other share one refresh
+POLL_GROUPING_WINDOW = 45
+
+# Delay in seconds to collect refreshes into one write of the on-disk cache
+CACHE_SAVE_DELAY = 60
+
+# Upper bound on simultaneous requests to the VOWIS API per refresh
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Windows of the derived sensors: rate of change in minutes, mean/min/max
+# and trend in hours (at most the 24 hours the API returns)
+DEFAULT_RATE_WINDOW = 60
+DEFAULT_STATS_WINDOW = 24
+
+# Unit of the hourly rate of change by measurement type. Only these types
+# get a rate sensor, and only types with a band in STEADY_SLOPES a trend
+# sensor; precipitation sums and groundwater levels get neither.
+RATE_UNITS = {
+    "w": "cm/h",
+    "wt": "°C/h",
+    "q": "m³/(s·h)",
+    "lt": "°C/h",
+    "lf": "%/h",
+}
+
+# Groundwater tier: wells are expected to publish hourly, are polled at most
+# this many per refresh (the rest follow in the next refreshes) and keep a
+# shorter history than the river series
+GROUNDWATER_INTERVAL = 3600
+GROUNDWATER_BATCH_SIZE = 20
+GROUNDWATER_HISTORY_POINTS = 48
+
+# Points of a series sent to charts over the websocket API, by default and
+# at most; longer series are downsampled
+DEFAULT_CHART_POINTS = 200
+MAX_CHART_POINTS = 2000
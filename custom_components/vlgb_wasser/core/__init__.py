@@ -0,0 +1,13 @@
+"""Home Assistant independent core of the vlbg_wasser integration.
+
+Fetching (client), payload normalisation (normalise), the series store
+(series, ingest) and the poll scheduler only depend on the standard library
+and aiohttp. They use relative imports only, so the package also works as
+a top-level ``core`` package, e.g. for the command line interface::
+
+    cd custom_components/vlgb_wasser
+    python -m core fetch > measurements.ndjson
+
+Importing the package itself imports nothing; only core.client pulls in
+aiohttp. ``python -m core import-time`` checks the import-time budget.
+"""
@@ -0,0 +1,158 @@
+"""Command line interface of the VOWIS core.
+
+``fetch`` requests every catalog station and measurement type concurrently
+and writes one NDJSON line per series to stdout as soon as it arrives.
+``import-time`` measures how long importing the core modules takes in a
+fresh interpreter and fails if a budget is exceeded.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import subprocess
+import sys
+from typing import Any
+
+from .const import (
+    API_BASE_URL,
+    API_TIMEOUT,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    RIVER_STATIONS,
+)
+
+# Import-time budgets (milliseconds) of groups of core modules; the client
+# includes aiohttp, the rate limiter asyncio
+IMPORT_BUDGETS = {
+    ("series", "ingest", "scheduler", "metrics", "resilience", "normalise", "analytics", "wells", "downsample"): 50.0,
+    ("client", "ratelimit"): 500.0,
+}
+
+
+async def _async_fetch(args: argparse.Namespace) -> int:
+    """Fetch the selected series and stream them as NDJSON."""
+    # pylint: disable=import-outside-toplevel
+    import aiohttp
+
+    from .client import VowisClient
+    from .errors import VowisError
+    from .ingest import SeriesIngestor
+    from .ratelimit import RateLimiter
+
+    stations = [
+        station
+        for station in RIVER_STATIONS
+        if not args.station or station["id"] in args.station
+    ]
+    requests = [
+        (station["id"], measurement_type)
+        for station in stations
+        for measurement_type in (args.type or station["parameters"])
+    ]
+    ingestor = SeriesIngestor()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = 0
+
+    async with aiohttp.ClientSession() as session:
+        client = VowisClient(
+            session,
+            base_url=args.base_url,
+            timeout=args.timeout,
+            limiter=RateLimiter(args.rate, args.burst),
+        )
+
+        async def fetch(station_id: str, measurement_type: str) -> dict[str, Any]:
+            record: dict[str, Any] = {"station_id": station_id, "measurement_type": measurement_type}
+            async with semaphore:
+                try:
+                    result = await client.get_measurement_data(station_id, measurement_type)
+                except VowisError as error:
+                    record["error"] = str(error)
+                    return record
+            if not result:
+                record["points"] = []
+                return record
+            points = ingestor.ingest(
+                (station_id, measurement_type), result["measurements"], result.get("timezone")
+            )
+            record.update(parameter=result.get("parameter"), unit=result.get("unit"))
+            if args.latest:
+                record["latest"] = list(points[-1]) if points else None
+            else:
+                record["points"] = [list(point) for point in points]
+            return record
+
+        for done in asyncio.as_completed([fetch(*request) for request in requests]):
+            record = await done
+            failures += "error" in record
+            sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+            sys.stdout.flush()
+
+    return 1 if requests and failures == len(requests) else 0
+
+
+def _measure_import(modules: tuple[str, ...], repeat: int) -> float:
+    """Return the fastest import of some core modules in a fresh interpreter (ms)."""
+    package = Path(__file__).resolve().parent
+    statement = "; ".join(f"import {package.name}.{module}" for module in modules)
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"{statement}; print((time.perf_counter() - started) * 1000)"
+    )
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=package.parent,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    )
+
+
+def _import_time(args: argparse.Namespace) -> int:
+    """Print the import time of each module group against its budget."""
+    over = False
+    for modules, budget in IMPORT_BUDGETS.items():
+        elapsed = _measure_import(modules, args.repeat)
+        over |= elapsed > budget
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        print(f"{', '.join(modules):<60} {elapsed:7.1f} ms / {budget:5.0f} ms  {status}")
+    return 1 if over else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line interface."""
+    parser = argparse.ArgumentParser(prog="python -m core", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="stream catalog series as NDJSON")
+    fetch.add_argument("--station", action="append", help="station id, repeatable (default: all)")
+    fetch.add_argument(
+        "--type", action="append", help="measurement type, repeatable (default: the station's)"
+    )
+    fetch.add_argument("--concurrency", type=int, default=8)
+    fetch.add_argument("--timeout", type=float, default=API_TIMEOUT, help="seconds per attempt")
+    fetch.add_argument(
+        "--rate", type=float, default=DEFAULT_REQUEST_RATE, help="requests per second (0: no limit)"
+    )
+    fetch.add_argument("--burst", type=int, default=DEFAULT_REQUEST_BURST)
+    fetch.add_argument("--base-url", default=API_BASE_URL)
+    fetch.add_argument("--latest", action="store_true", help="only emit the latest point")
+
+    import_time = commands.add_parser("import-time", help="check the import-time budget")
+    import_time.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if args.command == "fetch":
+        return asyncio.run(_async_fetch(args))
+    return _import_time(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Incremental rolling analytics of measurement series.
+
+Each window keeps its points in a deque together with running sums for the
+mean and a least-squares trend, and monotonic deques for the minimum and
+maximum. Appending a point and evicting the points that fell out of the
+window is O(1) amortised, so derived values are updated with every refresh
+instead of re-scanning history. A window is filled from a stored series
+(``backfill``) with the standard library's iterator tools (``accumulate``,
+``compress``, ``map``), which loop in C instead of per point in Python.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable, Sequence
+from itertools import accumulate, chain, compress, repeat
+from operator import gt, lt, mul, sub, truediv
+from typing import Any
+
+HOUR = 3600
+
+# Running sums are recomputed from the window after this many appends, to
+# keep rounding errors of the add/subtract updates from accumulating
+RESUM_INTERVAL = 1024
+
+# Directions of the trend
+DIRECTION_RISING = "rising"
+DIRECTION_FALLING = "falling"
+DIRECTION_STEADY = "steady"
+DIRECTIONS = (DIRECTION_RISING, DIRECTION_FALLING, DIRECTION_STEADY)
+
+
+class RollingWindow:
+    """Statistics over the points of the last ``span`` seconds."""
+
+    __slots__ = (
+        "span",
+        "_points",
+        "_minima",
+        "_maxima",
+        "_anchor",
+        "_sum_t",
+        "_sum_v",
+        "_sum_tt",
+        "_sum_tv",
+        "_appends",
+    )
+
+    def __init__(self, span: int) -> None:
+        """Initialize an empty window."""
+        self.span = span
+        self._points: deque[tuple[int, float]] = deque()
+        # Candidates for the minimum/maximum, values ascending/descending
+        self._minima: deque[tuple[int, float]] = deque()
+        self._maxima: deque[tuple[int, float]] = deque()
+        self._anchor = 0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        self._appends = 0
+
+    def __len__(self) -> int:
+        """Return the number of points in the window."""
+        return len(self._points)
+
+    def append(self, timestamp: int, value: float) -> None:
+        """Add a point newer than all points in the window."""
+        if not self._points:
+            self._anchor = timestamp
+        self._points.append((timestamp, value))
+        self._add(timestamp, value, 1.0)
+
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        self._minima.append((timestamp, value))
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((timestamp, value))
+
+        self._evict(timestamp - self.span)
+        self._appends += 1
+        if self._appends >= RESUM_INTERVAL:
+            self._resum()
+
+    def backfill(self, times: array, values: array) -> None:
+        """Replace the window with the last ``span`` seconds of ascending points."""
+        first = bisect_left(times, times[-1] - self.span + 1) if times else 0
+        times = times[first:]
+        values = values[first:]
+
+        self._points = deque(zip(times, values))
+        self._minima = self._candidates(times, values, lt, min)
+        self._maxima = self._candidates(times, values, gt, max)
+        self._appends = 0
+        if times:
+            self._sum(times, values)
+        else:
+            self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+
+    @staticmethod
+    def _candidates(
+        times: Sequence[int],
+        values: Sequence[float],
+        beats: Callable[[float, float], bool],
+        extreme: Callable[[float, float], float],
+    ) -> deque[tuple[int, float]]:
+        """Return the points that beat every newer point, oldest first.
+
+        These are the minimum (``lt``, ``min``) or maximum (``gt``, ``max``)
+        candidates of the ascending points.
+        """
+        newest_first = values[::-1]
+        # The newest point always is a candidate, every other one if it beats
+        # the extreme of the points after it
+        selected = chain(
+            (True,), map(beats, newest_first[1:], accumulate(newest_first, extreme))
+        )
+        candidates = deque(compress(zip(times[::-1], newest_first), selected))
+        candidates.reverse()
+        return candidates
+
+    def _add(self, timestamp: int, value: float, sign: float) -> None:
+        """Add (sign 1) or remove (sign -1) a point from the running sums."""
+        hours = (timestamp - self._anchor) / HOUR
+        self._sum_t += sign * hours
+        self._sum_v += sign * value
+        self._sum_tt += sign * hours * hours
+        self._sum_tv += sign * hours * value
+
+    def _evict(self, cutoff: int) -> None:
+        """Drop the points at or before ``cutoff``."""
+        points = self._points
+        while points and points[0][0] <= cutoff:
+            timestamp, value = points.popleft()
+            self._add(timestamp, value, -1.0)
+        while self._minima and self._minima[0][0] <= cutoff:
+            self._minima.popleft()
+        while self._maxima and self._maxima[0][0] <= cutoff:
+            self._maxima.popleft()
+
+    def _resum(self) -> None:
+        """Recompute the running sums relative to the oldest point."""
+        self._appends = 0
+        if not self._points:
+            self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+            return
+        self._sum(*zip(*self._points))
+
+    def _sum(self, times: Sequence[int], values: Sequence[float]) -> None:
+        """Set the running sums to those of the given points."""
+        self._anchor = times[0]
+        hours = array("d", map(truediv, map(sub, times, repeat(self._anchor)), repeat(HOUR)))
+        self._sum_t = sum(hours)
+        self._sum_v = sum(values)
+        self._sum_tt = sum(map(mul, hours, hours))
+        self._sum_tv = sum(map(mul, hours, values))
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean value."""
+        if not self._points:
+            return None
+        return self._sum_v / len(self._points)
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest value."""
+        return self._minima[0][1] if self._minima else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest value."""
+        return self._maxima[0][1] if self._maxima else None
+
+    @property
+    def change_rate(self) -> float | None:
+        """Return the change from the oldest to the newest point, per hour."""
+        if len(self._points) < 2:
+            return None
+        (first_time, first_value), (last_time, last_value) = self._points[0], self._points[-1]
+        return (last_value - first_value) * HOUR / (last_time - first_time)
+
+    @property
+    def slope(self) -> float | None:
+        """Return the least-squares trend, per hour."""
+        count = len(self._points)
+        if count < 2:
+            return None
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (count * self._sum_tv - self._sum_t * self._sum_v) / denominator
+
+
+class SeriesAnalytics:
+    """Derived values of one series over a short and a long window.
+
+    The short window gives the rate of change, the long one the mean,
+    minimum, maximum and trend. The trend's direction needs the band of
+    slopes (units per hour) that count as steady, which depends on the
+    measurement type; without one it is None.
+    """
+
+    __slots__ = ("rate_window", "stats_window", "steady_slope")
+
+    def __init__(
+        self, rate_span: int, stats_span: int, steady_slope: float | None = None
+    ) -> None:
+        """Initialize empty windows."""
+        self.rate_window = RollingWindow(rate_span)
+        self.stats_window = RollingWindow(stats_span)
+        self.steady_slope = steady_slope
+
+    def extend(self, points: list[tuple[int, float]]) -> None:
+        """Add new points in ascending time order."""
+        for timestamp, value in points:
+            self.rate_window.append(timestamp, value)
+            self.stats_window.append(timestamp, value)
+
+    def backfill(self, times: array, values: array) -> None:
+        """Fill both windows from a stored series."""
+        self.rate_window.backfill(times, values)
+        self.stats_window.backfill(times, values)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current derived values."""
+        slope = self.stats_window.slope
+        if slope is None or self.steady_slope is None:
+            direction = None
+        elif slope > self.steady_slope:
+            direction = DIRECTION_RISING
+        elif slope < -self.steady_slope:
+            direction = DIRECTION_FALLING
+        else:
+            direction = DIRECTION_STEADY
+        return {
+            "rate": self.rate_window.change_rate,
+            "mean": self.stats_window.mean,
+            "min": self.stats_window.minimum,
+            "max": self.stats_window.maximum,
+            "trend": slope,
+            "direction": direction,
+            "points": len(self.stats_window),
+        }
@@ -0,0 +1,492 @@
+"""asyncio client for the VOWIS measurement API.
+
+The client only depends on aiohttp, so it can be used without Home
+Assistant (see ``python -m core``); the integration wraps it in
+VlbgWasserAPI.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Final
+
+import aiohttp
+import async_timeout
+
+from .const import (
+    API_BASE_URL,
+    API_RETRIES,
+    API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_DELAY,
+    API_TIMEOUT,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    REQUEST_CACHE_TTL,
+)
+from .errors import VowisCircuitOpen, VowisConnectionError, VowisError, VowisUnsupported
+from .metrics import Metrics, MetricsRegistry
+from .normalise import normalise_measurements
+from .planner import BATCH_ALL, BATCH_MULTI, BATCH_SINGLE
+from .ratelimit import PRIORITY_BACKGROUND, PRIORITY_VISIBLE, RateLimiter
+from .resilience import CircuitBreaker, backoff_delay
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# Statuses the API answers with for parameters it does not know
+UNSUPPORTED_STATUSES = (400, 404)
+
+# Statuses worth retrying besides server errors
+RETRY_STATUSES = (408, 429)
+
+
+class NotModified:
+    """Marker type for a payload that did not change since the last request."""
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+# Returned by get_measurement_data instead of data when nothing changed
+NOT_MODIFIED: Final = NotModified()
+
+
+class _Validators:
+    """Cache validators of the last response for one request."""
+
+    __slots__ = ("etag", "last_modified", "digest")
+
+    def __init__(self) -> None:
+        """Initialize empty validators."""
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.digest: bytes | None = None
+
+
+class _Response:
+    """Outcome of one upstream request, shared by all callers asking for it.
+
+    ``body`` is None when the server answered 304. The body is decoded at
+    most once, by the first caller that needs the data.
+    """
+
+    __slots__ = ("digest", "body", "expires", "result")
+
+    def __init__(self, digest: bytes | None, body: bytes | None, expires: float) -> None:
+        """Initialize the response."""
+        self.digest = digest
+        self.body = body
+        self.expires = expires
+        self.result: dict[str, Any] | None = None
+
+
+class VowisClient:
+    """Client for the VOWIS measurement API.
+
+    Identical concurrent requests are coalesced into one upstream call, and
+    responses are served to further callers for REQUEST_CACHE_TTL seconds.
+
+    Requests are revalidated with ETag/Last-Modified when the server sends
+    them; otherwise a hash of the raw body identifies the payload. Callers
+    pass the digest of the payload they processed last and get NOT_MODIFIED
+    instead of data when it did not change, without any JSON decoding.
+
+    Each attempt is limited to ``timeout`` seconds and failed attempts are
+    retried up to ``retries`` times. A circuit breaker per endpoint pauses
+    requests after repeated failures; while it is open the last good
+    response of a series is served instead.
+
+    With a ``limiter`` every upstream attempt waits for the request budget,
+    queued by the priority of the caller that started the request. The
+    time spent waiting is counted as ``queue_wait`` in the metrics.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str = API_BASE_URL,
+        timeout: float = API_TIMEOUT,
+        retries: int = API_RETRIES,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        """Initialize the API client."""
+        self._session = session
+        self.limiter = limiter
+        self._base_url = base_url
+        self._timeout = timeout
+        self._retries = retries
+        self._validators: dict[tuple[str, str], _Validators] = {}
+        self._inflight: dict[tuple[str, str, bool], asyncio.Task[_Response]] = {}
+        self._recent: dict[tuple[str, str], _Response] = {}
+        self._last_good: dict[tuple[str, str], _Response] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+        # How often a request was answered without new data or upstream call
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "unchanged_payload": 0,
+            "coalesced": 0,
+            "cache_hits": 0,
+            "retries": 0,
+            "rejected": 0,
+            "served_stale": 0,
+        }
+
+        # Timings and sizes per endpoint and per station
+        self.metrics = MetricsRegistry()
+
+    def _create_task(self, coro: Coroutine[Any, Any, _Response]) -> asyncio.Task[_Response]:
+        """Start a request that callers can share."""
+        return asyncio.get_running_loop().create_task(coro)
+
+    def _metrics(self, key: tuple[str, str]) -> tuple[Metrics, ...]:
+        """Return the endpoint and station metrics of a request.
+
+        A multi-station request counts for every station it names; one for
+        all stations only counts for the endpoint.
+        """
+        hzbnr, measurement_type = key
+        return (
+            self.metrics.endpoint(f"messwerte/{measurement_type}"),
+            *(self.metrics.station(station_id) for station_id in hzbnr.split(",") if station_id),
+        )
+
+    def breaker_states(self) -> dict[str, dict[str, Any]]:
+        """Return the circuit breaker state of every endpoint used so far."""
+        return {name: breaker.as_dict() for name, breaker in self._breakers.items()}
+
+    async def get_measurement_data(
+        self,
+        station_id: str,
+        measurement_type: str,
+        known_digest: bytes | None = None,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> dict[str, Any] | NotModified:
+        """Get measurement data for a specific station and type.
+
+        ``known_digest`` is the ``digest`` of the result the caller processed
+        last; NOT_MODIFIED is returned when the payload still matches it.
+        The result is shared between callers and must not be modified.
+        """
+        key = (station_id, measurement_type)
+        now = asyncio.get_running_loop().time()
+
+        response = self._recent.get(key)
+        if response is not None and response.expires > now:
+            self.stats["cache_hits"] += 1
+            for metrics in self._metrics(key):
+                metrics.cache_hits += 1
+        else:
+            response = await self._coalesced(key, True, priority)
+
+        if known_digest is not None and response.digest == known_digest:
+            self.stats["unchanged_payload"] += 1
+            return NOT_MODIFIED
+
+        if response.body is None:
+            # Revalidated, but against a payload this caller has not seen
+            response = await self._coalesced(key, False, priority)
+
+        if response.result is None:
+            response.result = self._decode(response, station_id, measurement_type)
+        return response.result
+
+    async def get_measurement_batch(
+        self,
+        station_ids: list[str],
+        measurement_type: str,
+        mode: str = BATCH_MULTI,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> dict[str, dict[str, Any]]:
+        """Get the series of several stations with one request.
+
+        ``mode`` is BATCH_MULTI to name the stations in the request or
+        BATCH_ALL to request every station. Returns the results by station
+        id, in the form get_measurement_data returns them but without a
+        digest; stations missing from the response are left out. The
+        results are shared between callers and must not be modified.
+        """
+        key = (",".join(station_ids) if mode != BATCH_ALL else "", measurement_type)
+        now = asyncio.get_running_loop().time()
+
+        response = self._recent.get(key)
+        if response is not None and response.expires > now:
+            self.stats["cache_hits"] += 1
+            for metrics in self._metrics(key):
+                metrics.cache_hits += 1
+        else:
+            response = await self._coalesced(key, True, priority)
+
+        if response.body is None:
+            # Revalidated, but the payload is no longer cached
+            response = await self._coalesced(key, False, priority)
+
+        # The decoded payload is kept; stations are normalised per call
+        if response.result is None:
+            response.result = self._decode_payload(response, key)
+        stations = response.result.get("Stationen")
+        if not isinstance(stations, dict):
+            raise VowisError(f"Unexpected API response structure for {measurement_type}")
+        return {
+            station_id: normalise_measurements(response.result, station_id)
+            for station_id in station_ids
+            if station_id in stations
+        }
+
+    async def _coalesced(
+        self, key: tuple[str, str], conditional: bool, priority: int
+    ) -> _Response:
+        """Return the response of a request, joining one that is in flight.
+
+        A joined request keeps the priority of the caller that started it.
+        """
+        flight = (*key, conditional)
+        if (task := self._inflight.get(flight)) is not None:
+            self.stats["coalesced"] += 1
+            for metrics in self._metrics(key):
+                metrics.cache_hits += 1
+        else:
+            task = self._create_task(self._fetch(key, conditional, priority))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight, None))
+        # A cancelled caller must not cancel the request other callers wait for
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: tuple[str, str], conditional: bool, priority: int) -> _Response:
+        """Request a measurement series, guarded by the endpoint's breaker."""
+        station_id, measurement_type = key
+        endpoint = f"messwerte/{measurement_type}"
+        if (breaker := self._breakers.get(endpoint)) is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                endpoint, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+            )
+
+        if not breaker.allow():
+            self.stats["rejected"] += 1
+            if (last_good := self._last_good.get(key)) is not None:
+                self.stats["served_stale"] += 1
+                return last_good
+            raise VowisCircuitOpen(
+                f"Requests to {endpoint} are paused after repeated failures"
+            )
+
+        try:
+            response = await self._fetch_with_retries(key, conditional, priority)
+        except VowisConnectionError:
+            breaker.failure()
+            raise
+        except (VowisError, asyncio.CancelledError):
+            # A rejected request (e.g. a 400/404 for a station) does not show
+            # that the endpoint is healthy again, nor that it is down
+            breaker.release()
+            raise
+
+        breaker.success()
+        if response.body is not None:
+            self._last_good[key] = response
+        return response
+
+    async def _fetch_with_retries(
+        self, key: tuple[str, str], conditional: bool, priority: int
+    ) -> _Response:
+        """Request a measurement series, retrying connection errors."""
+        for attempt in range(self._retries + 1):
+            if self.limiter is not None:
+                waited = await self.limiter.acquire(priority)
+                for metrics in self._metrics(key):
+                    metrics.queue_wait += waited
+            try:
+                return await self._fetch_once(key, conditional)
+            except VowisConnectionError as error:
+                if attempt == self._retries:
+                    _LOGGER.error("Fetching %s/%s failed: %s", *key, error)
+                    raise
+                delay = backoff_delay(attempt, API_RETRY_BASE_DELAY, API_RETRY_MAX_DELAY)
+                _LOGGER.debug("Fetching %s/%s failed (%s), retrying in %.1fs", *key, error, delay)
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _fetch_once(self, key: tuple[str, str], conditional: bool) -> _Response:
+        """Request a measurement series from the API."""
+        station_id, measurement_type = key
+        url = f"{self._base_url}messwerte/{measurement_type}"
+        params = {"hzbnr": station_id} if station_id else {}
+        validators = self._validators.setdefault(key, _Validators())
+
+        headers = {}
+        if conditional and validators.digest is not None:
+            if validators.etag:
+                headers["If-None-Match"] = validators.etag
+            if validators.last_modified:
+                headers["If-Modified-Since"] = validators.last_modified
+
+        started = time.perf_counter()
+        size = 0
+        failed = True
+        try:
+            async with async_timeout.timeout(self._timeout):
+                async with self._session.get(url, params=params, headers=headers) as response:
+                    self.stats["requests"] += 1
+
+                    if response.status == 304:
+                        failed = False
+                        self.stats["not_modified"] += 1
+                        return self._remember(key, validators.digest, None)
+
+                    if response.status in UNSUPPORTED_STATUSES:
+                        failed = False
+                        raise VowisUnsupported(
+                            f"Station {station_id or '(all)'} does not provide {measurement_type}"
+                        )
+
+                    if response.status < 500 and response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                    elif response.status >= 400:
+                        raise VowisConnectionError(
+                            f"Server error {response.status} from {url}"
+                        )
+                    body = await response.read()
+                    size = len(body)
+                    failed = False
+
+                    validators.etag = response.headers.get("ETag")
+                    validators.last_modified = response.headers.get("Last-Modified")
+
+        except VowisError:
+            raise
+        except asyncio.TimeoutError as error:
+            raise VowisConnectionError(
+                f"Timeout after {self._timeout}s fetching data from {url}"
+            ) from error
+        except aiohttp.ClientResponseError as error:
+            raise VowisError(f"Request to {url} was rejected: {error}") from error
+        except aiohttp.ClientError as error:
+            raise VowisConnectionError(f"Connection error: {error}") from error
+        except Exception as error:
+            _LOGGER.error("Unexpected error fetching data from %s: %s", url, error)
+            raise VowisError(f"Unexpected error: {error}") from error
+        finally:
+            latency = time.perf_counter() - started
+            for metrics in self._metrics(key):
+                metrics.requests += 1
+                metrics.errors += failed
+                metrics.bytes += size
+                metrics.observe_latency(latency)
+
+        validators.digest = hashlib.blake2b(body, digest_size=16).digest()
+        return self._remember(key, validators.digest, body)
+
+    def _remember(self, key: tuple[str, str], digest: bytes | None, body: bytes | None) -> _Response:
+        """Keep a response for the cache period and drop expired ones."""
+        now = asyncio.get_running_loop().time()
+        previous = self._recent.get(key)
+        for expired in [k for k, response in self._recent.items() if response.expires <= now]:
+            del self._recent[expired]
+
+        response = _Response(digest, body, now + REQUEST_CACHE_TTL)
+        if body is None and previous is not None and previous.digest == digest:
+            # A revalidated payload is still the one cached
+            response.body = previous.body
+            response.result = previous.result
+        self._recent[key] = response
+        return response
+
+    def _decode_payload(self, response: _Response, key: tuple[str, str]) -> dict[str, Any]:
+        """Decode the body of a multi-station response."""
+        started = time.perf_counter()
+        try:
+            data = json.loads(response.body)
+        except ValueError as error:
+            raise VowisError(f"Invalid JSON for {key[0] or 'all'}/{key[1]}: {error}") from error
+        if not isinstance(data, dict):
+            raise VowisError(f"Unexpected API response structure for {key[1]}")
+        for metrics in self._metrics(key):
+            metrics.decode_time += time.perf_counter() - started
+        return data
+
+    def _decode(self, response: _Response, station_id: str, measurement_type: str) -> dict[str, Any]:
+        """Decode and process the body of a response."""
+        started = time.perf_counter()
+        try:
+            data = json.loads(response.body)
+        except ValueError as error:
+            raise VowisError(f"Invalid JSON for {station_id}/{measurement_type}: {error}") from error
+        decoded = time.perf_counter()
+
+        result = normalise_measurements(data, station_id)
+        if result:
+            result["digest"] = response.digest
+        processed = time.perf_counter()
+
+        for metrics in self._metrics((station_id, measurement_type)):
+            metrics.decode_time += decoded - started
+            metrics.process_time += processed - decoded
+        _LOGGER.debug(
+            "Decoded %d bytes for station %s, type %s in %.1f ms",
+            len(response.body), station_id, measurement_type, (processed - started) * 1000,
+        )
+        return result
+
+    async def check_connection(self) -> None:
+        """Check that the API answers, without downloading a payload.
+
+        Sends a HEAD request for the lake endpoint; any answer short of a
+        server error counts as reachable. Raises VowisConnectionError.
+        """
+        url = f"{self._base_url}see/"
+        if self.limiter is not None:
+            await self.limiter.acquire(PRIORITY_VISIBLE)
+        try:
+            async with async_timeout.timeout(self._timeout):
+                async with self._session.head(url) as response:
+                    self.stats["requests"] += 1
+                    status = response.status
+        except asyncio.TimeoutError as error:
+            raise VowisConnectionError(
+                f"Timeout after {self._timeout}s checking {url}"
+            ) from error
+        except aiohttp.ClientError as error:
+            raise VowisConnectionError(f"Connection error: {error}") from error
+        if status >= 500:
+            raise VowisConnectionError(f"Server error {status} from {url}")
+
+    async def probe_measurement(self, station_id: str, measurement_type: str) -> bool | None:
+        """Return whether a station publishes data for a measurement type.
+
+        Only a 400/404 answer means it does not; an empty window (e.g. a
+        station that is down for a moment) returns None, as unknown.
+        """
+        try:
+            result = await self.get_measurement_data(
+                station_id, measurement_type, priority=PRIORITY_BACKGROUND
+            )
+        except VowisUnsupported:
+            return False
+        return True if result else None
+
+    async def probe_batch_mode(self, measurement_type: str, station_ids: list[str]) -> str:
+        """Return how several stations of a measurement type can be requested.
+
+        ``station_ids`` are at least two stations known to publish the type.
+        A mode is accepted if the response holds all of them; connection
+        errors are raised, so an outage is not mistaken for BATCH_SINGLE.
+        """
+        for mode in (BATCH_MULTI, BATCH_ALL):
+            try:
+                results = await self.get_measurement_batch(
+                    station_ids, measurement_type, mode, PRIORITY_BACKGROUND
+                )
+            except VowisConnectionError:
+                raise
+            except VowisError as error:
+                _LOGGER.debug("Batch mode %s of %s not accepted: %s", mode, measurement_type, error)
+                continue
+            if all(results.get(station_id) for station_id in station_ids):
+                return mode
+        return BATCH_SINGLE
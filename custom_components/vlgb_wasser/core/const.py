@@ -0,0 +1,81 @@
+"""Constants of the VOWIS core client."""
+
+# API Configuration
+API_BASE_URL = "https://vowis.vorarlberg.at/api/"
+# Seconds per attempt; failed attempts are retried with jittered backoff
+API_TIMEOUT = 10
+API_RETRIES = 2
+API_RETRY_BASE_DELAY = 1.0
+API_RETRY_MAX_DELAY = 8.0
+
+# Consecutive failures after which requests to an endpoint are paused, and
+# seconds until a trial request is sent again
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 120
+
+# Seconds a response is served to other callers asking for the same data
+REQUEST_CACHE_TTL = 60
+
+# Request budget shared by all users of a client: sustained requests per
+# second and the burst allowed on top (0 requests per second: no limit)
+DEFAULT_REQUEST_RATE = 2.0
+DEFAULT_REQUEST_BURST = 10
+
+# River Stations Configuration
+# "parameters" lists the measurement types the station is known to publish
+RIVER_STATIONS = [
+    {
+        "name": "Bangs",
+        "id": "200014",
+        "river": "Rhein",
+        "parameters": ["w", "q"],
+    },
+    {
+        "name": "Lustenau (Höchster Brücke)",
+        "id": "200196",
+        "river": "Rhein",
+        "parameters": ["w", "q", "wt"],
+    },
+    {
+        "name": "Gisingen",
+        "id": "200147",
+        "river": "Ill",
+        "parameters": ["w", "q", "wt"],
+    },
+    {
+        "name": "Beschling",
+        "id": "231688",
+        "river": "Ill",
+        "parameters": ["w", "q"],
+    },
+]
+
+# Measurement type mappings
+MEASUREMENT_TYPES = {
+    "w": "depth",                # Water Depth
+    "wt": "temperature",         # Water Temperature
+    "q": "flow",                 # Water Flow Rate
+    "lt": "air temperature",     # Lufttemperatur
+    "lf": "air humidity",        # Luftfeuchte
+    "n": "precipitation",        # Niederschlag
+    "n5": "precipitation 5 min", # Niederschlag, 5 minute sum
+    "gws_t_mw": "groundwater level",  # Grundwasserstand
+}
+
+# Measurement type of groundwater wells (Grundwasserstand)
+GROUNDWATER = "gws_t_mw"
+
+# Measurement types whose rising trend is a flood alert. The river stations
+# define no alert levels, so the trend is the only alert of their series.
+ALERT_TYPES = frozenset(("w", "q"))
+
+# Trend slopes within this band (units of the measurement per hour) count as
+# steady. Types without a band, like precipitation sums or groundwater
+# levels of unknown unit, get no trend direction.
+STEADY_SLOPES = {
+    "w": 1.0,    # cm/h
+    "wt": 0.1,   # °C/h
+    "q": 0.5,    # m³/s per hour
+    "lt": 0.5,   # °C/h
+    "lf": 2.0,   # %/h
+}
@@ -0,0 +1,110 @@
+"""Downsampling of measurement series for charts.
+
+A day of 5 minute values is 288 points, and wells keep two days; a chart
+card a few hundred pixels wide needs far fewer. Two reductions are offered:
+
+- ``lttb`` (largest triangle three buckets) keeps the first and last point
+  and, per bucket in between, the point spanning the largest triangle with
+  its neighbours, which preserves the visual shape of the curve.
+- ``minmax`` keeps the lowest and highest point of every bucket, so no peak
+  (e.g. of a flood wave) is lost, at the cost of a jagged line.
+
+Both work on the timestamp and value arrays of ``MeasurementSeries.range``
+and return new arrays in ascending time order.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+
+METHOD_LTTB = "lttb"
+METHOD_MINMAX = "minmax"
+METHODS = (METHOD_LTTB, METHOD_MINMAX)
+
+# LTTB always keeps the first and last point
+MIN_POINTS = 3
+
+
+def lttb(
+    times: Sequence[int], values: Sequence[float], points: int
+) -> tuple[array, array]:
+    """Reduce a series to ``points`` points by largest triangle three buckets."""
+    if points < MIN_POINTS:
+        raise ValueError(f"points must be at least {MIN_POINTS}")
+    size = len(times)
+    if size <= points:
+        return array("q", times), array("d", values)
+
+    sampled_times = array("q", (times[0],))
+    sampled_values = array("d", (values[0],))
+
+    # Buckets of the points between the first and the last one
+    every = (size - 2) / (points - 2)
+    selected = 0
+    for bucket in range(points - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+
+        # The average of the next bucket is the triangle's third corner;
+        # the last bucket's next one is the last point
+        next_start = end
+        next_end = min(int((bucket + 2) * every) + 1, size)
+        count = next_end - next_start
+        average_time = sum(times[next_start:next_end]) / count
+        average_value = sum(values[next_start:next_end]) / count
+
+        selected_time = times[selected]
+        selected_value = values[selected]
+        largest = -1.0
+        for index in range(start, end):
+            # Twice the triangle area; the factor does not change the order
+            area = abs(
+                (selected_time - average_time) * (values[index] - selected_value)
+                - (selected_time - times[index]) * (average_value - selected_value)
+            )
+            if area > largest:
+                largest = area
+                chosen = index
+        selected = chosen
+        sampled_times.append(times[selected])
+        sampled_values.append(values[selected])
+
+    sampled_times.append(times[-1])
+    sampled_values.append(values[-1])
+    return sampled_times, sampled_values
+
+
+def minmax(
+    times: Sequence[int], values: Sequence[float], points: int
+) -> tuple[array, array]:
+    """Reduce a series to at most ``points`` points, the extremes of each bucket."""
+    if points < 2:
+        raise ValueError("points must be at least 2")
+    size = len(times)
+    if size <= points:
+        return array("q", times), array("d", values)
+
+    sampled_times = array("q")
+    sampled_values = array("d")
+    buckets = points // 2
+    for bucket in range(buckets):
+        start = bucket * size // buckets
+        end = (bucket + 1) * size // buckets
+        bucket_values = values[start:end]
+        low = start + bucket_values.index(min(bucket_values))
+        high = start + bucket_values.index(max(bucket_values))
+        for index in sorted({low, high}):
+            sampled_times.append(times[index])
+            sampled_values.append(values[index])
+    return sampled_times, sampled_values
+
+
+def downsample(
+    times: Sequence[int], values: Sequence[float], points: int, method: str = METHOD_LTTB
+) -> tuple[array, array]:
+    """Reduce a series to about ``points`` points with one of METHODS."""
+    if method == METHOD_LTTB:
+        return lttb(times, values, points)
+    if method == METHOD_MINMAX:
+        return minmax(times, values, points)
+    raise ValueError(f"Unknown downsampling method: {method}")
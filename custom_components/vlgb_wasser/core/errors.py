@@ -0,0 +1,17 @@
+"""Exceptions of the VOWIS core client."""
+
+
+class VowisError(Exception):
+    """Exception to indicate a general API error."""
+
+
+class VowisConnectionError(VowisError):
+    """Exception to indicate a connection error worth retrying."""
+
+
+class VowisUnsupported(VowisError):
+    """Exception to indicate a station does not provide a measurement type."""
+
+
+class VowisCircuitOpen(VowisConnectionError):
+    """Exception to indicate requests to an endpoint are paused after failures."""
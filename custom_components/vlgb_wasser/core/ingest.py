@@ -0,0 +1,133 @@
+"""Incremental ingestion of VOWIS measurement windows.
+
+Every ``messwerte`` response repeats the last 24 hours of measurements, but
+only the newest one or two points change between polls. The ingestor keeps
+one bounded series per station/measurement and merges only points after its
+newest timestamp, handing the new points to the caller as a delta.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Mapping
+
+from .series import MeasurementSeries, parse_timestamp, utc_offset
+
+# Points kept per series: 24 hours at 5 minute resolution
+DEFAULT_HISTORY_POINTS = 288
+
+# A normalised measurement point: (UTC epoch seconds, value)
+Point = tuple[int, float]
+
+
+class SeriesIngestor:
+    """Merge polled measurement windows into bounded per-series histories."""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_HISTORY_POINTS,
+        capacity_of: Callable[[Hashable], int] | None = None,
+    ) -> None:
+        """Initialize the ingestor.
+
+        ``capacity_of`` returns the capacity of a series by key, for series
+        that should keep more or fewer points than ``capacity``.
+        """
+        self._capacity = capacity
+        self._capacity_of = capacity_of
+        self._series: dict[Hashable, MeasurementSeries] = {}
+
+    def _new_series(self, key: Hashable) -> MeasurementSeries:
+        """Return an empty series with the capacity of ``key``."""
+        if self._capacity_of is None:
+            return MeasurementSeries(self._capacity)
+        return MeasurementSeries(self._capacity_of(key))
+
+    def ingest(
+        self,
+        key: Hashable,
+        measurements: Mapping[str, float | None],
+        zone: str | None = None,
+    ) -> list[Point]:
+        """Merge a measurement window and return the points that are new.
+
+        The API lists measurements in ascending time order, so the window is
+        walked from its end and the walk stops at the first known timestamp.
+        Only the walked timestamps are parsed. The order is checked without
+        touching the rest of the window: the first timestamp string must sort
+        before the last one (they share one format and sort like the times),
+        and every walked timestamp must be earlier than the one walked before.
+        A window failing either check is merged by a full scan. Points
+        without a value are skipped.
+        """
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = self._new_series(key)
+        newest = series.latest_time
+        offset = utc_offset(zone)
+
+        if not measurements:
+            return []
+        if next(iter(measurements)) > next(reversed(measurements)):
+            return self._merge_scan(series, measurements, newest, offset)
+
+        new_points: list[Point] = []
+        later: int | None = None
+        for timestamp in reversed(measurements):
+            epoch = parse_timestamp(timestamp, offset)
+            if later is not None and epoch >= later:
+                return self._merge_scan(series, measurements, newest, offset)
+            if newest is not None and epoch <= newest:
+                break
+            if (value := measurements[timestamp]) is not None:
+                new_points.append((epoch, float(value)))
+            later = epoch
+
+        new_points.reverse()
+        series.extend(new_points)
+        return new_points
+
+    def _merge_scan(
+        self,
+        series: MeasurementSeries,
+        measurements: Mapping[str, float | None],
+        newest: int | None,
+        offset: int,
+    ) -> list[Point]:
+        """Merge an unordered window by a full scan and return the new points."""
+        new_points = self._scan(measurements, newest, offset)
+        series.extend(new_points)
+        return new_points
+
+    @staticmethod
+    def _scan(
+        measurements: Mapping[str, float | None], newest: int | None, offset: int
+    ) -> list[Point]:
+        """Return all points after ``newest`` from an unordered window."""
+        points = (
+            (parse_timestamp(timestamp, offset), value)
+            for timestamp, value in measurements.items()
+            if value is not None
+        )
+        return sorted(
+            (epoch, float(value))
+            for epoch, value in points
+            if newest is None or epoch > newest
+        )
+
+    def restore(self, key: Hashable, points: list[Point]) -> None:
+        """Replace a series with previously stored points in ascending order."""
+        series = self._series[key] = self._new_series(key)
+        series.extend(points)
+
+    def series(self, key: Hashable) -> MeasurementSeries | None:
+        """Return the stored series of a station/measurement."""
+        return self._series.get(key)
+
+    def latest(self, key: Hashable) -> Point | None:
+        """Return the newest point of a series."""
+        if series := self._series.get(key):
+            return series.latest()
+        return None
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a series."""
+        self._series.pop(key, None)
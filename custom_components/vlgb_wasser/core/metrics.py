@@ -0,0 +1,137 @@
+"""Performance metrics of the vlbg_wasser integration.
+
+The API client records per endpoint and per station how many requests were
+sent, how long they took and waited for the request budget, how many bytes
+came back and how long decoding and processing took. The coordinator adds
+its own processing time and the entity state writes. The totals are shown
+by diagnostic sensors and in the diagnostics download.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Any
+
+# Upper bounds (seconds) of the request latency histogram buckets; the last
+# bucket counts everything slower
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    """Counters and timings of one endpoint or station."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "bytes",
+        "latency",
+        "latency_total",
+        "decode_time",
+        "process_time",
+        "cache_hits",
+        "entity_writes",
+        "queue_wait",
+    )
+
+    def __init__(self) -> None:
+        """Initialize zeroed metrics."""
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_total = 0.0
+        self.decode_time = 0.0
+        self.process_time = 0.0
+        self.cache_hits = 0
+        self.entity_writes = 0
+        # Seconds requests waited for the request budget
+        self.queue_wait = 0.0
+
+    def observe_latency(self, seconds: float) -> None:
+        """Count a request in its latency bucket."""
+        self.latency[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_total += seconds
+
+    def latency_quantile(self, quantile: float) -> float | None:
+        """Return the upper bound of the bucket holding a latency quantile.
+
+        None if there are no requests or the quantile is above the last bound.
+        """
+        total = sum(self.latency)
+        if not total:
+            return None
+        rank = quantile * total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.latency):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        observed = sum(self.latency)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "latency_mean": self.latency_total / observed if observed else None,
+            "latency_histogram": {
+                **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.latency)},
+                "inf": self.latency[-1],
+            },
+            "decode_time": self.decode_time,
+            "process_time": self.process_time,
+            "cache_hits": self.cache_hits,
+            "entity_writes": self.entity_writes,
+            "queue_wait": self.queue_wait,
+        }
+
+
+def merged(items: Iterable[Metrics]) -> Metrics:
+    """Return the sum of several metrics."""
+    total = Metrics()
+    for metrics in items:
+        total.requests += metrics.requests
+        total.errors += metrics.errors
+        total.bytes += metrics.bytes
+        total.latency = [a + b for a, b in zip(total.latency, metrics.latency)]
+        total.latency_total += metrics.latency_total
+        total.decode_time += metrics.decode_time
+        total.process_time += metrics.process_time
+        total.cache_hits += metrics.cache_hits
+        total.entity_writes += metrics.entity_writes
+        total.queue_wait += metrics.queue_wait
+    return total
+
+
+class MetricsRegistry:
+    """Metrics keyed by endpoint and by station."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.endpoints: dict[str, Metrics] = {}
+        self.stations: dict[str, Metrics] = {}
+
+    def endpoint(self, name: str) -> Metrics:
+        """Return the metrics of an endpoint, creating them on first use."""
+        if (metrics := self.endpoints.get(name)) is None:
+            metrics = self.endpoints[name] = Metrics()
+        return metrics
+
+    def station(self, station_id: str) -> Metrics:
+        """Return the metrics of a station, creating them on first use."""
+        if (metrics := self.stations.get(station_id)) is None:
+            metrics = self.stations[station_id] = Metrics()
+        return metrics
+
+    def total(self) -> Metrics:
+        """Return the sum of the endpoint metrics."""
+        return merged(self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics for diagnostics."""
+        return {
+            "endpoints": {name: metrics.as_dict() for name, metrics in self.endpoints.items()},
+            "stations": {name: metrics.as_dict() for name, metrics in self.stations.items()},
+        }
@@ -0,0 +1,36 @@
+"""Normalisation of VOWIS payloads."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from .errors import VowisError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalise_measurements(data: dict[str, Any], station_id: str) -> dict[str, Any]:
+    """Return the series of a decoded messwerte/ payload.
+
+    The measurement window is passed on as-is; merging it into the
+    station's history is left to a SeriesIngestor, which only looks at the
+    points that are new since the previous poll. Returns an empty dict if
+    the station has no measurements.
+    """
+    try:
+        station_data = data["Stationen"][station_id]
+        measurements = station_data["Messwerte"]
+    except (KeyError, TypeError) as error:
+        raise VowisError(f"Unexpected API response structure: {error!r}") from error
+
+    if not measurements:
+        _LOGGER.warning("No measurements found for station %s", station_id)
+        return {}
+
+    return {
+        "station_id": station_id,
+        "parameter": station_data.get("Parameter"),
+        "unit": station_data.get("Einheit"),
+        "timezone": station_data.get("Zeit"),
+        "measurements": measurements,
+    }
@@ -0,0 +1,158 @@
+"""Request planning for VOWIS measurement series.
+
+A ``messwerte/{type}`` response is keyed by station (``{"Stationen": {id:
+...}}``), so the endpoint may serve several stations at once: either for a
+comma-separated ``hzbnr`` list or, without the filter, for every station.
+Which of these the API accepts is probed once per measurement type and
+remembered. The planner then groups the series due in a refresh into as few
+requests as the probed mode allows, splitting long station lists, and falls
+back to one request per station otherwise. ``fetch`` sends a plan and
+splits the responses back into results per series.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+import time
+from typing import Any
+
+# How the stations of a measurement type can be requested
+BATCH_SINGLE = "single"  # one request per station
+BATCH_MULTI = "multi"    # hzbnr=<id>,<id>,...
+BATCH_ALL = "all"        # no hzbnr, the response holds every station
+BATCH_MODES = (BATCH_SINGLE, BATCH_MULTI, BATCH_ALL)
+
+# Stations per multi-station request; longer lists are split
+MAX_BATCH_SIZE = 25
+
+# Probed modes older than this (seconds) are probed again
+BATCH_MODE_MAX_AGE = 7 * 24 * 3600
+
+# A planned request: (mode, measurement type, station ids)
+Request = tuple[str, str, list[str]]
+
+
+class RequestPlanner:
+    """Probed batch modes per measurement type, and request plans using them."""
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE) -> None:
+        """Initialize a planner that knows no batch modes yet."""
+        self._max_batch_size = max(1, max_batch_size)
+        # measurement_type -> (mode, probed at)
+        self._modes: dict[str, tuple[str, float]] = {}
+
+    def mode(self, measurement_type: str) -> str | None:
+        """Return the probed batch mode of a measurement type, None if unknown."""
+        if (probed := self._modes.get(measurement_type)) is None:
+            return None
+        return probed[0]
+
+    def record(self, measurement_type: str, mode: str, now: float | None = None) -> None:
+        """Remember the batch mode of a measurement type."""
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode: {mode}")
+        self._modes[measurement_type] = (mode, time.time() if now is None else now)
+
+    def stale(self, measurement_types: Iterable[str]) -> list[str]:
+        """Return the measurement types that were never or too long ago probed."""
+        oldest = time.time() - BATCH_MODE_MAX_AGE
+        return [
+            measurement_type
+            for measurement_type in measurement_types
+            if self._modes.get(measurement_type, (None, 0.0))[1] < oldest
+        ]
+
+    def plan(self, subscriptions: Iterable[tuple[str, str]]) -> list[Request]:
+        """Group (station_id, measurement_type) pairs into requests.
+
+        Lone stations are always requested on their own, which keeps the
+        per-station revalidation of single requests.
+        """
+        by_type: dict[str, list[str]] = {}
+        for station_id, measurement_type in subscriptions:
+            by_type.setdefault(measurement_type, []).append(station_id)
+
+        requests: list[Request] = []
+        for measurement_type, station_ids in by_type.items():
+            mode = self.mode(measurement_type)
+            if len(station_ids) < 2 or mode in (None, BATCH_SINGLE):
+                requests.extend(
+                    (BATCH_SINGLE, measurement_type, [station_id]) for station_id in station_ids
+                )
+            elif mode == BATCH_ALL:
+                requests.append((BATCH_ALL, measurement_type, station_ids))
+            else:
+                for first in range(0, len(station_ids), self._max_batch_size):
+                    batch = station_ids[first:first + self._max_batch_size]
+                    requests.append(
+                        (BATCH_MULTI if len(batch) > 1 else BATCH_SINGLE, measurement_type, batch)
+                    )
+        return requests
+
+    async def fetch(
+        self,
+        subscriptions: list[tuple[str, str]],
+        send: Callable[[Request], Awaitable[Any]],
+        refused: type[Exception],
+    ) -> tuple[list[Any], int, set[str]]:
+        """Send the planned requests of some series and return their results.
+
+        ``send`` sends one request; multi-station responses map station ids
+        to results. Returns one result or exception per subscription, the
+        number of requests sent and the measurement types whose batch form
+        was refused.
+
+        A station missing from a multi-station response has no data, like an
+        empty single response. A multi-station request failing with
+        ``refused`` means the batch form was refused, not the stations: its
+        stations are requested one by one in the same call, and the type is
+        returned so the caller can record BATCH_SINGLE for it.
+        """
+        requests = self.plan(subscriptions)
+        responses = await asyncio.gather(
+            *(send(request) for request in requests), return_exceptions=True
+        )
+
+        results: dict[tuple[str, str], Any] = {}
+        retries: list[tuple[str, str]] = []
+        refused_types: set[str] = set()
+        for (mode, measurement_type, station_ids), response in zip(requests, responses):
+            if mode == BATCH_SINGLE:
+                results[(station_ids[0], measurement_type)] = response
+                continue
+            if isinstance(response, refused):
+                refused_types.add(measurement_type)
+                retries.extend((station_id, measurement_type) for station_id in station_ids)
+                continue
+            for station_id in station_ids:
+                results[(station_id, measurement_type)] = (
+                    response if isinstance(response, Exception) else response.get(station_id, {})
+                )
+
+        if retries:
+            responses = await asyncio.gather(
+                *(
+                    send((BATCH_SINGLE, measurement_type, [station_id]))
+                    for station_id, measurement_type in retries
+                ),
+                return_exceptions=True,
+            )
+            results.update(zip(retries, responses))
+        return (
+            [results[subscription] for subscription in subscriptions],
+            len(requests) + len(retries),
+            refused_types,
+        )
+
+    def as_dict(self) -> dict[str, list[Any]]:
+        """Return the probed modes in their stored form."""
+        return {
+            measurement_type: [mode, probed_at]
+            for measurement_type, (mode, probed_at) in self._modes.items()
+        }
+
+    def restore(self, stored: Mapping[str, list[Any]]) -> None:
+        """Restore modes stored by ``as_dict``, ignoring unknown ones."""
+        for measurement_type, (mode, probed_at) in stored.items():
+            if mode in BATCH_MODES:
+                self._modes[measurement_type] = (mode, probed_at)
@@ -0,0 +1,158 @@
+"""Request budget for the VOWIS API.
+
+Many subscriptions, several config entries or a reload can send dozens of
+requests in the same second. A token bucket caps the rate over time while
+allowing a burst: it refills at ``rate`` tokens per second up to ``burst``
+tokens, and every upstream request takes one. Requests that find the bucket
+empty queue by priority and then by arrival, so with a tight budget the
+series of alerting and visible entities are sent before background work.
+The time spent in the queue is returned and counted per priority.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any
+
+from .analytics import DIRECTION_RISING
+from .const import ALERT_TYPES, GROUNDWATER
+
+# Request priorities, lower ones are sent first
+PRIORITY_ALERT = 0       # series of alerting entities
+PRIORITY_VISIBLE = 1     # series shown by enabled entities
+PRIORITY_BACKGROUND = 2  # probes, slow tiers and series nobody shows
+PRIORITY_NAMES = {
+    PRIORITY_ALERT: "alert",
+    PRIORITY_VISIBLE: "visible",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+def series_priority(measurement_type: str, watched: bool, direction: str | None) -> int:
+    """Return the request priority of a series.
+
+    ``watched`` is whether an enabled entity shows the series, ``direction``
+    its trend direction. Rising water levels and flows alert; groundwater
+    wells are a slow tier and always background.
+    """
+    if measurement_type == GROUNDWATER or not watched:
+        return PRIORITY_BACKGROUND
+    if measurement_type in ALERT_TYPES and direction == DIRECTION_RISING:
+        return PRIORITY_ALERT
+    return PRIORITY_VISIBLE
+
+
+class RateLimiter:
+    """Token bucket with a priority queue of waiting requests.
+
+    A ``rate`` of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket."""
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        # (priority, arrival, future) of the queued requests
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._arrivals = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+        # Requests, queued requests and queue wait (seconds) per priority
+        self.stats = {
+            name: {"requests": 0, "queued": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for name in PRIORITY_NAMES.values()
+        }
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the budget, keeping the tokens left up to the new burst."""
+        self._refill(time.monotonic())
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1, int(burst))
+        self._tokens = min(self._tokens, self.burst)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._schedule()
+
+    async def acquire(self, priority: int = PRIORITY_VISIBLE) -> float:
+        """Wait for a token and return the seconds spent waiting."""
+        stats = self.stats[PRIORITY_NAMES[priority]]
+        stats["requests"] += 1
+        if not self.rate:
+            return 0.0
+
+        started = time.monotonic()
+        self._refill(started)
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted, but the caller is gone: hand the token on
+                self._tokens = min(self.burst, self._tokens + 1)
+                self._schedule()
+            raise
+
+        waited = time.monotonic() - started
+        stats["queued"] += 1
+        stats["wait_total"] += waited
+        stats["wait_max"] = max(stats["wait_max"], waited)
+        return waited
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a token."""
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _schedule(self) -> None:
+        """Arm the timer releasing the next queued request."""
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate) if self.rate else 0.0
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Hand the available tokens to the queued requests, best first."""
+        self._timer = None
+        self._refill(time.monotonic())
+        while self._waiters and (not self.rate or self._tokens >= 1):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Cancelled while waiting
+                continue
+            if self.rate:
+                self._tokens -= 1
+            future.set_result(None)
+        self._schedule()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budget, the queue and the wait per priority for diagnostics."""
+        self._refill(time.monotonic())
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": self._tokens,
+            "queued": self.queued,
+            "priorities": {
+                name: {
+                    **stats,
+                    "wait_mean": stats["wait_total"] / stats["queued"] if stats["queued"] else None,
+                }
+                for name, stats in self.stats.items()
+            },
+        }
@@ -0,0 +1,103 @@
+"""Retry backoff and circuit breaker for requests to the VOWIS API.
+
+During an outage every request would otherwise wait for its full timeout on
+every refresh. Requests are retried a bounded number of times with jittered
+exponential backoff, and a circuit breaker per endpoint stops sending
+requests after repeated failures until a trial request succeeds again.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Return the delay before retry ``attempt`` (0-based), with full jitter."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class CircuitBreaker:
+    """Fail fast while an endpoint keeps failing.
+
+    After ``threshold`` consecutive failed calls the breaker opens and calls
+    are refused for ``reset_timeout`` seconds. Then a single trial call is
+    let through (half open); its outcome closes or re-opens the breaker.
+    Calls that say nothing about the endpoint's health, like cancelled or
+    rejected (4xx) ones, are released and leave the state as it is.
+    """
+
+    def __init__(self, name: str, threshold: int, reset_timeout: float) -> None:
+        """Initialize a closed breaker."""
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    def allow(self, now: float | None = None) -> bool:
+        """Return whether a call may be sent now."""
+        if self.state == STATE_CLOSED:
+            return True
+        now = time.monotonic() if now is None else now
+        if self.state == STATE_OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = STATE_HALF_OPEN
+            self._trial = False
+        if self._trial:
+            return False
+        self._trial = True
+        return True
+
+    def success(self) -> None:
+        """Record a call that reached the endpoint."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("VOWIS endpoint %s is reachable again", self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def failure(self, now: float | None = None) -> None:
+        """Record a failed call, opening the breaker at the threshold."""
+        self.failures += 1
+        self._trial = False
+        if self.state == STATE_HALF_OPEN or self.failures >= self.threshold:
+            if self.state == STATE_CLOSED:
+                _LOGGER.warning(
+                    "VOWIS endpoint %s failed %d times, pausing requests for %ss",
+                    self.name, self.failures, self.reset_timeout,
+                )
+            elif self.state == STATE_HALF_OPEN:
+                _LOGGER.debug("Trial request to VOWIS endpoint %s failed", self.name)
+            if self.state != STATE_OPEN:
+                self.trips += 1
+            self.state = STATE_OPEN
+            self.opened_at = time.monotonic() if now is None else now
+
+    def release(self) -> None:
+        """Forget a call that neither succeeded nor failed, e.g. a trial."""
+        self._trial = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        retry_in = None
+        if self.state == STATE_OPEN:
+            retry_in = max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in": retry_in,
+        }
@@ -0,0 +1,147 @@
+"""Publication-aware poll scheduling for VOWIS series.
+
+VOWIS records a value roughly every 5 minutes, starting on the hour, and
+needs roughly 10 minutes to publish it. Polling on a fixed timer is out of
+phase with that: most polls return nothing new, and new values wait for the
+next tick. The scheduler learns each series' publication lag from the
+timestamps it receives and plans the next poll for just after the next value
+should be available, backing off while polls return nothing new.
+
+A poll that returns a new value bounds its lag from above (it was published
+by then), a poll before it that returned nothing bounds it from below. With
+both bounds the lag is estimated as their midpoint. Without a lower bound
+the estimate steps down a little after each successful poll, so a lag that
+became shorter is found by polling earlier.
+
+Series can have their own measurement interval (e.g. slow-moving
+groundwater levels), and the number of series polled per refresh can be
+capped so a large set of series is worked off in batches.
+"""
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+import heapq
+
+# Measurement interval of the VOWIS series in seconds
+DEFAULT_INTERVAL = 300
+# Initial guess of the delay between measurement and publication
+DEFAULT_PUBLICATION_LAG = 600
+# Safety margin added after the expected publication time
+DEFAULT_MARGIN = 30
+# First retry delay after a poll without new data, doubled on each miss
+DEFAULT_RETRY = 60
+# Upper bound for the retry delay
+DEFAULT_MAX_BACKOFF = 1800
+# Step by which the lag estimate is lowered after a poll without lower bound
+LAG_PROBE_STEP = 15
+
+
+class _SeriesSchedule:
+    """Poll state of a single series."""
+
+    __slots__ = ("interval", "lag", "next_poll", "misses", "last_miss")
+
+    def __init__(self, interval: float, lag: float) -> None:
+        """Initialize a series that is due immediately."""
+        self.interval = interval
+        self.lag = lag
+        self.next_poll = 0.0
+        self.misses = 0
+        # Time of the last poll without new data since the last new value
+        self.last_miss: float | None = None
+
+
+class PollScheduler:
+    """Plan polls per series around the expected publication time."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        lag: float = DEFAULT_PUBLICATION_LAG,
+        margin: float = DEFAULT_MARGIN,
+        retry: float = DEFAULT_RETRY,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._interval = interval
+        self._initial_lag = lag
+        self._margin = margin
+        self._retry = retry
+        self._max_backoff = max_backoff
+        self._series: dict[Hashable, _SeriesSchedule] = {}
+
+    def _get(self, key: Hashable) -> _SeriesSchedule:
+        """Return the schedule of a series, creating it if needed."""
+        if (schedule := self._series.get(key)) is None:
+            schedule = self._series[key] = _SeriesSchedule(self._interval, self._initial_lag)
+        return schedule
+
+    def set_interval(self, key: Hashable, interval: float) -> None:
+        """Set the measurement interval of a series."""
+        self._get(key).interval = interval
+
+    def due(
+        self,
+        keys: Iterable[Hashable],
+        now: float,
+        window: float = 0,
+        limit: int | None = None,
+    ) -> list[Hashable]:
+        """Return the series that should be polled within ``window`` seconds.
+
+        Series without a schedule yet are always due. The window lets series
+        with nearly identical schedules share one refresh. With a ``limit``,
+        only that many of the most overdue series are returned; the others
+        stay due for the following refreshes.
+        """
+        due = [key for key in keys if self._get(key).next_poll <= now + window]
+        if limit is not None and len(due) > limit:
+            due = heapq.nsmallest(limit, due, key=lambda key: self._series[key].next_poll)
+        return due
+
+    def record(self, key: Hashable, now: float, latest_time: int | None, new_data: bool) -> None:
+        """Update the schedule of a series after it was polled at ``now``.
+
+        ``latest_time`` is the UTC epoch timestamp of the newest point the
+        series holds, ``new_data`` whether the poll added points to it.
+        """
+        schedule = self._get(key)
+
+        if new_data and latest_time is not None:
+            # The newest value was published by now, but not yet at the last
+            # poll that returned nothing
+            upper = max(now - latest_time, 0.0)
+            last_miss = schedule.last_miss
+            if last_miss is not None and last_miss > latest_time:
+                schedule.lag = (last_miss - latest_time + upper) / 2
+            else:
+                schedule.lag = max(min(schedule.lag, upper) - LAG_PROBE_STEP, 0.0)
+            schedule.misses = 0
+            schedule.last_miss = None
+        else:
+            schedule.misses += 1
+            schedule.last_miss = now
+
+        if latest_time is not None:
+            expected = latest_time + schedule.interval + schedule.lag + self._margin
+            if expected > now:
+                schedule.next_poll = expected
+                return
+
+        # The next value is overdue (or nothing is known yet): back off
+        backoff = self._retry * 2 ** max(schedule.misses - 1, 0)
+        schedule.next_poll = now + min(backoff, self._max_backoff)
+
+    def next_poll(self, keys: Iterable[Hashable]) -> float | None:
+        """Return the earliest planned poll of the given series."""
+        return min((self._get(key).next_poll for key in keys), default=None)
+
+    def lag(self, key: Hashable) -> float | None:
+        """Return the learned publication lag of a series."""
+        if (schedule := self._series.get(key)) is not None:
+            return schedule.lag
+        return None
+
+    def discard(self, key: Hashable) -> None:
+        """Forget the schedule of a series."""
+        self._series.pop(key, None)
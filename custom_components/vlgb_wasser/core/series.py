@@ -0,0 +1,152 @@
+"""Compact time-series storage for VOWIS measurements.
+
+A series keeps its points in two preallocated ``array`` ring buffers, one of
+UTC epoch seconds and one of float values, instead of a dict of ISO strings.
+Timestamps are normalised to UTC once, when a point is ingested.
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+
+# Offsets of the time zones the API labels its measurements with ("Zeit").
+# MEZ is central european standard time, the API does not switch to MESZ
+# in summer.
+TIMEZONE_OFFSETS = {
+    "MEZ": 3600,
+    "MESZ": 7200,
+    "UTC": 0,
+}
+DEFAULT_TIMEZONE = "MEZ"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def utc_offset(zone: str | None) -> int:
+    """Return the UTC offset in seconds of an API time zone label."""
+    return TIMEZONE_OFFSETS.get(zone or DEFAULT_TIMEZONE, TIMEZONE_OFFSETS[DEFAULT_TIMEZONE])
+
+
+def parse_timestamp(value: str, offset: int) -> int:
+    """Convert an API timestamp to UTC epoch seconds.
+
+    Naive timestamps are local to the series' time zone, given as
+    ``offset`` seconds east of UTC. Timestamps with a zone designator
+    (e.g. the ``Z`` suffix of the ``see/`` endpoint) ignore ``offset``.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        return int(parsed.timestamp())
+    return int((parsed - _EPOCH).total_seconds()) - offset
+
+
+def format_timestamp(epoch: int) -> str:
+    """Return UTC epoch seconds as an ISO 8601 string."""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+class MeasurementSeries:
+    """Fixed-capacity ring buffer of (UTC epoch seconds, value) points.
+
+    Points must be appended in ascending time order; once the buffer is full
+    the oldest point is overwritten. Latest-value access is O(1) and range
+    queries are O(log n + k).
+    """
+
+    __slots__ = ("_capacity", "_times", "_values", "_start", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty series."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._capacity = capacity
+        self._times = array("q", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored points."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of stored points."""
+        return self._capacity
+
+    def _index(self, position: int) -> int:
+        """Return the buffer index of the n-th oldest point."""
+        return (self._start + position) % self._capacity
+
+    def append(self, timestamp: int, value: float) -> None:
+        """Append a point newer than all stored points."""
+        if self._size < self._capacity:
+            index = self._index(self._size)
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self._capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+
+    def extend(self, points: list[tuple[int, float]]) -> None:
+        """Append points in ascending time order."""
+        for timestamp, value in points:
+            self.append(timestamp, value)
+
+    @property
+    def latest_time(self) -> int | None:
+        """Return the timestamp of the newest point."""
+        if not self._size:
+            return None
+        return self._times[self._index(self._size - 1)]
+
+    def latest(self) -> tuple[int, float] | None:
+        """Return the newest point."""
+        if not self._size:
+            return None
+        index = self._index(self._size - 1)
+        return self._times[index], self._values[index]
+
+    def _bisect(self, timestamp: int) -> int:
+        """Return the position of the first point at or after ``timestamp``."""
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self._times[self._index(middle)] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def range(self, start: int | None = None, end: int | None = None) -> tuple[array, array]:
+        """Return timestamps and values of the points in ``[start, end)``."""
+        first = 0 if start is None else self._bisect(start)
+        last = self._size if end is None else self._bisect(end)
+        times = array("q")
+        values = array("d")
+        if first >= last:
+            return times, values
+
+        # The requested positions map to at most two contiguous buffer runs
+        begin = self._index(first)
+        stop = begin + (last - first)
+        if stop <= self._capacity:
+            times.extend(self._times[begin:stop])
+            values.extend(self._values[begin:stop])
+        else:
+            stop -= self._capacity
+            times.extend(self._times[begin:])
+            times.extend(self._times[:stop])
+            values.extend(self._values[begin:])
+            values.extend(self._values[:stop])
+        return times, values
+
+    def points(self, start: int | None = None, end: int | None = None) -> list[tuple[int, float]]:
+        """Return the points in ``[start, end)`` as (timestamp, value) pairs."""
+        return list(zip(*self.range(start, end)))
+
+    def clear(self) -> None:
+        """Remove all points."""
+        self._start = 0
+        self._size = 0
@@ -0,0 +1,100 @@
+"""Catalog of groundwater wells.
+
+There are far more groundwater wells than river gauges, and only a few of
+them are usually subscribed. The API offers no list of wells, and its
+measurement responses carry no station names, so the catalog holds the ids
+of the wells opted into in the options, each named by its id. It keeps one
+small tuple per well and is only consulted by id, so its size does not
+affect refreshes, which only touch subscribed wells.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import re
+from typing import Any, NamedTuple
+
+# Stations of the hydrographic service are numbered with six digits
+_WELL_ID = re.compile(r"\d{6}")
+
+# Shown as the "river" of a well, which groups its entities
+GROUNDWATER_AREA = "Grundwasser"
+
+
+class Well(NamedTuple):
+    """A groundwater well."""
+
+    id: str
+    name: str
+
+
+def parse_well_ids(text: str) -> list[str]:
+    """Return the well ids in a comma or whitespace separated list.
+
+    Raises ValueError for anything that is not a station id.
+    """
+    well_ids = []
+    for well_id in re.split(r"[\s,;]+", text.strip()):
+        if not well_id:
+            continue
+        if not _WELL_ID.fullmatch(well_id):
+            raise ValueError(f"Invalid well id: {well_id}")
+        if well_id not in well_ids:
+            well_ids.append(well_id)
+    return well_ids
+
+
+class WellCatalog:
+    """Groundwater wells by id."""
+
+    __slots__ = ("_wells",)
+
+    def __init__(self, well_ids: Iterable[str] = ()) -> None:
+        """Initialize the catalog with the given wells."""
+        self._wells: dict[str, Well] = {}
+        self.ingest(well_ids)
+
+    def ingest(self, well_ids: Iterable[str]) -> int:
+        """Add the wells that are not known yet; return how many were added."""
+        added = 0
+        for well_id in well_ids:
+            if well_id not in self._wells:
+                self._wells[well_id] = Well(well_id, f"Well {well_id}")
+                added += 1
+        return added
+
+    def __iter__(self) -> Iterator[Well]:
+        """Iterate over all wells."""
+        return iter(self._wells.values())
+
+    def __len__(self) -> int:
+        """Return the number of wells."""
+        return len(self._wells)
+
+    def __contains__(self, well_id: object) -> bool:
+        """Return whether a well is known."""
+        return well_id in self._wells
+
+    def get(self, well_id: str) -> Well | None:
+        """Return a well by its id."""
+        return self._wells.get(well_id)
+
+    def station(self, well_id: str) -> dict[str, Any] | None:
+        """Return a well in the shape of a river station definition."""
+        if (well := self._wells.get(well_id)) is None:
+            return None
+        return {
+            "id": well.id,
+            "name": well.name,
+            "river": GROUNDWATER_AREA,
+        }
+
+    def records(self) -> list[list[Any]]:
+        """Return the wells in their compact stored form."""
+        return [list(well) for well in self._wells.values()]
+
+    def restore(self, stored: Iterable[list[Any]]) -> None:
+        """Replace the wells with the ones stored by ``records``.
+
+        Wells stored with a municipality by earlier versions drop it.
+        """
+        self._wells = {well[0]: Well(well[0], well[1]) for well in stored}
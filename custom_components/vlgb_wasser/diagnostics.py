@@ -0,0 +1,48 @@
+"""Diagnostics support for the vlbg_wasser integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import VlbgWasserDataUpdateCoordinator
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    The API client is shared by all entries, so its stats, breakers and
+    metrics cover every entry; the coordinator part is this entry's own.
+    """
+    coordinator: VlbgWasserDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "subscriptions": sorted(coordinator.subscriptions),
+            "update_interval": str(coordinator.update_interval),
+            "last_update_success": coordinator.last_update_success,
+            "last_refresh_duration": coordinator.last_refresh_duration,
+            "last_refresh_requests": coordinator.last_refresh_requests,
+            "last_refresh_failures": coordinator.last_refresh_failures,
+            "batch_modes": coordinator.catalog.planner.as_dict(),
+            "write_stats": coordinator.write_stats,
+            "totals": coordinator.performance_metrics().as_dict(),
+            "metrics": coordinator.metrics.as_dict(),
+        },
+        "api": {
+            "stats": api.stats,
+            "breakers": api.breaker_states(),
+            "request_budget": api.limiter.as_dict(),
+            "total": api.metrics.total().as_dict(),
+            "metrics": api.metrics.as_dict(),
+        },
+    }
@@ -0,0 +1,49 @@
+"""Base entity for the vlbg_wasser integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import VlbgWasserDataUpdateCoordinator
+
+_UNSET = object()
+
+
+class VlbgWasserEntity(CoordinatorEntity[VlbgWasserDataUpdateCoordinator]):
+    """Coordinator entity that only writes its state when it changed.
+
+    A refresh usually brings new points for a few series only, but notifies
+    every entity of the coordinator. Each entity compares the signature of
+    its state with the one it wrote last and skips unchanged writes. Written
+    and skipped writes are counted per refresh in the coordinator's
+    ``write_stats``, and writes per station in its metrics.
+    """
+
+    _last_written: Any = _UNSET
+
+    # Station whose metrics count this entity's state writes
+    _metrics_station: str | None = None
+
+    def _state_signature(self) -> Any:
+        """Return what the written state depends on."""
+        return self.available
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_written = self._state_signature()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed since the last write."""
+        signature = self._state_signature()
+        if signature == self._last_written:
+            self.coordinator.write_stats["skipped"] += 1
+            return
+        self._last_written = signature
+        self.coordinator.write_stats["written"] += 1
+        if self._metrics_station is not None:
+            self.coordinator.metrics.station(self._metrics_station).entity_writes += 1
+        self.async_write_ha_state()
@@ -8,22 +8,39 @@ Wir weisen ausdrücklich darauf hin, dass wir hinsichtlich Verfügbarkeit, Perfo
 
 from __future__ import annotations
 
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
 import logging
-from datetime import datetime
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfLength
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfLength, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import VlbgWasserDataUpdateCoordinator
-from .const import DOMAIN, RIVER_STATIONS, MEASUREMENT_TYPES
+from . import Subscription, VlbgWasserDataUpdateCoordinator
+from .const import (
+    DOMAIN,
+    GROUNDWATER,
+    MEASUREMENT_TYPES,
+    RATE_UNITS,
+    SIGNAL_REFRESHED,
+    SIGNAL_SUBSCRIPTIONS_ADDED,
+    SIGNAL_SUBSCRIPTIONS_REMOVED,
+    STEADY_SLOPES,
+)
+from .entity import VlbgWasserEntity
+from .core.analytics import DIRECTIONS
+from .core.metrics import Metrics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,14 +55,236 @@ async def async_setup_entry(
         config_entry.entry_id
     ]
 
-    # For now, create a single sensor for the hardcoded station
-    # In future versions, this will be dynamic based on configuration
-    sensors = [VlbgWasserSensor(coordinator, "200014", "w")]
-    
+    sensors = _series_sensors(coordinator, sorted(coordinator.subscriptions))
+
+    # Performance metrics of the entry, disabled unless someone needs them
+    sensors.extend(
+        VlbgWasserDiagnosticSensor(coordinator, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
+
     async_add_entities(sensors)
 
+    # Subscriptions changed in the options are applied to the running entry
+    @callback
+    def async_add_subscriptions(subscriptions: list[Subscription]) -> None:
+        async_add_entities(_series_sensors(coordinator, subscriptions))
+
+    @callback
+    def async_remove_subscriptions(subscriptions: set[Subscription]) -> None:
+        unique_ids = {
+            unique_id
+            for station_id, measurement_type in subscriptions
+            for unique_id in (
+                f"{DOMAIN}_{station_id}_{measurement_type}",
+                *(
+                    f"{DOMAIN}_{station_id}_{measurement_type}_{description.key}"
+                    for description in _analytics_descriptions(measurement_type)
+                ),
+            )
+        }
+        entity_registry = er.async_get(hass)
+        for entity in er.async_entries_for_config_entry(entity_registry, config_entry.entry_id):
+            if entity.unique_id in unique_ids:
+                entity_registry.async_remove(entity.entity_id)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_SUBSCRIPTIONS_ADDED.format(config_entry.entry_id),
+            async_add_subscriptions,
+        )
+    )
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_SUBSCRIPTIONS_REMOVED.format(config_entry.entry_id),
+            async_remove_subscriptions,
+        )
+    )
+
+
+def _series_sensors(
+    coordinator: VlbgWasserDataUpdateCoordinator, subscriptions: list[Subscription]
+) -> list[VlbgWasserSensor]:
+    """Return the sensors of some subscribed series."""
+    # One sensor per subscribed station/measurement pair, all sharing the
+    # entry's coordinator
+    sensors = [
+        VlbgWasserSensor(coordinator, station_id, measurement_type)
+        for station_id, measurement_type in subscriptions
+    ]
+
+    # Rolling analytics of every series, derived during the refresh
+    sensors.extend(
+        VlbgWasserAnalyticsSensor(coordinator, station_id, measurement_type, description)
+        for station_id, measurement_type in subscriptions
+        for description in _analytics_descriptions(measurement_type)
+    )
+    return sensors
+
+
+def _analytics_descriptions(
+    measurement_type: str,
+) -> list[VlbgWasserAnalyticsSensorEntityDescription]:
+    """Return the analytics sensors derived for a measurement type."""
+    return [
+        description
+        for description in ANALYTICS_SENSORS
+        if description.measurement_types is None
+        or measurement_type in description.measurement_types
+    ]
+
+
+@dataclass(frozen=True, kw_only=True)
+class VlbgWasserDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a performance metric of a config entry."""
+
+    value_fn: Callable[[VlbgWasserDataUpdateCoordinator, Metrics], float | int | None]
+
+
+DIAGNOSTIC_SENSORS: tuple[VlbgWasserDiagnosticSensorEntityDescription, ...] = (
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="refresh_duration",
+        name="Refresh duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator, _: coordinator.last_refresh_duration,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="requests",
+        name="API requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda _, metrics: metrics.requests,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="request_errors",
+        name="API request errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda _, metrics: metrics.errors,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="request_latency",
+        name="API request latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda _, metrics: (
+            metrics.latency_total / metrics.requests if metrics.requests else None
+        ),
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="bytes_received",
+        name="API bytes received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda _, metrics: metrics.bytes,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="decode_time",
+        name="JSON decode time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=3,
+        value_fn=lambda _, metrics: metrics.decode_time,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="process_time",
+        name="Processing time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=3,
+        value_fn=lambda _, metrics: metrics.process_time,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="queue_wait",
+        name="API request queue wait",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=3,
+        value_fn=lambda _, metrics: metrics.queue_wait,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="cache_hits",
+        name="API cache hits",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda _, metrics: metrics.cache_hits,
+    ),
+    VlbgWasserDiagnosticSensorEntityDescription(
+        key="entity_writes",
+        name="Entity state writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda _, metrics: metrics.entity_writes,
+    ),
+)
+
+
+class VlbgWasserDiagnosticSensor(VlbgWasserEntity, SensorEntity):
+    """Performance metric of a config entry, summed over its stations."""
 
-class VlbgWasserSensor(CoordinatorEntity, SensorEntity):
+    entity_description: VlbgWasserDiagnosticSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: VlbgWasserDataUpdateCoordinator,
+        description: VlbgWasserDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.entry.entry_id)},
+            name="Vorarlberg Wasser",
+            manufacturer="Vorarlberg Wasser",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    def _state_signature(self) -> tuple:
+        """Return the availability, value and attributes last written."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    async def async_added_to_hass(self) -> None:
+        """Also update after refreshes that left the data unchanged."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_REFRESHED.format(self.coordinator.entry.entry_id),
+                self._handle_coordinator_update,
+            )
+        )
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric."""
+        return self.entity_description.value_fn(
+            self.coordinator, self.coordinator.performance_metrics()
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the latency histogram with the latency sensor."""
+        if self.entity_description.key != "request_latency":
+            return None
+        metrics = self.coordinator.performance_metrics()
+        return {
+            "p50": metrics.latency_quantile(0.5),
+            "p99": metrics.latency_quantile(0.99),
+            "histogram": metrics.as_dict()["latency_histogram"],
+        }
+
+
+class VlbgWasserSensor(VlbgWasserEntity, SensorEntity):
     """Representation of a Vorarlberg Wasser sensor."""
 
     def __init__(
@@ -58,14 +297,11 @@ class VlbgWasserSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._station_id = station_id
         self._measurement_type = measurement_type
+        self._key = (station_id, measurement_type)
+        self._metrics_station = station_id
         
-        # Find station info from constants
-        station_info = None
-        for station in RIVER_STATIONS:
-            if station["id"] == station_id:
-                station_info = station
-                break
-        
+        # Station or well info from the catalogs' id index
+        station_info = coordinator.station_info(station_id)
         self._station_info = station_info
         self._attr_unique_id = f"{DOMAIN}_{station_id}_{measurement_type}"
         
@@ -78,18 +314,35 @@ class VlbgWasserSensor(CoordinatorEntity, SensorEntity):
         else:
             self._attr_name = f"Station {station_id} {measurement_type.upper()}"
 
+    @property
+    def _data(self) -> dict[str, Any] | None:
+        """Return this sensor's entry of the coordinator's result map."""
+        if self.coordinator.data:
+            return self.coordinator.data.get(self._key)
+        return None
+
+    def _state_signature(self) -> tuple:
+        """Return the availability, value and timestamp last written."""
+        data = self._data or {}
+        return (self.available, data.get("latest_value"), data.get("latest_time"))
+
+    async def async_added_to_hass(self) -> None:
+        """Have the coordinator request this series with visible priority."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_watch(self._key))
+
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("latest_value")
+        if data := self._data:
+            return data.get("latest_value")
         return None
 
     @property
     def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement."""
-        if self.coordinator.data:
-            unit = self.coordinator.data.get("unit", "")
+        if data := self._data:
+            unit = data.get("unit") or ""
             # Map API units to Home Assistant units
             if unit.lower() == "cm":
                 return UnitOfLength.CENTIMETERS
@@ -117,12 +370,12 @@ class VlbgWasserSensor(CoordinatorEntity, SensorEntity):
         """Return additional state attributes."""
         attrs = {}
         
-        if self.coordinator.data:
+        if data := self._data:
             attrs.update({
                 "station_id": self._station_id,
-                "parameter": self.coordinator.data.get("parameter"),
-                "timezone": self.coordinator.data.get("timezone"),
-                "last_updated": self.coordinator.data.get("latest_time"),
+                "parameter": data.get("parameter"),
+                "timezone": data.get("timezone"),
+                "last_updated": data.get("latest_time"),
                 "measurement_type": self._measurement_type,
             })
             
@@ -137,7 +390,7 @@ class VlbgWasserSensor(CoordinatorEntity, SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.data is not None
+        return self.coordinator.last_update_success and self._data is not None
 
     @property
     def device_info(self):
@@ -147,7 +400,137 @@ class VlbgWasserSensor(CoordinatorEntity, SensorEntity):
                 "identifiers": {(DOMAIN, self._station_id)},
                 "name": f"{self._station_info['river']} {self._station_info['name']}",
                 "manufacturer": "Vorarlberg Wasser",
-                "model": "Water Monitoring Station",
+                "model": (
+                    "Groundwater Well"
+                    if self._measurement_type == GROUNDWATER
+                    else "Water Monitoring Station"
+                ),
                 "sw_version": "1.0.0",
             }
-        return None
\ No newline at end of file
+        return None
+
+
+@dataclass(frozen=True, kw_only=True)
+class VlbgWasserAnalyticsSensorEntityDescription(SensorEntityDescription):
+    """Describes a rolling analytics value of a series."""
+
+    suffix: str
+    # Key of the value in the analytics snapshot, if not the entity key
+    value_key: str | None = None
+    per_hour: bool = False
+    # Measurement types the value is derived for, None for all
+    measurement_types: Collection[str] | None = None
+
+
+ANALYTICS_SENSORS: tuple[VlbgWasserAnalyticsSensorEntityDescription, ...] = (
+    VlbgWasserAnalyticsSensorEntityDescription(
+        key="rate",
+        suffix="Rate of Change",
+        per_hour=True,
+        measurement_types=RATE_UNITS,
+        suggested_display_precision=2,
+    ),
+    VlbgWasserAnalyticsSensorEntityDescription(
+        key="trend",
+        suffix="Trend",
+        value_key="direction",
+        device_class=SensorDeviceClass.ENUM,
+        options=list(DIRECTIONS),
+        measurement_types=STEADY_SLOPES,
+    ),
+    VlbgWasserAnalyticsSensorEntityDescription(
+        key="mean",
+        suffix="Mean",
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+    ),
+    VlbgWasserAnalyticsSensorEntityDescription(
+        key="min",
+        suffix="Minimum",
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+    ),
+    VlbgWasserAnalyticsSensorEntityDescription(
+        key="max",
+        suffix="Maximum",
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+class VlbgWasserAnalyticsSensor(VlbgWasserSensor):
+    """Rolling analytics value of a station measurement.
+
+    Values are computed incrementally by the coordinator, so reading them
+    costs nothing between refreshes.
+    """
+
+    entity_description: VlbgWasserAnalyticsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: VlbgWasserDataUpdateCoordinator,
+        station_id: str,
+        measurement_type: str,
+        description: VlbgWasserAnalyticsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, station_id, measurement_type)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{station_id}_{measurement_type}_{description.key}"
+        self._attr_name = f"{self._attr_name} {description.suffix}"
+
+    @property
+    def _analytics(self) -> dict[str, Any]:
+        """Return the derived values of this sensor's series."""
+        if data := self._data:
+            return data.get("analytics") or {}
+        return {}
+
+    def _state_signature(self) -> tuple:
+        """Return the availability, value and attributes last written."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    @property
+    def native_value(self) -> float | str | None:
+        """Return the derived value."""
+        description = self.entity_description
+        return self._analytics.get(description.value_key or description.key)
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the series unit, the rate unit for rates, none for directions."""
+        if self.entity_description.per_hour:
+            return RATE_UNITS.get(self._measurement_type)
+        if self.entity_description.device_class == SensorDeviceClass.ENUM:
+            return None
+        return super().native_unit_of_measurement
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class of levels, none for rates."""
+        if self.entity_description.device_class is not None:
+            return self.entity_description.device_class
+        if self.entity_description.per_hour:
+            return None
+        return super().device_class
+
+    @property
+    def state_class(self) -> SensorStateClass | None:
+        """Return the state class, none for directions."""
+        if self.entity_description.device_class == SensorDeviceClass.ENUM:
+            return None
+        return super().state_class
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the trend slope with the trend sensor."""
+        if self.entity_description.key != "trend":
+            return None
+        analytics = self._analytics
+        return {
+            "slope": analytics.get("trend"),
+            "slope_unit": RATE_UNITS.get(self._measurement_type),
+            "points": analytics.get("points"),
+        }
@@ -0,0 +1,138 @@
+"""Import of VOWIS series into Home Assistant long-term statistics.
+
+Every API response carries the last 24 hours of 5 minute values, but the
+sensors only record the newest one. The importer aggregates the stored series
+into hourly mean/min/max rows and adds them as external statistics in one
+batch per series, so history survives restarts and outages without extra
+requests. Hours that are already in the database are not imported again.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, MEASUREMENT_TYPES
+from .core.series import MeasurementSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+
+def statistic_id(station_id: str, measurement_type: str) -> str:
+    """Return the external statistic id of a station/measurement."""
+    return f"{DOMAIN}:{station_id}_{measurement_type}".lower()
+
+
+def hourly_statistics(
+    series: MeasurementSeries, start: int | None, end: int
+) -> list[tuple[int, float, float, float]]:
+    """Aggregate the points in ``[start, end)`` to hourly (start, mean, min, max)."""
+    times, values = series.range(start, end)
+    rows: list[tuple[int, float, float, float]] = []
+    hour = None
+    total = low = high = 0.0
+    count = 0
+
+    for timestamp, value in zip(times, values):
+        bucket = timestamp - timestamp % HOUR
+        if bucket != hour:
+            if count:
+                rows.append((hour, total / count, low, high))
+            hour, total, low, high, count = bucket, 0.0, value, value, 0
+        total += value
+        low = min(low, value)
+        high = max(high, value)
+        count += 1
+
+    if count:
+        rows.append((hour, total / count, low, high))
+    return rows
+
+
+class StatisticsImporter:
+    """Import completed hours of each series as external statistics."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the importer."""
+        self._hass = hass
+        # statistic_id -> start of the newest hour in the database
+        self._last_imported: dict[str, int | None] = {}
+
+    async def _async_last_imported(self, stat_id: str) -> int | None:
+        """Return the start of the newest stored hour of a statistic."""
+        if stat_id not in self._last_imported:
+            last = await get_instance(self._hass).async_add_executor_job(
+                get_last_statistics, self._hass, 1, stat_id, True, {"mean"}
+            )
+            start = None
+            if rows := last.get(stat_id):
+                start = rows[0]["start"]
+                if isinstance(start, datetime):
+                    start = start.timestamp()
+                start = int(start)
+            self._last_imported[stat_id] = start
+        return self._last_imported[stat_id]
+
+    async def async_import(
+        self,
+        station_id: str,
+        measurement_type: str,
+        series: MeasurementSeries,
+        result: dict[str, Any],
+        name: str | None = None,
+    ) -> int:
+        """Import the completed hours of a series that are not stored yet.
+
+        An hour is complete once a point of the following hour exists.
+        Returns the number of imported hours.
+        """
+        if "recorder" not in self._hass.config.components:
+            return 0
+        if (latest := series.latest_time) is None:
+            return 0
+
+        stat_id = statistic_id(station_id, measurement_type)
+        last_imported = await self._async_last_imported(stat_id)
+        start = None if last_imported is None else last_imported + HOUR
+        end = latest - latest % HOUR
+
+        rows = hourly_statistics(series, start, end)
+        if not rows:
+            return 0
+
+        if name is None:
+            measurement_name = MEASUREMENT_TYPES.get(measurement_type, measurement_type)
+            name = f"Station {station_id} {measurement_name.title()}"
+
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=name,
+            source=DOMAIN,
+            statistic_id=stat_id,
+            unit_of_measurement=result.get("unit"),
+        )
+        statistics = [
+            StatisticData(
+                start=datetime.fromtimestamp(hour, timezone.utc),
+                mean=mean,
+                min=low,
+                max=high,
+            )
+            for hour, mean, low, high in rows
+        ]
+        async_add_external_statistics(self._hass, metadata, statistics)
+
+        self._last_imported[stat_id] = rows[-1][0]
+        _LOGGER.debug("Imported %d hours of %s into statistics", len(rows), stat_id)
+        return len(rows)
@@ -0,0 +1,192 @@
+"""Websocket API of the vlbg_wasser integration.
+
+Chart cards get the intraday curve of a series straight from the
+coordinator's in-memory store instead of from recorded attributes:
+
+- ``vlbg_wasser/series`` returns the points of a series in a time range,
+  downsampled to a requested number of points.
+- ``vlbg_wasser/subscribe_series`` sends the same as its first event and
+  then, after every refresh that added points to the series, only the new
+  points. When the entry is unloaded (also to reload it) or the series is
+  unsubscribed in the options, a ``closed`` event ends the subscription,
+  and the card can subscribe again.
+
+Ranges are given and points returned as UTC epoch seconds.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    DATA_WEBSOCKET,
+    DEFAULT_CHART_POINTS,
+    DOMAIN,
+    MAX_CHART_POINTS,
+    SIGNAL_SUBSCRIPTIONS_REMOVED,
+    SIGNAL_UNLOADED,
+)
+from .core.downsample import METHOD_LTTB, METHODS, MIN_POINTS, downsample
+
+if TYPE_CHECKING:
+    # The integration module imports this one
+    from . import Subscription, VlbgWasserDataUpdateCoordinator
+
+SERIES_SCHEMA = {
+    vol.Required("station_id"): vol.Coerce(str),
+    vol.Required("measurement_type"): str,
+    vol.Optional("start"): vol.Coerce(int),
+    vol.Optional("end"): vol.Coerce(int),
+    vol.Optional("points", default=DEFAULT_CHART_POINTS): vol.All(
+        vol.Coerce(int), vol.Range(min=MIN_POINTS, max=MAX_CHART_POINTS)
+    ),
+    vol.Optional("method", default=METHOD_LTTB): vol.In(METHODS),
+}
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands once for all config entries."""
+    if hass.data.get(DATA_WEBSOCKET):
+        return
+    hass.data[DATA_WEBSOCKET] = True
+    websocket_api.async_register_command(hass, websocket_series)
+    websocket_api.async_register_command(hass, websocket_subscribe_series)
+
+
+def _coordinator(
+    hass: HomeAssistant, subscription: Subscription
+) -> VlbgWasserDataUpdateCoordinator | None:
+    """Return the coordinator of an entry subscribed to a series."""
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if subscription in coordinator.subscriptions:
+            return coordinator
+    return None
+
+
+def _series_range(
+    coordinator: VlbgWasserDataUpdateCoordinator, subscription: Subscription, msg: dict[str, Any]
+) -> tuple[Sequence[int], Sequence[float]]:
+    """Return the timestamps and values of a series in the requested range."""
+    if (series := coordinator.ingestor.series(subscription)) is None:
+        return (), ()
+    return series.range(msg.get("start"), msg.get("end"))
+
+
+def _series_message(
+    coordinator: VlbgWasserDataUpdateCoordinator,
+    subscription: Subscription,
+    msg: dict[str, Any],
+    times: Sequence[int],
+    values: Sequence[float],
+) -> dict[str, Any]:
+    """Return the downsampled points of a series."""
+    sampled_times, sampled_values = downsample(times, values, msg["points"], msg["method"])
+    result = (coordinator.data or {}).get(subscription) or {}
+    return {
+        "station_id": subscription[0],
+        "measurement_type": subscription[1],
+        "unit": result.get("unit"),
+        "total": len(times),
+        "points": [list(point) for point in zip(sampled_times, sampled_values)],
+    }
+
+
+@websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/series", **SERIES_SCHEMA})
+@callback
+def websocket_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the downsampled points of a series."""
+    subscription = (msg["station_id"], msg["measurement_type"])
+    if (coordinator := _coordinator(hass, subscription)) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"No entry subscribes to {subscription}"
+        )
+        return
+    times, values = _series_range(coordinator, subscription, msg)
+    connection.send_result(
+        msg["id"], _series_message(coordinator, subscription, msg, times, values)
+    )
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/subscribe_series", **SERIES_SCHEMA}
+)
+@callback
+def websocket_subscribe_series(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send the downsampled points of a series, then the points it gets.
+
+    Appended points are sent as they are, they are a few per refresh.
+    """
+    subscription = (msg["station_id"], msg["measurement_type"])
+    if (coordinator := _coordinator(hass, subscription)) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"No entry subscribes to {subscription}"
+        )
+        return
+
+    times, values = _series_range(coordinator, subscription, msg)
+    message = _series_message(coordinator, subscription, msg, times, values)
+    # Points after this timestamp have not been sent yet
+    last_sent = times[-1] if times else None
+
+    @callback
+    def async_forward_points() -> None:
+        nonlocal last_sent
+        if (series := coordinator.ingestor.series(subscription)) is None:
+            return
+        start = last_sent + 1 if last_sent is not None else msg.get("start")
+        times, values = series.range(start, msg.get("end"))
+        if not times:
+            return
+        last_sent = times[-1]
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"append": [list(point) for point in zip(times, values)]}
+            )
+        )
+
+    unsubscribers = [coordinator.async_add_listener(async_forward_points)]
+
+    @callback
+    def async_unsubscribe() -> None:
+        while unsubscribers:
+            unsubscribers.pop()()
+
+    @callback
+    def async_close(reason: str) -> None:
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        async_unsubscribe()
+        connection.send_message(websocket_api.event_message(msg["id"], {"closed": reason}))
+
+    @callback
+    def async_subscriptions_removed(subscriptions: set[Subscription]) -> None:
+        if subscription in subscriptions:
+            async_close("unsubscribed")
+
+    @callback
+    def async_unloaded() -> None:
+        async_close("unloaded")
+
+    entry_id = coordinator.entry.entry_id
+    unsubscribers.append(
+        async_dispatcher_connect(
+            hass, SIGNAL_SUBSCRIPTIONS_REMOVED.format(entry_id), async_subscriptions_removed
+        )
+    )
+    unsubscribers.append(
+        async_dispatcher_connect(hass, SIGNAL_UNLOADED.format(entry_id), async_unloaded)
+    )
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], message))
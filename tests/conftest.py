@@ -0,0 +1,9 @@
+"""Make the Home Assistant independent core importable as ``core``.
+
+The tests only cover the core package, which works without Home Assistant
+as a top-level package, like for the command line interface.
+"""
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "vlgb_wasser"))
@@ -0,0 +1,94 @@
+"""Tests of the incremental rolling analytics."""
+from array import array
+
+import pytest
+
+from core.analytics import HOUR, RollingWindow, SeriesAnalytics
+
+
+def test_points_leave_the_window_with_its_span():
+    window = RollingWindow(3 * HOUR)
+    for hour, value in enumerate([5.0, 1.0, 3.0, 2.0, 4.0]):
+        window.append(hour * HOUR, value)
+    # At hour 4 the window holds hours 2 to 4
+    assert len(window) == 3
+    assert window.mean == pytest.approx(3.0)
+    assert window.minimum == 2.0
+    assert window.maximum == 4.0
+
+
+def test_minimum_and_maximum_follow_evictions():
+    window = RollingWindow(2 * HOUR)
+    window.append(0, 10.0)
+    window.append(HOUR, 1.0)
+    assert window.maximum == 10.0
+    window.append(2 * HOUR, 5.0)
+    assert window.maximum == 5.0
+    assert window.minimum == 1.0
+    window.append(3 * HOUR, 6.0)
+    assert window.minimum == 5.0
+
+
+def test_change_rate_and_slope_per_hour():
+    window = RollingWindow(24 * HOUR)
+    for step in range(13):
+        window.append(step * 300, 100.0 + step * 0.5)
+    assert window.change_rate == pytest.approx(6.0)
+    assert window.slope == pytest.approx(6.0)
+
+
+def test_too_few_points():
+    window = RollingWindow(HOUR)
+    assert window.mean is None
+    window.append(0, 1.0)
+    assert window.change_rate is None
+    assert window.slope is None
+
+
+def test_backfill_matches_incremental_appends():
+    times = array("q", range(0, 48 * 300, 300))
+    values = array("d", ((index * 7) % 11 for index in range(48)))
+    incremental = RollingWindow(2 * HOUR)
+    for timestamp, value in zip(times, values):
+        incremental.append(timestamp, value)
+    backfilled = RollingWindow(2 * HOUR)
+    backfilled.backfill(times, values)
+
+    assert len(backfilled) == len(incremental)
+    assert backfilled.mean == pytest.approx(incremental.mean)
+    assert backfilled.minimum == incremental.minimum
+    assert backfilled.maximum == incremental.maximum
+    assert backfilled.slope == pytest.approx(incremental.slope)
+
+    # The minimum/maximum candidates survive the following evictions alike
+    for index in range(48, 96):
+        timestamp, value = index * 300, float((index * 5) % 7)
+        incremental.append(timestamp, value)
+        backfilled.append(timestamp, value)
+        assert backfilled.minimum == incremental.minimum
+        assert backfilled.maximum == incremental.maximum
+        assert backfilled.mean == pytest.approx(incremental.mean)
+
+
+def test_backfill_empty_series():
+    window = RollingWindow(HOUR)
+    window.backfill(array("q"), array("d"))
+    assert len(window) == 0
+    assert window.minimum is None
+    window.append(0, 1.0)
+    assert window.mean == 1.0
+
+
+@pytest.mark.parametrize(
+    ("steady_slope", "step", "direction"),
+    [
+        (1.0, 0.5, "rising"),
+        (1.0, -0.5, "falling"),
+        (10.0, 0.5, "steady"),
+        (None, 0.5, None),
+    ],
+)
+def test_direction_uses_the_steady_band(steady_slope, step, direction):
+    analytics = SeriesAnalytics(HOUR, 24 * HOUR, steady_slope)
+    analytics.extend([(index * 300, 100.0 + index * step) for index in range(12)])
+    assert analytics.snapshot()["direction"] == direction
@@ -0,0 +1,57 @@
+"""Tests of the chart downsampling."""
+from array import array
+import math
+
+import pytest
+
+from core.downsample import downsample, lttb, minmax
+
+
+def _series(count: int, spike: int | None = None) -> tuple[array, array]:
+    times = array("q", range(0, count * 300, 300))
+    values = array("d", (10 * math.sin(index / 30) for index in range(count)))
+    if spike is not None:
+        values[spike] = 100.0
+    return times, values
+
+
+@pytest.mark.parametrize("points", [3, 4, 50, 287])
+def test_lttb_returns_the_requested_points(points):
+    times, values = _series(288)
+    sampled_times, sampled_values = lttb(times, values, points)
+    assert len(sampled_times) == len(sampled_values) == points
+    assert sampled_times[0] == times[0]
+    assert sampled_times[-1] == times[-1]
+    assert list(sampled_times) == sorted(set(sampled_times))
+
+
+def test_lttb_keeps_spikes():
+    times, values = _series(288, spike=150)
+    _, sampled_values = lttb(times, values, 30)
+    assert 100.0 in sampled_values
+
+
+def test_short_series_are_returned_as_they_are():
+    times, values = _series(10)
+    assert lttb(times, values, 50) == (times, values)
+    assert minmax(times, values, 50) == (times, values)
+
+
+@pytest.mark.parametrize("points", [2, 3, 51, 100])
+def test_minmax_keeps_the_extremes(points):
+    times, values = _series(288, spike=7)
+    sampled_times, sampled_values = minmax(times, values, points)
+    assert len(sampled_times) <= points
+    assert max(sampled_values) == max(values)
+    assert min(sampled_values) == min(values)
+    assert list(sampled_times) == sorted(set(sampled_times))
+
+
+def test_invalid_arguments():
+    times, values = _series(10)
+    with pytest.raises(ValueError):
+        lttb(times, values, 2)
+    with pytest.raises(ValueError):
+        minmax(times, values, 1)
+    with pytest.raises(ValueError):
+        downsample(times, values, 5, "mean")
@@ -0,0 +1,99 @@
+"""Tests of the incremental ingestion of measurement windows."""
+from core.ingest import SeriesIngestor
+from core.series import parse_timestamp
+
+KEY = ("200014", "w")
+
+
+def _epoch(timestamp: str) -> int:
+    """Return a naive MEZ timestamp as UTC epoch seconds."""
+    return parse_timestamp(timestamp, 3600)
+
+
+def test_only_new_points_are_returned():
+    ingestor = SeriesIngestor()
+    window = {"2025-06-26T21:00:00": 1.0, "2025-06-26T21:05:00": 2.0}
+    assert ingestor.ingest(KEY, window) == [
+        (_epoch("2025-06-26T21:00:00"), 1.0),
+        (_epoch("2025-06-26T21:05:00"), 2.0),
+    ]
+
+    window = {**window, "2025-06-26T21:10:00": 3.0}
+    assert ingestor.ingest(KEY, window) == [(_epoch("2025-06-26T21:10:00"), 3.0)]
+    assert ingestor.ingest(KEY, window) == []
+    assert ingestor.latest(KEY) == (_epoch("2025-06-26T21:10:00"), 3.0)
+
+
+def test_points_without_value_are_skipped():
+    ingestor = SeriesIngestor()
+    window = {"2025-06-26T21:00:00": 1.0, "2025-06-26T21:05:00": None}
+    assert ingestor.ingest(KEY, window) == [(_epoch("2025-06-26T21:00:00"), 1.0)]
+
+
+def test_unordered_windows_are_merged_in_time_order():
+    ingestor = SeriesIngestor()
+    ingestor.ingest(KEY, {"2025-06-26T21:00:00": 1.0})
+    window = {
+        "2025-06-26T21:10:00": 3.0,
+        "2025-06-26T21:00:00": 1.0,
+        "2025-06-26T21:05:00": 2.0,
+    }
+    assert ingestor.ingest(KEY, window) == [
+        (_epoch("2025-06-26T21:05:00"), 2.0),
+        (_epoch("2025-06-26T21:10:00"), 3.0),
+    ]
+
+
+def test_unordered_tail_is_merged_by_scan():
+    ingestor = SeriesIngestor()
+    ingestor.ingest(KEY, {"2025-06-26T21:00:00": 1.0})
+    # The last two points are swapped, the first one is known
+    window = {
+        "2025-06-26T21:00:00": 1.0,
+        "2025-06-26T21:10:00": 3.0,
+        "2025-06-26T21:05:00": 2.0,
+    }
+    assert ingestor.ingest(KEY, window) == [
+        (_epoch("2025-06-26T21:05:00"), 2.0),
+        (_epoch("2025-06-26T21:10:00"), 3.0),
+    ]
+    assert ingestor.latest(KEY) == (_epoch("2025-06-26T21:10:00"), 3.0)
+
+
+def test_window_ending_before_its_start_is_merged_by_scan():
+    ingestor = SeriesIngestor()
+    ingestor.ingest(KEY, {"2025-06-26T21:00:00": 1.0})
+    # Walked from its end, this window would stop at the known point
+    window = {
+        "2025-06-26T21:10:00": 3.0,
+        "2025-06-26T21:05:00": 2.0,
+        "2025-06-26T21:00:00": 1.0,
+    }
+    assert ingestor.ingest(KEY, window) == [
+        (_epoch("2025-06-26T21:05:00"), 2.0),
+        (_epoch("2025-06-26T21:10:00"), 3.0),
+    ]
+
+
+def test_empty_window():
+    ingestor = SeriesIngestor()
+    assert ingestor.ingest(KEY, {}) == []
+    assert ingestor.latest(KEY) is None
+
+
+def test_capacity_per_series():
+    ingestor = SeriesIngestor(capacity=10, capacity_of=lambda key: 2 if key == KEY else 10)
+    window = {f"2025-06-26T21:0{minute}:00": float(minute) for minute in range(5)}
+    ingestor.ingest(KEY, window)
+    ingestor.ingest("other", window)
+    assert len(ingestor.series(KEY)) == 2
+    assert len(ingestor.series("other")) == 5
+
+
+def test_restore_and_discard():
+    ingestor = SeriesIngestor()
+    ingestor.restore(KEY, [(100, 1.0), (200, 2.0)])
+    assert ingestor.latest(KEY) == (200, 2.0)
+    ingestor.discard(KEY)
+    assert ingestor.series(KEY) is None
+    assert ingestor.latest(KEY) is None
@@ -0,0 +1,133 @@
+"""Tests of the multi-station request planner."""
+import asyncio
+
+import pytest
+
+from core.planner import BATCH_ALL, BATCH_MULTI, BATCH_SINGLE, RequestPlanner
+
+
+def _subscriptions(count: int, measurement_type: str = "w") -> list[tuple[str, str]]:
+    return [(str(200000 + index), measurement_type) for index in range(count)]
+
+
+def test_unknown_modes_plan_single_requests():
+    planner = RequestPlanner()
+    assert planner.plan(_subscriptions(2)) == [
+        (BATCH_SINGLE, "w", ["200000"]),
+        (BATCH_SINGLE, "w", ["200001"]),
+    ]
+
+
+def test_lone_stations_are_requested_alone():
+    planner = RequestPlanner()
+    planner.record("w", BATCH_MULTI)
+    assert planner.plan(_subscriptions(1)) == [(BATCH_SINGLE, "w", ["200000"])]
+
+
+def test_multi_requests_are_split():
+    planner = RequestPlanner(max_batch_size=3)
+    planner.record("w", BATCH_MULTI)
+    plan = planner.plan(_subscriptions(7))
+    assert [(mode, len(station_ids)) for mode, _, station_ids in plan] == [
+        (BATCH_MULTI, 3),
+        (BATCH_MULTI, 3),
+        (BATCH_SINGLE, 1),
+    ]
+    assert [station_id for _, _, station_ids in plan for station_id in station_ids] == [
+        station_id for station_id, _ in _subscriptions(7)
+    ]
+
+
+def test_all_mode_plans_one_request_per_type():
+    planner = RequestPlanner(max_batch_size=3)
+    planner.record("w", BATCH_ALL)
+    plan = planner.plan(_subscriptions(7) + _subscriptions(2, "q"))
+    assert plan == [
+        (BATCH_ALL, "w", [station_id for station_id, _ in _subscriptions(7)]),
+        (BATCH_SINGLE, "q", ["200000"]),
+        (BATCH_SINGLE, "q", ["200001"]),
+    ]
+
+
+def test_unknown_modes_are_refused():
+    with pytest.raises(ValueError):
+        RequestPlanner().record("w", "some")
+
+
+def test_stale_modes():
+    planner = RequestPlanner()
+    planner.record("w", BATCH_MULTI)
+    planner.record("q", BATCH_MULTI, now=0)
+    assert planner.stale(["w", "q", "wt"]) == ["q", "wt"]
+
+
+def test_restore_ignores_unknown_modes():
+    planner = RequestPlanner()
+    planner.restore({"w": [BATCH_ALL, 10.0], "q": ["some", 10.0]})
+    assert planner.mode("w") == BATCH_ALL
+    assert planner.mode("q") is None
+    assert planner.as_dict() == {"w": [BATCH_ALL, 10.0]}
+
+
+class Refused(Exception):
+    """A refused multi-station request."""
+
+
+def _sender(refuse_batches: bool = False):
+    """Return a request sender answering with the station ids, and its log."""
+    sent = []
+
+    async def send(request):
+        sent.append(request)
+        mode, measurement_type, station_ids = request
+        if mode == BATCH_SINGLE:
+            return f"{station_ids[0]}/{measurement_type}"
+        if refuse_batches:
+            raise Refused
+        # The first station is missing from the response
+        return {station_id: f"{station_id}/{measurement_type}" for station_id in station_ids[1:]}
+
+    return send, sent
+
+
+def test_fetch_splits_batch_responses():
+    planner = RequestPlanner()
+    planner.record("w", BATCH_MULTI)
+    send, sent = _sender()
+    subscriptions = _subscriptions(3)
+    results, requests, refused = asyncio.run(planner.fetch(subscriptions, send, Refused))
+    assert results == [{}, "200001/w", "200002/w"]
+    assert requests == len(sent) == 1
+    assert refused == set()
+
+
+def test_fetch_retries_refused_batches_one_by_one():
+    planner = RequestPlanner(max_batch_size=2)
+    planner.record("w", BATCH_MULTI)
+    send, sent = _sender(refuse_batches=True)
+    subscriptions = _subscriptions(3) + _subscriptions(1, "q")
+    results, requests, refused = asyncio.run(planner.fetch(subscriptions, send, Refused))
+
+    # Every series gets its result in the same call
+    assert results == ["200000/w", "200001/w", "200002/w", "200000/q"]
+    assert refused == {"w"}
+    # One refused batch of two, two single requests planned, two retries
+    assert requests == len(sent) == 5
+    assert sent[-2:] == [
+        (BATCH_SINGLE, "w", ["200000"]),
+        (BATCH_SINGLE, "w", ["200001"]),
+    ]
+
+
+def test_fetch_keeps_other_errors():
+    planner = RequestPlanner()
+    planner.record("w", BATCH_ALL)
+    error = OSError("timeout")
+
+    async def send(request):
+        raise error
+
+    results, requests, refused = asyncio.run(planner.fetch(_subscriptions(2), send, Refused))
+    assert results == [error, error]
+    assert requests == 1
+    assert refused == set()
@@ -0,0 +1,154 @@
+"""Tests of the prioritised token bucket."""
+import asyncio
+
+import pytest
+
+from core.analytics import DIRECTION_FALLING, DIRECTION_RISING, DIRECTION_STEADY
+from core.ratelimit import (
+    PRIORITY_ALERT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_VISIBLE,
+    RateLimiter,
+    series_priority,
+)
+
+# Tokens per second; high enough to keep the tests fast
+RATE = 50.0
+
+
+def test_burst_is_not_delayed():
+    async def run():
+        limiter = RateLimiter(RATE, 3)
+        return [await limiter.acquire() for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.0, 0.0, 0.0]
+
+
+def test_no_limit():
+    async def run():
+        limiter = RateLimiter(0, 1)
+        waits = [await limiter.acquire() for _ in range(20)]
+        return waits, limiter.stats["visible"]
+
+    waits, stats = asyncio.run(run())
+    assert waits == [0.0] * 20
+    assert stats["requests"] == 20
+    assert stats["queued"] == 0
+
+
+def test_queued_requests_are_granted_by_priority():
+    async def run():
+        limiter = RateLimiter(RATE, 1)
+        await limiter.acquire()
+        granted = []
+
+        async def request(name, priority):
+            await limiter.acquire(priority)
+            granted.append(name)
+
+        tasks = [
+            asyncio.create_task(request(name, priority))
+            for name, priority in (
+                ("background", PRIORITY_BACKGROUND),
+                ("visible", PRIORITY_VISIBLE),
+                ("alert", PRIORITY_ALERT),
+                ("visible 2", PRIORITY_VISIBLE),
+            )
+        ]
+        await asyncio.sleep(0)
+        queued = limiter.queued
+        await asyncio.gather(*tasks)
+        return queued, granted, limiter.stats
+
+    queued, granted, stats = asyncio.run(run())
+    assert queued == 4
+    assert granted == ["alert", "visible", "visible 2", "background"]
+    assert stats["visible"]["queued"] == 2
+    assert stats["background"]["wait_max"] > stats["alert"]["wait_max"] > 0
+
+
+@pytest.mark.parametrize(
+    ("measurement_type", "watched", "direction", "priority"),
+    [
+        ("w", True, DIRECTION_RISING, PRIORITY_ALERT),
+        ("q", True, DIRECTION_RISING, PRIORITY_ALERT),
+        ("w", True, DIRECTION_STEADY, PRIORITY_VISIBLE),
+        ("q", True, DIRECTION_FALLING, PRIORITY_VISIBLE),
+        ("w", True, None, PRIORITY_VISIBLE),
+        # Rising temperatures do not flood anything
+        ("wt", True, DIRECTION_RISING, PRIORITY_VISIBLE),
+        ("w", False, DIRECTION_RISING, PRIORITY_BACKGROUND),
+        ("gws_t_mw", True, DIRECTION_RISING, PRIORITY_BACKGROUND),
+    ],
+)
+def test_series_priority(measurement_type, watched, direction, priority):
+    assert series_priority(measurement_type, watched, direction) == priority
+
+
+def test_rising_series_are_sent_before_the_others():
+    series = {
+        ("200014", "gws_t_mw"): (True, DIRECTION_RISING),
+        ("200147", "w"): (False, DIRECTION_RISING),
+        ("200196", "wt"): (True, DIRECTION_RISING),
+        ("200014", "w"): (True, DIRECTION_STEADY),
+        ("231688", "q"): (True, DIRECTION_RISING),
+    }
+
+    async def run():
+        limiter = RateLimiter(RATE, 1)
+        await limiter.acquire()
+        granted = []
+
+        async def request(key, watched, direction):
+            await limiter.acquire(series_priority(key[1], watched, direction))
+            granted.append(key)
+
+        await asyncio.gather(
+            *(request(key, *state) for key, state in series.items())
+        )
+        return granted
+
+    assert asyncio.run(run()) == [
+        ("231688", "q"),
+        ("200196", "wt"),
+        ("200014", "w"),
+        ("200014", "gws_t_mw"),
+        ("200147", "w"),
+    ]
+
+
+def test_cancelled_requests_do_not_take_a_token():
+    async def run():
+        limiter = RateLimiter(RATE, 1)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire(PRIORITY_ALERT))
+        waiting = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        waited = await waiting
+        return waited, limiter.queued, limiter.stats["alert"]["queued"]
+
+    waited, queued, alert_queued = asyncio.run(run())
+    # The token freed by the cancelled request went to the next one, one
+    # refill after the burst instead of two
+    assert waited < 1.5 / RATE
+    assert queued == 0
+    assert alert_queued == 0
+
+
+def test_configure_caps_the_tokens_at_the_new_burst():
+    async def run():
+        limiter = RateLimiter(RATE, 10)
+        limiter.configure(RATE, 2)
+        return [await limiter.acquire() == 0.0 for _ in range(3)]
+
+    assert asyncio.run(run()) == [True, True, False]
+
+
+def test_as_dict():
+    limiter = RateLimiter(RATE, 2)
+    stats = limiter.as_dict()
+    assert stats["rate"] == RATE
+    assert stats["burst"] == 2
+    assert stats["tokens"] == pytest.approx(2)
+    assert stats["priorities"]["alert"]["wait_mean"] is None
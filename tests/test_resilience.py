@@ -0,0 +1,55 @@
+"""Tests of the circuit breaker."""
+from core.resilience import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+
+
+def _open_breaker(now=0):
+    breaker = CircuitBreaker("messwerte/w", threshold=2, reset_timeout=60)
+    breaker.failure(now)
+    breaker.failure(now)
+    return breaker
+
+
+def test_breaker_opens_at_the_threshold():
+    breaker = CircuitBreaker("messwerte/w", threshold=2, reset_timeout=60)
+    breaker.failure(0)
+    assert breaker.state == STATE_CLOSED
+    breaker.failure(0)
+    assert breaker.state == STATE_OPEN
+    assert breaker.trips == 1
+    assert not breaker.allow(30)
+
+
+def test_one_trial_call_after_the_timeout():
+    breaker = _open_breaker()
+    assert breaker.allow(60)
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow(61)
+
+    breaker.success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow(62)
+
+
+def test_failed_trials_count_as_trips():
+    breaker = _open_breaker()
+    assert breaker.allow(60)
+    breaker.failure(60)
+    assert breaker.state == STATE_OPEN
+    assert breaker.trips == 2
+    assert not breaker.allow(100)
+
+    # Calls that were in flight when it opened do not trip it again
+    breaker.failure(100)
+    assert breaker.trips == 2
+
+
+def test_released_trial_leaves_the_breaker_half_open():
+    breaker = _open_breaker()
+    assert breaker.allow(60)
+    # E.g. a 404 for the trial's station says nothing about the endpoint
+    breaker.release()
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.trips == 1
+    # The next call is the trial
+    assert breaker.allow(61)
+    assert not breaker.allow(61)
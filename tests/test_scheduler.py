@@ -0,0 +1,109 @@
+"""Tests of the publication-aware poll scheduler."""
+import pytest
+
+from core.scheduler import LAG_PROBE_STEP, PollScheduler
+
+KEY = ("200014", "w")
+
+
+def test_new_series_are_due():
+    scheduler = PollScheduler()
+    assert scheduler.due([KEY], now=0) == [KEY]
+
+
+def test_next_poll_follows_the_expected_publication():
+    scheduler = PollScheduler(interval=300, lag=600, margin=30)
+    scheduler.record(KEY, now=1000, latest_time=500, new_data=True)
+    # The value was published within 500 s, the estimate probes earlier
+    lag = 500 - LAG_PROBE_STEP
+    assert scheduler.lag(KEY) == lag
+    assert scheduler.next_poll([KEY]) == 500 + 300 + lag + 30
+    assert scheduler.due([KEY], now=1200) == []
+    assert scheduler.due([KEY], now=1315) == [KEY]
+
+
+def test_lag_is_bracketed_by_a_poll_without_new_data():
+    scheduler = PollScheduler(interval=300, lag=100, margin=30)
+    scheduler.record(KEY, now=1000, latest_time=500, new_data=True)
+    # The point at 800 is not published at 1000, but at 1300
+    scheduler.record(KEY, now=1000, latest_time=500, new_data=False)
+    scheduler.record(KEY, now=1300, latest_time=800, new_data=True)
+    assert scheduler.lag(KEY) == (200 + 500) / 2
+
+
+def _simulate(scheduler, lag, polls, interval=300):
+    """Poll a series whose values are published ``lag`` seconds after each
+    measurement, as planned by the scheduler.
+
+    Returns per poll its time, the newest point, whether it was new and the
+    lag estimate afterwards.
+    """
+    now = 0.0
+    latest = None
+    history = []
+    for _ in range(polls):
+        published = (now - lag) // interval * interval
+        new_data = published >= 0 and published != latest
+        if new_data:
+            latest = published
+        scheduler.record(KEY, now, latest, new_data)
+        history.append((now, latest, new_data, scheduler.lag(KEY)))
+        now = scheduler.next_poll([KEY])
+    return history
+
+
+@pytest.mark.parametrize("true_lag", [150, 500, 1000, 1234])
+def test_lag_converges_over_many_polls(true_lag):
+    scheduler = PollScheduler(interval=300, lag=600, margin=30, retry=60)
+    history = _simulate(scheduler, true_lag, polls=80)
+    # Past the first 20 intervals, which start without any bound
+    settled = [poll for poll in history if poll[0] > 20 * 300]
+    assert len(settled) >= 40
+
+    # The estimate settles around the true lag instead of drifting
+    assert all(abs(lag - true_lag) <= 60 for *_, lag in settled)
+
+    # Every value is fetched shortly after it is published, none is skipped
+    hits = [(now, latest) for now, latest, new_data, _ in settled if new_data]
+    assert all(now - (latest + true_lag) <= 90 for now, latest in hits)
+    assert all(later - earlier == 300 for (_, earlier), (_, later) in zip(hits, hits[1:]))
+
+
+def test_polls_without_new_data_back_off():
+    scheduler = PollScheduler(retry=60, max_backoff=200)
+    delays = []
+    for now in (0, 1000, 2000, 3000):
+        scheduler.record(KEY, now=now, latest_time=None, new_data=False)
+        delays.append(scheduler.next_poll([KEY]) - now)
+    assert delays == [60, 120, 200, 200]
+
+    # New data resets the backoff
+    scheduler.record(KEY, now=5000, latest_time=4900, new_data=True)
+    scheduler.record(KEY, now=6000, latest_time=4900, new_data=False)
+    assert scheduler.next_poll([KEY]) - 6000 == 60
+
+
+def test_series_interval():
+    scheduler = PollScheduler(interval=300, lag=0, margin=0)
+    scheduler.set_interval(KEY, 3600)
+    scheduler.record(KEY, now=100, latest_time=100, new_data=True)
+    assert scheduler.next_poll([KEY]) == 3700
+
+
+def test_due_within_window_and_limit():
+    scheduler = PollScheduler(interval=300, lag=0, margin=0)
+    for index, key in enumerate("abcd"):
+        scheduler.record(key, now=0, latest_time=index * 10, new_data=True)
+    # Planned at 300, 310, 320 and 330
+    assert scheduler.due("abcd", now=300) == ["a"]
+    assert scheduler.due("abcd", now=300, window=20) == ["a", "b", "c"]
+    # The most overdue series are polled first
+    assert scheduler.due("abcd", now=400, limit=2) == ["a", "b"]
+
+
+def test_discard():
+    scheduler = PollScheduler()
+    scheduler.record(KEY, now=0, latest_time=None, new_data=False)
+    scheduler.discard(KEY)
+    assert scheduler.lag(KEY) is None
+    assert scheduler.due([KEY], now=0) == [KEY]
@@ -0,0 +1,73 @@
+"""Tests of the ring-buffer measurement series."""
+import pytest
+
+from core.series import MeasurementSeries, format_timestamp, parse_timestamp, utc_offset
+
+
+def _filled(capacity: int, count: int) -> MeasurementSeries:
+    """Return a series with ``count`` points at t = 0, 10, 20, ..."""
+    series = MeasurementSeries(capacity)
+    series.extend([(index * 10, float(index)) for index in range(count)])
+    return series
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        MeasurementSeries(0)
+
+
+def test_empty_series():
+    series = MeasurementSeries(3)
+    assert len(series) == 0
+    assert series.latest() is None
+    assert series.latest_time is None
+    assert series.points() == []
+
+
+def test_wraparound_keeps_the_newest_points():
+    series = _filled(4, 7)
+    assert len(series) == 4
+    assert series.latest() == (60, 6.0)
+    assert series.points() == [(30, 3.0), (40, 4.0), (50, 5.0), (60, 6.0)]
+
+
+def test_range_across_the_buffer_end():
+    series = _filled(4, 7)
+    # The stored points start in the middle of the buffer, so this range
+    # spans its end and start
+    times, values = series.range(40, 70)
+    assert list(times) == [40, 50, 60]
+    assert list(values) == [4.0, 5.0, 6.0]
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        (None, None, [30, 40, 50, 60]),
+        (35, None, [40, 50, 60]),
+        (None, 50, [30, 40]),
+        (40, 50, [40]),
+        (50, 50, []),
+        (70, None, []),
+        (None, 0, []),
+    ],
+)
+def test_range_bounds(start, end, expected):
+    series = _filled(4, 7)
+    assert [timestamp for timestamp, _ in series.points(start, end)] == expected
+
+
+def test_clear():
+    series = _filled(4, 7)
+    series.clear()
+    assert len(series) == 0
+    series.append(100, 1.0)
+    assert series.points() == [(100, 1.0)]
+
+
+def test_timestamps_are_normalised_to_utc():
+    assert utc_offset(None) == 3600
+    assert utc_offset("UTC") == 0
+    naive = parse_timestamp("2025-06-26T21:25:00", utc_offset("MEZ"))
+    assert format_timestamp(naive) == "2025-06-26T20:25:00+00:00"
+    assert parse_timestamp("2025-06-26T20:25:00Z", utc_offset("MEZ")) == naive